@@ -5,16 +5,19 @@ import hashlib
 import io
 import json
 import os
+import queue
 import re
+import threading
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from time import monotonic
+from typing import Any, Callable, Dict, Optional
 
 import uvicorn
 from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from dotenv import load_dotenv
@@ -22,6 +25,8 @@ from dotenv import load_dotenv
 from db.models import AIReport, BacktestResult, UserWatchlist
 from db.session import init_db, is_db_enabled, session_scope
 from services.backtest_service import backfill_snapshots, get_backtest_history, get_backtest_summary
+from services.daily_store_service import DAILY_STORE_UNAVAILABLE_REASON
+from services.fetch_executor_service import deadline_expired
 from services.llm_service import (
     bootstrap_llm_runtime,
     ensure_ai_report_shape,
@@ -29,11 +34,18 @@ from services.llm_service import (
     get_llm_runtime_status,
 )
 from services.news_service import get_news_and_themes
+from services.prefetch_scheduler_service import (
+    PREFETCH_SCHEDULER_ENABLED,
+    start_prefetch_scheduler,
+    stop_prefetch_scheduler,
+)
 from services.scoring_service import (
     DEFAULT_WEIGHTS,
+    STRATEGY_VARIANTS,
     TICKERS,
     detect_market_regime,
     fetch_and_score_stocks,
+    fetch_and_score_strategy_set,
     get_latest_trading_date,
     get_strategy_status,
     get_trading_calendar_runtime_status,
@@ -41,9 +53,13 @@ from services.scoring_service import (
     get_market_overview,
     now_in_kst,
     normalize_weights,
+    shutdown_scoring_process_pool,
+    strategy_variant_key,
     validate_strategy_request,
     validate_recommendation_request_date,
 )
+from services.sparkline_service import SPARKLINE_ENCODINGS, encode_sparkline
+from services.symbol_master_service import master_record
 from services.validation_service import run_walk_forward_validation
 from services.validation_service import resolve_intraday_branch_by_validation
 
@@ -54,7 +70,11 @@ load_dotenv(Path(__file__).with_name(".env"), override=False)
 async def lifespan(_: FastAPI):
     init_db()
     bootstrap_llm_runtime(probe=True)
+    if PREFETCH_SCHEDULER_ENABLED:
+        start_prefetch_scheduler(_warm_default_candidates)
     yield
+    stop_prefetch_scheduler()
+    shutdown_scoring_process_pool()
 
 
 app = FastAPI(title="Coreline Stock AI API", version="2.1.0", lifespan=lifespan)
@@ -79,6 +99,11 @@ _ENABLE_HSTS = (os.getenv("ENABLE_HSTS", "").strip().lower() == "true")
 _WEB_VITALS_LOG_PATH = Path(os.getenv("WEB_VITALS_LOG_PATH", "/tmp/daily_stock_web_vitals.jsonl"))
 _INTRADAY_FORCE_REFRESH_SYMBOL_LIMIT = max(5, int(os.getenv("INTRADAY_FORCE_REFRESH_SYMBOL_LIMIT", "12")))
 _VALIDATION_COMPUTE_ON_REQUEST = (os.getenv("VALIDATION_COMPUTE_ON_REQUEST", "true").strip().lower() == "true")
+_CANDIDATE_DEADLINE_SEC = max(0.0, float(os.getenv("CANDIDATE_DEADLINE_SEC", "0")))
+_JOINT_STRATEGY_SCORING = (os.getenv("JOINT_STRATEGY_SCORING", "false").strip().lower() == "true")
+_SKIPPED_SYMBOLS_HEADER_LIMIT = 50
+_REFRESHING_CACHE_KEYS: set[str] = set()
+_REFRESHING_LOCK = threading.Lock()
 _ETAG_PATHS = {
     "/api/v1/market-overview",
     "/api/v1/stock-candidates",
@@ -179,10 +204,10 @@ def _require_trusted_origin(request: Request) -> None:
         raise HTTPException(status_code=403, detail="허용되지 않은 Origin 입니다.")
 
 
-def _intraday_cache_bucket(strategy: str, session_date: str) -> str:
+def _intraday_cache_bucket(strategy: str, session_date: str, now: datetime | None = None) -> str:
     if strategy != "intraday":
         return ""
-    now = now_in_kst()
+    now = now or now_in_kst()
     if session_date != now.date().isoformat():
         return ""
     floored = now.replace(minute=(now.minute // 5) * 5, second=0, microsecond=0)
@@ -240,9 +265,12 @@ def _fetch_candidates_best_effort(
     intraday_signal_branch: str | None = None,
     restrict_symbols: list[str] | None = None,
     attempts: int = 2,
+    refresh: bool = False,
+    include_diagnostics: bool = False,
+    deadline: float | None = None,
 ) -> dict[str, Any]:
     best_payload: dict[str, Any] | None = None
-    for _ in range(max(1, attempts)):
+    for attempt in range(max(1, attempts)):
         payload = fetch_and_score_stocks(
             date_str=date,
             weights=weights,
@@ -255,11 +283,26 @@ def _fetch_candidates_best_effort(
             cap_top_n=cap_top_n,
             intraday_signal_branch=intraday_signal_branch,
             restrict_symbols=restrict_symbols,
+            # A retry after a thin result must not be answered from the raw-factor cache.
+            refresh=refresh or attempt > 0,
+            include_diagnostics=include_diagnostics,
+            deadline=deadline,
         )
         if best_payload is None or len(payload["candidates"]) > len(best_payload["candidates"]):
             best_payload = payload
         if _is_candidate_cache_valid(payload["candidates"]):
             break
+        # A retry cannot finish inside a spent budget; the caller refreshes in the background instead.
+        if payload.get("partial") or deadline_expired(deadline):
+            break
+    if _JOINT_STRATEGY_SCORING and restrict_symbols is None and not refresh:
+        _schedule_sibling_scoring(
+            date=date,
+            strategy=strategy,
+            intraday_signal_branch=intraday_signal_branch,
+            session_date=session_date,
+            custom_tickers=custom_tickers,
+        )
     return (
         best_payload
         if best_payload is not None
@@ -267,6 +310,121 @@ def _fetch_candidates_best_effort(
     )
 
 
+def _server_timing_header(diagnostics: dict[str, Any] | None) -> str:
+    if not isinstance(diagnostics, dict):
+        return ""
+    parts = [
+        f"{stage['name']};dur={float(stage.get('elapsedMs', 0.0)):.1f};desc=\"{int(stage.get('count', 0))}\""
+        for stage in diagnostics.get("stages", [])
+        if isinstance(stage, dict) and stage.get("name")
+    ]
+    if diagnostics.get("rawFactorCache"):
+        parts.append(f"raw-factors;desc={diagnostics['rawFactorCache']}")
+    if "totalMs" in diagnostics:
+        parts.append(f"total;dur={float(diagnostics['totalMs']):.1f}")
+    return ", ".join(parts)
+
+
+def _schedule_candidate_refresh(cache_key: str, build: Callable[[], list[dict[str, Any]]]) -> bool:
+    with _REFRESHING_LOCK:
+        if cache_key in _REFRESHING_CACHE_KEYS:
+            return False
+        _REFRESHING_CACHE_KEYS.add(cache_key)
+
+    def _run() -> None:
+        try:
+            candidates = build()
+            if _is_candidate_cache_valid(candidates):
+                _CACHE[cache_key] = candidates
+        except Exception:
+            pass
+        finally:
+            with _REFRESHING_LOCK:
+                _REFRESHING_CACHE_KEYS.discard(cache_key)
+
+    threading.Thread(target=_run, name="candidate-refresh", daemon=True).start()
+    return True
+
+
+def _schedule_sibling_scoring(
+    *,
+    date: str | None,
+    strategy: str,
+    intraday_signal_branch: str | None,
+    session_date: str,
+    custom_tickers: list[str],
+) -> bool:
+    # The other strategy tabs are scored from the frames the requested tab just loaded, outside its
+    # deadline, and fill the raw-factor cache so their requests only re-rank.
+    requested = strategy_variant_key(strategy, intraday_signal_branch)
+    siblings = tuple(variant for variant in STRATEGY_VARIANTS if strategy_variant_key(*variant) != requested)
+    task_key = _build_cache_key(
+        "siblings",
+        session_date=session_date,
+        strategy=requested,
+        custom=",".join(sorted(custom_tickers)),
+    )
+    with _REFRESHING_LOCK:
+        if not siblings or task_key in _REFRESHING_CACHE_KEYS:
+            return False
+        _REFRESHING_CACHE_KEYS.add(task_key)
+
+    def _run() -> None:
+        try:
+            # Only close reads date_str, so the siblings are keyed on the session the tabs will ask for.
+            fetch_and_score_strategy_set(
+                date_str=date if strategy == "close" else session_date,
+                include_sparkline=False,
+                custom_tickers=custom_tickers,
+                session_date_str=session_date,
+                variants=siblings,
+            )
+        except Exception:
+            pass
+        finally:
+            with _REFRESHING_LOCK:
+                _REFRESHING_CACHE_KEYS.discard(task_key)
+
+    threading.Thread(target=_run, name="candidate-siblings", daemon=True).start()
+    return True
+
+
+def _candidate_cache_key(
+    *,
+    effective_date: str,
+    session_date: str,
+    strategy: str,
+    intraday_signal_branch: str | None,
+    user_key: str,
+    custom_tickers: list[str],
+    weights: dict[str, float],
+    include_sparkline: bool,
+    enforce_exposure_cap: bool,
+    max_per_sector: int,
+    cap_top_n: int,
+    auto_regime_weights: bool,
+    now: datetime | None = None,
+) -> str:
+    return _build_cache_key(
+        "candidates",
+        date=effective_date,
+        session_date=session_date,
+        strategy=strategy,
+        intraday_signal_branch=(intraday_signal_branch or ""),
+        intraday_bucket=_intraday_cache_bucket(strategy, session_date, now=now),
+        user_key=user_key,
+        custom=",".join(sorted(custom_tickers)),
+        w_return=weights["return"],
+        w_stability=weights["stability"],
+        w_market=weights["market"],
+        include_sparkline=include_sparkline,
+        cap=enforce_exposure_cap,
+        max_per_sector=max_per_sector,
+        cap_top_n=cap_top_n,
+        auto=auto_regime_weights,
+    )
+
+
 def _decorate_candidates_for_response(
     *,
     candidates: list[dict[str, Any]],
@@ -294,6 +452,18 @@ def _decorate_candidates_for_response(
     return decorated
 
 
+def _encode_candidate_sparklines(candidates: list[dict[str, Any]], encoding: str) -> list[dict[str, Any]]:
+    # The candidate cache keeps float points; compact encodings are applied per response.
+    if encoding == "float":
+        return candidates
+    return [
+        {**item, "sparkline60": encode_sparkline(item["sparkline60"], encoding)}
+        if isinstance(item.get("sparkline60"), list) and item["sparkline60"]
+        else item
+        for item in candidates
+    ]
+
+
 def _parse_ticker_csv(raw: Optional[str]) -> list[str]:
     if not raw:
         return []
@@ -308,7 +478,8 @@ def _symbol_from_code(code: str) -> str | None:
     for symbol in TICKERS.keys():
         if symbol.upper().replace(".KS", "").replace(".KQ", "") == normalized:
             return symbol
-    return None
+    record = master_record(normalized)
+    return str(record["symbol"]) if record else None
 
 
 def _normalize_input_ticker(ticker: str) -> str:
@@ -938,6 +1109,72 @@ def market_overview(
     return overview
 
 
+def _warm_default_candidates(strategy: str, window_open: datetime) -> bool:
+    # Mirrors a default stock_candidates request as it will look when the window opens.
+    strategy_ctx = validate_strategy_request(strategy, window_open.date().isoformat(), now_kst_value=window_open)
+    if strategy_ctx.get("errorCode"):
+        return False
+    effective_date = str(strategy_ctx["signalDate"])
+    session_date = str(strategy_ctx["sessionDate"])
+    resolved_strategy = str(strategy_ctx["strategy"])
+    user_key = "default"
+    resolved_custom = _resolve_custom_tickers(user_key=user_key, custom_tickers_csv=None)
+    weights = normalize_weights()
+    effective_intraday_branch = _resolve_effective_intraday_signal_branch(
+        strategy=resolved_strategy,
+        requested_branch=None,
+        as_of_date=session_date,
+        custom_tickers=resolved_custom,
+        weights=weights,
+    )
+    payload = _fetch_candidates_best_effort(
+        date=effective_date,
+        weights=weights,
+        include_sparkline=True,
+        strategy=resolved_strategy,
+        session_date=session_date,
+        custom_tickers=resolved_custom,
+        enforce_exposure_cap=False,
+        max_per_sector=2,
+        cap_top_n=5,
+        intraday_signal_branch=effective_intraday_branch,
+    )
+    if _intraday_cache_bucket(resolved_strategy, session_date) != _intraday_cache_bucket(
+        resolved_strategy, session_date, now=window_open
+    ):
+        # Scored before the window's 5-minute bucket, so it has no session bars for it; the pass
+        # only warms the frames and stores underneath.
+        return True
+    fresh = _decorate_candidates_for_response(
+        candidates=payload["candidates"],
+        session_date=session_date,
+        effective_date=effective_date,
+        resolved_strategy=resolved_strategy,
+        strategy_reason=str(strategy_ctx.get("strategyReason") or ""),
+        weights=weights,
+        regime_name=None,
+    )
+    if not _is_candidate_cache_valid(fresh):
+        return False
+    cache_key = _candidate_cache_key(
+        effective_date=effective_date,
+        session_date=session_date,
+        strategy=resolved_strategy,
+        intraday_signal_branch=effective_intraday_branch,
+        user_key=user_key,
+        custom_tickers=resolved_custom,
+        weights=weights,
+        include_sparkline=True,
+        enforce_exposure_cap=False,
+        max_per_sector=2,
+        cap_top_n=5,
+        auto_regime_weights=False,
+        now=window_open,
+    )
+    _CACHE[cache_key] = _strip_validation_annotations(fresh)
+    return True
+
+
 @app.get("/api/v1/stock-candidates")
 def stock_candidates(
     date: Optional[str] = None,
@@ -956,9 +1193,19 @@ def stock_candidates(
     intraday_signal_branch: Optional[str] = Query(default=None),
     force_refresh: bool = False,
     refresh_token: Optional[str] = None,
+    sparkline_encoding: str = Query(default="float"),
+    deadline_ms: Optional[int] = Query(default=None, ge=100, le=120_000),
+    response: Response = None,
 ) -> list[dict[str, Any]]:
+    if sparkline_encoding not in SPARKLINE_ENCODINGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sparkline_encoding은 {', '.join(SPARKLINE_ENCODINGS)} 중 하나여야 합니다.",
+        )
     force_refresh_flag = bool(force_refresh)
     refresh_token_value = refresh_token if isinstance(refresh_token, str) else None
+    budget_sec = (deadline_ms / 1000.0) if isinstance(deadline_ms, int) else _CANDIDATE_DEADLINE_SEC
+    request_deadline = (monotonic() + budget_sec) if budget_sec > 0 else None
     strategy_ctx = _ensure_strategy_allowed(date=date, strategy=strategy)
     effective_date = str(strategy_ctx["signalDate"])
     session_date = str(strategy_ctx["sessionDate"])
@@ -990,23 +1237,19 @@ def stock_candidates(
         compare_branches=False,
         compute_if_missing=include_validation and (not force_refresh_flag) and _VALIDATION_COMPUTE_ON_REQUEST,
     )
-    cache_key = _build_cache_key(
-        "candidates",
-        date=effective_date,
+    cache_key = _candidate_cache_key(
+        effective_date=effective_date,
         session_date=session_date,
         strategy=resolved_strategy,
-        intraday_signal_branch=(effective_intraday_branch or ""),
-        intraday_bucket=_intraday_cache_bucket(resolved_strategy, session_date),
+        intraday_signal_branch=effective_intraday_branch,
         user_key=user_key,
-        custom=",".join(sorted(resolved_custom)),
-        w_return=weights["return"],
-        w_stability=weights["stability"],
-        w_market=weights["market"],
+        custom_tickers=resolved_custom,
+        weights=weights,
         include_sparkline=include_sparkline,
-        cap=enforce_exposure_cap,
+        enforce_exposure_cap=enforce_exposure_cap,
         max_per_sector=max_per_sector,
         cap_top_n=cap_top_n,
-        auto=effective_auto_regime_weights,
+        auto_regime_weights=effective_auto_regime_weights,
     )
     cached_candidates = _CACHE.get(cache_key)
     restrict_symbols: list[str] | None = None
@@ -1026,6 +1269,8 @@ def stock_candidates(
         if not restrict_symbols:
             restrict_symbols = list(TICKERS.keys())[:_INTRADAY_FORCE_REFRESH_SYMBOL_LIMIT]
     if not force_refresh_flag and _is_candidate_cache_valid(cached_candidates):
+        if response is not None:
+            response.headers["Server-Timing"] = "cache;desc=hit"
         decorated = _decorate_candidates_for_response(
             candidates=cached_candidates,
             session_date=session_date,
@@ -1035,7 +1280,10 @@ def stock_candidates(
             weights=weights,
             regime_name=regime["regime"] if regime else None,
         )
-        return _attach_validation_to_candidates(decorated, validation_summary=validation_summary)
+        return _encode_candidate_sparklines(
+            _attach_validation_to_candidates(decorated, validation_summary=validation_summary),
+            sparkline_encoding,
+        )
 
     payload = _fetch_candidates_best_effort(
         date=effective_date,
@@ -1050,7 +1298,51 @@ def stock_candidates(
         intraday_signal_branch=effective_intraday_branch,
         restrict_symbols=restrict_symbols,
         attempts=fetch_attempts,
+        refresh=force_refresh_flag,
+        include_diagnostics=True,
+        deadline=request_deadline,
     )
+    server_timing = _server_timing_header(payload.get("diagnostics"))
+    if response is not None and server_timing:
+        response.headers["Server-Timing"] = server_timing
+    partial = bool(payload.get("partial"))
+    if partial:
+        skipped_symbols = [str(symbol) for symbol in payload.get("skippedSymbols", [])]
+        if response is not None:
+            response.headers["X-Candidates-Partial"] = "true"
+            response.headers["X-Candidates-Skipped-Count"] = str(len(skipped_symbols))
+            response.headers["X-Candidates-Skipped"] = ",".join(skipped_symbols[:_SKIPPED_SYMBOLS_HEADER_LIMIT])
+        if restrict_symbols is None:
+
+            def _rebuild_without_deadline() -> list[dict[str, Any]]:
+                rebuilt = _fetch_candidates_best_effort(
+                    date=effective_date,
+                    weights=weights,
+                    include_sparkline=include_sparkline,
+                    strategy=resolved_strategy,
+                    session_date=session_date,
+                    custom_tickers=resolved_custom,
+                    enforce_exposure_cap=enforce_exposure_cap,
+                    max_per_sector=max_per_sector,
+                    cap_top_n=cap_top_n,
+                    intraday_signal_branch=effective_intraday_branch,
+                    attempts=1,
+                )
+                if rebuilt.get("partial"):
+                    return []
+                return _strip_validation_annotations(
+                    _decorate_candidates_for_response(
+                        candidates=rebuilt["candidates"],
+                        session_date=session_date,
+                        effective_date=effective_date,
+                        resolved_strategy=resolved_strategy,
+                        strategy_reason=strategy_reason,
+                        weights=weights,
+                        regime_name=regime["regime"] if regime else None,
+                    )
+                )
+
+            _schedule_candidate_refresh(cache_key, _rebuild_without_deadline)
     fresh = _decorate_candidates_for_response(
         candidates=payload["candidates"],
         session_date=session_date,
@@ -1068,10 +1360,15 @@ def stock_candidates(
             top_n=cap_top_n,
             refresh_token=refresh_token_value,
         )
-    fresh_for_response = _attach_validation_to_candidates(fresh, validation_summary=validation_summary)
+    fresh_for_response = _encode_candidate_sparklines(
+        _attach_validation_to_candidates(fresh, validation_summary=validation_summary),
+        sparkline_encoding,
+    )
     fresh_for_cache = _strip_validation_annotations(fresh)
     if _is_candidate_cache_valid(fresh):
-        _CACHE[cache_key] = fresh_for_cache
+        # Partial lists are served once but never cached; the background refresh fills the cache.
+        if not partial:
+            _CACHE[cache_key] = fresh_for_cache
         return fresh_for_response
 
     if (not force_refresh_flag) and isinstance(cached_candidates, list) and len(cached_candidates) > len(fresh):
@@ -1084,11 +1381,174 @@ def stock_candidates(
             weights=weights,
             regime_name=regime["regime"] if regime else None,
         )
-        return _attach_validation_to_candidates(fallback, validation_summary=validation_summary)
-    _CACHE[cache_key] = fresh_for_cache
+        return _encode_candidate_sparklines(
+            _attach_validation_to_candidates(fallback, validation_summary=validation_summary),
+            sparkline_encoding,
+        )
+    if not partial:
+        _CACHE[cache_key] = fresh_for_cache
     return fresh_for_response
 
 
+def _stream_event_line(event: dict[str, Any], stream_format: str) -> str:
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if stream_format == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return f"{data}\n"
+
+
+@app.get("/api/v1/stock-candidates/stream")
+def stock_candidates_stream(
+    date: Optional[str] = None,
+    w_return: float = Query(default=0.4),
+    w_stability: float = Query(default=0.3),
+    w_market: float = Query(default=0.3),
+    include_sparkline: bool = Query(default=True),
+    user_key: str = Query(default="default"),
+    custom_tickers: Optional[str] = Query(default=None),
+    strategy: Optional[str] = Query(default=None),
+    auto_regime_weights: bool = Query(default=False),
+    enforce_exposure_cap: bool = Query(default=False),
+    max_per_sector: int = Query(default=2, ge=1, le=5),
+    cap_top_n: int = Query(default=5, ge=1, le=20),
+    intraday_signal_branch: Optional[str] = Query(default=None),
+    force_refresh: bool = False,
+    sparkline_encoding: str = Query(default="float"),
+    deadline_ms: Optional[int] = Query(default=None, ge=100, le=120_000),
+    stream_format: str = Query(default="ndjson", alias="format"),
+) -> StreamingResponse:
+    if sparkline_encoding not in SPARKLINE_ENCODINGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sparkline_encoding은 {', '.join(SPARKLINE_ENCODINGS)} 중 하나여야 합니다.",
+        )
+    if stream_format not in {"ndjson", "sse"}:
+        raise HTTPException(status_code=400, detail="format은 ndjson, sse 중 하나여야 합니다.")
+    force_refresh_flag = bool(force_refresh)
+    budget_sec = (deadline_ms / 1000.0) if isinstance(deadline_ms, int) else _CANDIDATE_DEADLINE_SEC
+    request_deadline = (monotonic() + budget_sec) if budget_sec > 0 else None
+    strategy_ctx = _ensure_strategy_allowed(date=date, strategy=strategy)
+    effective_date = str(strategy_ctx["signalDate"])
+    session_date = str(strategy_ctx["sessionDate"])
+    resolved_strategy = str(strategy_ctx["strategy"])
+    strategy_reason = str(strategy_ctx.get("strategyReason") or "")
+    resolved_custom = _resolve_custom_tickers(user_key=user_key, custom_tickers_csv=custom_tickers)
+    effective_auto_regime_weights = auto_regime_weights and resolved_strategy != "intraday"
+    weights, regime = _resolve_weights(
+        date=effective_date,
+        custom_tickers=resolved_custom,
+        w_return=w_return,
+        w_stability=w_stability,
+        w_market=w_market,
+        auto_regime_weights=effective_auto_regime_weights,
+    )
+    effective_intraday_branch = _resolve_effective_intraday_signal_branch(
+        strategy=resolved_strategy,
+        requested_branch=intraday_signal_branch,
+        as_of_date=session_date,
+        custom_tickers=resolved_custom,
+        weights=weights,
+    )
+    # Streaming never blocks on a validation run; a stored summary is still attached to the final frame.
+    validation_summary = _resolve_strategy_validation(
+        strategy=resolved_strategy,
+        as_of_date=session_date,
+        custom_tickers=resolved_custom,
+        weights=weights,
+        intraday_signal_branch=effective_intraday_branch,
+        compare_branches=False,
+        compute_if_missing=False,
+    )
+    cache_key = _candidate_cache_key(
+        effective_date=effective_date,
+        session_date=session_date,
+        strategy=resolved_strategy,
+        intraday_signal_branch=effective_intraday_branch,
+        user_key=user_key,
+        custom_tickers=resolved_custom,
+        weights=weights,
+        include_sparkline=include_sparkline,
+        enforce_exposure_cap=enforce_exposure_cap,
+        max_per_sector=max_per_sector,
+        cap_top_n=cap_top_n,
+        auto_regime_weights=effective_auto_regime_weights,
+    )
+    cached_candidates = _CACHE.get(cache_key)
+
+    def _final_event(candidates: list[dict[str, Any]], partial: bool = False) -> dict[str, Any]:
+        decorated = _decorate_candidates_for_response(
+            candidates=candidates,
+            session_date=session_date,
+            effective_date=effective_date,
+            resolved_strategy=resolved_strategy,
+            strategy_reason=strategy_reason,
+            weights=weights,
+            regime_name=regime["regime"] if regime else None,
+        )
+        annotated = _attach_validation_to_candidates(decorated, validation_summary=validation_summary)
+        return {
+            "type": "final",
+            "candidates": _encode_candidate_sparklines(annotated, sparkline_encoding),
+            "partial": partial,
+        }
+
+    events: queue.Queue[dict[str, Any] | None] = queue.Queue()
+
+    def _produce() -> None:
+        try:
+            payload = fetch_and_score_stocks(
+                date_str=effective_date,
+                weights=weights,
+                include_sparkline=include_sparkline,
+                strategy=resolved_strategy,
+                session_date_str=session_date,
+                custom_tickers=resolved_custom,
+                enforce_exposure_cap=enforce_exposure_cap,
+                max_per_sector=max_per_sector,
+                cap_top_n=cap_top_n,
+                intraday_signal_branch=effective_intraday_branch,
+                refresh=force_refresh_flag,
+                deadline=request_deadline,
+                on_candidate=lambda candidate: events.put({"type": "candidate", "candidate": candidate}),
+            )
+            candidates = payload["candidates"]
+            partial = bool(payload.get("partial"))
+            if not partial and _is_candidate_cache_valid(candidates):
+                _CACHE[cache_key] = _strip_validation_annotations(
+                    _decorate_candidates_for_response(
+                        candidates=candidates,
+                        session_date=session_date,
+                        effective_date=effective_date,
+                        resolved_strategy=resolved_strategy,
+                        strategy_reason=strategy_reason,
+                        weights=weights,
+                        regime_name=regime["regime"] if regime else None,
+                    )
+                )
+            events.put(_final_event(candidates, partial=partial))
+        except Exception as exc:
+            events.put({"type": "error", "detail": str(exc)})
+        finally:
+            events.put(None)
+
+    def _iter_events():
+        if not force_refresh_flag and _is_candidate_cache_valid(cached_candidates):
+            yield _stream_event_line(_final_event(cached_candidates), stream_format)
+            return
+        threading.Thread(target=_produce, name="candidate-stream", daemon=True).start()
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            yield _stream_event_line(event, stream_format)
+
+    return StreamingResponse(
+        _iter_events(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/v1/stocks/{ticker}/detail")
 def stock_detail(
     ticker: str,
@@ -1386,6 +1846,10 @@ def health() -> dict[str, Any]:
         warnings.append(
             f"거래일 캘린더 외부 소스를 사용할 수 없어({calendar_status.get('reason')}), yfinance 보조 로직으로 동작합니다."
         )
+    if DAILY_STORE_UNAVAILABLE_REASON:
+        warnings.append(
+            f"일봉 저장소를 사용할 수 없어({DAILY_STORE_UNAVAILABLE_REASON}), 매 요청마다 벤더에서 일봉을 조회합니다."
+        )
 
     if not is_db_enabled():
         warnings.append("데이터베이스가 비활성화되어 있습니다. 영속 저장을 사용하려면 DATABASE_URL을 설정하세요.")
@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import tracemalloc
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import services.daily_store_service as daily_store_service
+import services.exchange_suffix_service as exchange_suffix_service
+import services.fetch_executor_service as fetch_executor_service
+import services.indicator_state_service as indicator_state_service
+import services.intraday_session_state_service as intraday_session_state_service
+import services.intraday_store_service as intraday_store_service
+import services.scoring_service as scoring_service
+from services.frame_cache_service import clear_frame_cache
+from services.indicator_state_service import clear_indicator_states
+
+BENCHMARK_VERSION = 1
+MIN_SYMBOLS = 50
+MAX_SYMBOLS = 5000
+STRATEGIES = ("premarket", "intraday", "close")
+DEFAULT_SESSION_DATE = "2026-02-20"
+DEFAULT_BASELINE_PATH = ROOT_DIR / "data" / "benchmarks" / "scoring_baseline.json"
+# Stages faster than this are dominated by timer noise and are not compared against the baseline.
+MIN_COMPARED_STAGE_MS = 5.0
+
+_DAILY_HISTORY_DAYS = 160
+_INTRADAY_HISTORY_DAYS = 5
+_INTRADAY_SLOTS = pd.timedelta_range("09:00:00", "15:20:00", freq="5min")
+# Volume regimes: quiet / normal / surge multipliers, with sticky Markov transitions.
+_VOLUME_REGIMES = np.array([0.55, 1.0, 2.6])
+_VOLUME_REGIME_VOL = np.array([0.8, 1.0, 1.6])
+_REGIME_TRANSITIONS = np.array(
+    [
+        [0.92, 0.07, 0.01],
+        [0.05, 0.90, 0.05],
+        [0.02, 0.28, 0.70],
+    ]
+)
+
+
+def _symbol_rng(seed: int, code: str, salt: int = 0) -> np.random.Generator:
+    return np.random.default_rng([seed, zlib.crc32(code.encode("utf-8")), salt])
+
+
+def _volume_regimes(rng: np.random.Generator, length: int) -> np.ndarray:
+    states = np.empty(length, dtype=np.int64)
+    states[0] = 1
+    draws = rng.random(length)
+    cumulative = _REGIME_TRANSITIONS.cumsum(axis=1)
+    for i in range(1, length):
+        states[i] = int(np.searchsorted(cumulative[states[i - 1]], draws[i]))
+    return np.minimum(states, len(_VOLUME_REGIMES) - 1)
+
+
+def generate_daily_frame(code: str, end_date: str, seed: int, periods: int = _DAILY_HISTORY_DAYS) -> pd.DataFrame:
+    # Geometric Brownian motion closes; volatility and volume both scale with the volume regime.
+    rng = _symbol_rng(seed, code)
+    index = pd.bdate_range(end=end_date, periods=periods)
+    start_price = float(rng.uniform(2_000, 400_000))
+    drift = float(rng.normal(0.0004, 0.0008))
+    sigma = float(rng.uniform(0.008, 0.035))
+    base_volume = float(rng.lognormal(mean=13.0, sigma=1.1))
+
+    regimes = _volume_regimes(rng, periods)
+    step_sigma = sigma * _VOLUME_REGIME_VOL[regimes]
+    log_returns = (drift - 0.5 * step_sigma**2) + step_sigma * rng.standard_normal(periods)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate(([start_price], close[:-1])) * np.exp(rng.normal(0.0, sigma * 0.3, periods))
+    spread = np.abs(rng.normal(0.0, step_sigma, periods)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.maximum(np.minimum(open_, close) - spread, close * 0.5)
+    volume = np.round(base_volume * _VOLUME_REGIMES[regimes] * rng.lognormal(0.0, 0.35, periods))
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def generate_intraday_frame(
+    code: str,
+    session_date: str,
+    seed: int,
+    days: int = _INTRADAY_HISTORY_DAYS,
+) -> pd.DataFrame:
+    # 5-minute bars on the 09:00-15:20 KST grid with a U-shaped volume profile.
+    rng = _symbol_rng(seed, code, salt=1)
+    sessions = pd.bdate_range(end=session_date, periods=days)
+    index = pd.DatetimeIndex(
+        [session + slot for session in sessions for slot in _INTRADAY_SLOTS]
+    ).tz_localize(scoring_service.KST)
+    slots = len(_INTRADAY_SLOTS)
+    sigma = float(rng.uniform(0.001, 0.004))
+    start_price = float(rng.uniform(2_000, 400_000))
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, sigma, len(index))))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    spread = np.abs(rng.normal(0.0, sigma, len(index))) * close
+    profile = 1.0 + 2.0 * np.linspace(-1.0, 1.0, slots) ** 2
+    day_scale = np.repeat(_VOLUME_REGIMES[_volume_regimes(rng, days)], slots)
+    volume = np.round(rng.lognormal(9.0, 0.4, len(index)) * np.tile(profile, days) * day_scale)
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Volume": volume,
+        },
+        index=index,
+    )
+
+
+def build_synthetic_market(symbol_count: int, session_date: str, seed: int) -> dict[str, Any]:
+    if not MIN_SYMBOLS <= symbol_count <= MAX_SYMBOLS:
+        raise ValueError(f"symbol_count must be between {MIN_SYMBOLS} and {MAX_SYMBOLS}")
+    universe: dict[str, str] = {}
+    daily: dict[str, pd.DataFrame] = {}
+    intraday: dict[str, pd.DataFrame] = {}
+    for i in range(symbol_count):
+        code = f"{900000 + i:06d}"
+        symbol = f"{code}{'.KS' if i % 2 == 0 else '.KQ'}"
+        universe[symbol] = f"Synthetic {code}"
+        daily[code] = generate_daily_frame(code, session_date, seed)
+        intraday[code] = generate_intraday_frame(code, session_date, seed)
+    return {"seed": seed, "sessionDate": session_date, "universe": universe, "daily": daily, "intraday": intraday}
+
+
+def _market_code(symbol: str) -> str:
+    return symbol.split(".", 1)[0].upper()
+
+
+def _window(frame: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+    return frame[(index >= pd.Timestamp(start_date)) & (index < pd.Timestamp(end_date))]
+
+
+@contextmanager
+def synthetic_market_patches(market: dict[str, Any], intraday_mode: str = "bars") -> Iterator[None]:
+    # Serve every vendor call from the generated market; index tickers get their own synthetic series.
+    daily: dict[str, pd.DataFrame] = market["daily"]
+    extra: dict[str, pd.DataFrame] = {}
+
+    def _daily(symbol: str) -> pd.DataFrame:
+        code = _market_code(symbol)
+        frame = daily.get(code)
+        if frame is None:
+            frame = extra.get(code)
+        if frame is None:
+            frame = extra[code] = generate_daily_frame(code, market["sessionDate"], market["seed"])
+        return frame
+
+    def download_frame(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        return _window(_daily(symbol), start_date, end_date)
+
+    def download_frames(symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]:
+        return {symbol: download_frame(symbol, start_date, end_date) for symbol in symbols}
+
+    def download_intraday_frame(
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = "5m",
+    ) -> pd.DataFrame:
+        frame = market["intraday"].get(_market_code(symbol))
+        if frame is None:
+            return pd.DataFrame()
+        return _window(frame, start_date, end_date)
+
+    def news_items(code: str, max_items: int = 10) -> list[dict[str, str]]:
+        rng = _symbol_rng(market["seed"], code, salt=2)
+        published = pd.Timestamp(market["sessionDate"], tz=scoring_service.KST) - pd.Timedelta(hours=3)
+        words = ("상승", "호재", "하락", "악재", "실적", "수주")
+        return [
+            {
+                "title": f"{code} {words[int(rng.integers(len(words)))]} 전망",
+                "publishedAt": (published - pd.Timedelta(minutes=37 * i)).isoformat(),
+            }
+            for i in range(int(rng.integers(0, max_items + 1)))
+        ]
+
+    patches = [
+        (scoring_service, "_download_frame", download_frame),
+        (scoring_service, "_download_frames", download_frames),
+        (scoring_service, "_download_intraday_frame", download_intraday_frame),
+        (scoring_service, "_build_universe", lambda custom_tickers=None, restrict_symbols=None: dict(market["universe"])),
+        (scoring_service, "fetch_stock_news_items", news_items),
+        (scoring_service, "INTRADAY_MODE", intraday_mode),
+        # The vendor throttle would otherwise dominate the overlay stage with sleeps.
+        (fetch_executor_service, "FETCH_RATE_LIMIT_PER_SEC", 0.0),
+    ]
+    # Synthetic codes and bars must not reach the real stores or the learned exchange map.
+    state_dir = tempfile.TemporaryDirectory(prefix="benchmark-state-")
+    state_root = Path(state_dir.name)
+    patches += [
+        (exchange_suffix_service, "EXCHANGE_SUFFIX_MAP_PATH", state_root / "exchange_suffix_map.json"),
+        (daily_store_service, "DAILY_STORE_DIR", state_root / "daily"),
+        (intraday_store_service, "INTRADAY_STORE_DIR", state_root / "intraday"),
+        (indicator_state_service, "INDICATOR_STATE_DIR", state_root / "indicator_state"),
+        (intraday_session_state_service, "INTRADAY_SESSION_STATE_DIR", state_root / "intraday_session_state"),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, value in patches:
+        setattr(module, name, value)
+    exchange_suffix_service.reset_exchange_suffix_map()
+    clear_frame_cache()
+    try:
+        yield
+    finally:
+        for module, name, value in originals:
+            setattr(module, name, value)
+        exchange_suffix_service.reset_exchange_suffix_map()
+        clear_frame_cache()
+        state_dir.cleanup()
+
+
+def _candidate_checksum(candidates: list[dict[str, Any]]) -> str:
+    digest = hashlib.sha256()
+    for item in candidates:
+        digest.update(f"{item.get('code')}:{item.get('score')}|".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _score_once(strategy: str, session_date: str) -> tuple[dict[str, Any], float]:
+    scoring_service.clear_raw_factor_cache()
+    clear_indicator_states()
+    started = perf_counter()
+    result = scoring_service.fetch_and_score_stocks(
+        date_str=session_date,
+        strategy=strategy,
+        session_date_str=session_date,
+        include_diagnostics=True,
+    )
+    return result, (perf_counter() - started) * 1000
+
+
+def _peak_memory_mb(strategy: str, session_date: str) -> float:
+    tracemalloc.start()
+    try:
+        _score_once(strategy, session_date)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def run_benchmark(
+    symbol_count: int = 500,
+    strategies: tuple[str, ...] = STRATEGIES,
+    repeat: int = 3,
+    seed: int = 7,
+    session_date: str = DEFAULT_SESSION_DATE,
+    measure_memory: bool = True,
+) -> dict[str, Any]:
+    market = build_synthetic_market(symbol_count, session_date, seed)
+    report: dict[str, Any] = {
+        "version": BENCHMARK_VERSION,
+        "createdAt": datetime.now(scoring_service.KST).isoformat(timespec="seconds"),
+        "config": {
+            "symbols": symbol_count,
+            "repeat": repeat,
+            "seed": seed,
+            "sessionDate": session_date,
+            "executionMode": scoring_service.SCORING_EXECUTION_MODE,
+            "chunkSize": scoring_service._universe_chunk_size(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "strategies": {},
+    }
+    with synthetic_market_patches(market):
+        # The exchange calendar loads once per process; keep that out of the timed runs.
+        scoring_service.get_latest_trading_date(session_date)
+        scoring_service.get_previous_trading_date(session_date)
+        for strategy in strategies:
+            totals: list[float] = []
+            stage_runs: dict[str, list[float]] = {}
+            result: dict[str, Any] = {}
+            for _ in range(max(1, repeat)):
+                result, total_ms = _score_once(strategy, session_date)
+                totals.append(total_ms)
+                for stage in result["diagnostics"]["stages"]:
+                    stage_runs.setdefault(stage["name"], []).append(stage["elapsedMs"])
+            total_ms = statistics.median(totals)
+            report["strategies"][strategy] = {
+                "totalMs": round(total_ms, 2),
+                "symbolsPerSec": round(symbol_count / (total_ms / 1000), 1) if total_ms > 0 else None,
+                "stages": {name: round(statistics.median(values), 2) for name, values in stage_runs.items()},
+                "peakMemoryMb": _peak_memory_mb(strategy, session_date) if measure_memory else None,
+                "candidates": len(result["candidates"]),
+                "failures": len(result["diagnostics"]["failures"]),
+                "checksum": _candidate_checksum(result["candidates"]),
+            }
+    return report
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.25) -> list[str]:
+    regressions: list[str] = []
+    if baseline.get("config", {}).get("symbols") != current.get("config", {}).get("symbols"):
+        regressions.append("symbol count differs from the baseline; results are not comparable")
+        return regressions
+    limit = 1.0 + tolerance
+    for strategy, before in baseline.get("strategies", {}).items():
+        after = current.get("strategies", {}).get(strategy)
+        if after is None:
+            continue
+        if after["totalMs"] > before["totalMs"] * limit:
+            regressions.append(f"{strategy}: total {before['totalMs']}ms -> {after['totalMs']}ms")
+        for name, before_ms in before.get("stages", {}).items():
+            after_ms = after.get("stages", {}).get(name)
+            if after_ms is None or before_ms < MIN_COMPARED_STAGE_MS:
+                continue
+            if after_ms > before_ms * limit:
+                regressions.append(f"{strategy}/{name}: {before_ms}ms -> {after_ms}ms")
+        if before.get("peakMemoryMb") and after.get("peakMemoryMb"):
+            if after["peakMemoryMb"] > before["peakMemoryMb"] * limit:
+                regressions.append(f"{strategy}: peak memory {before['peakMemoryMb']}MB -> {after['peakMemoryMb']}MB")
+        if before.get("checksum") != after.get("checksum"):
+            regressions.append(f"{strategy}: ranked output changed (checksum {before.get('checksum')} -> {after.get('checksum')})")
+    return regressions
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Deterministic fetch_and_score_stocks benchmark on synthetic OHLCV data.")
+    parser.add_argument("--symbols", type=int, default=500, help=f"Universe size ({MIN_SYMBOLS}-{MAX_SYMBOLS}).")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="Comma-separated strategies to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per strategy; the median is reported.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--date", dest="session_date", default=DEFAULT_SESSION_DATE, help="Session date in YYYY-MM-DD.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run.")
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE_PATH), default=None)
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE_PATH), default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown ratio before flagging.")
+    args = parser.parse_args()
+    if not MIN_SYMBOLS <= args.symbols <= MAX_SYMBOLS:
+        parser.error(f"--symbols must be between {MIN_SYMBOLS} and {MAX_SYMBOLS}")
+    strategies = tuple(item.strip() for item in args.strategies.split(",") if item.strip())
+    unknown = [item for item in strategies if item not in STRATEGIES]
+    if unknown or not strategies:
+        parser.error(f"unknown strategies: {', '.join(unknown) or '(none)'}")
+    args.strategies = strategies
+    try:
+        datetime.strptime(args.session_date, "%Y-%m-%d")
+    except ValueError:
+        parser.error("--date must be YYYY-MM-DD")
+    return args
+
+
+def main() -> int:
+    args = _parse_args()
+    report = run_benchmark(
+        symbol_count=args.symbols,
+        strategies=args.strategies,
+        repeat=args.repeat,
+        seed=args.seed,
+        session_date=args.session_date,
+        measure_memory=not args.no_memory,
+    )
+
+    print(f"Scoring benchmark symbols={args.symbols} repeat={args.repeat} seed={args.seed} date={args.session_date}")
+    for strategy, stats in report["strategies"].items():
+        stages = " ".join(f"{name}={ms}ms" for name, ms in stats["stages"].items())
+        print(
+            f"- {strategy}: total={stats['totalMs']}ms symbols/sec={stats['symbolsPerSec']} "
+            f"peak={stats['peakMemoryMb']}MB candidates={stats['candidates']} checksum={stats['checksum']}"
+        )
+        print(f"  {stages}")
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Saved baseline to {path}")
+
+    if args.compare:
+        path = Path(args.compare)
+        if not path.exists():
+            print(f"Baseline not found: {path}")
+            return 1
+        regressions = compare_reports(json.loads(path.read_text(encoding="utf-8")), report, args.tolerance)
+        if regressions:
+            print(f"Regressions against {path} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"- {line}")
+            return 1
+        print(f"No regressions against {path} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from services.intraday_store_service import INTRADAY_STORE_DIR, compact_intraday_store
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Merge multi-part intraday session partitions into one file each.")
+    parser.add_argument("--symbol", default=None, help="Only compact this symbol (e.g. 005930.KS).")
+    parser.add_argument("--interval", default=None, help="Only compact this interval (e.g. 5m).")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    compacted = compact_intraday_store(symbol=args.symbol, interval=args.interval)
+    print(f"Compacted {compacted} partition(s) under {INTRADAY_STORE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from services.market_data_service import provider_data_path
+
+try:
+    import pyarrow  # noqa: F401  # parquet engine for pandas
+except Exception:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+_STORE_MODE = (os.getenv("DAILY_STORE_MODE", "parquet").strip().lower() or "parquet")
+DAILY_STORE_MODE = _STORE_MODE if _STORE_MODE in {"off", "parquet"} else "parquet"
+# Without a parquet engine every read and write would fail quietly; switch the store off instead
+# and let /api/v1/health report it.
+DAILY_STORE_UNAVAILABLE_REASON = (
+    "pyarrow is not installed" if DAILY_STORE_MODE == "parquet" and pyarrow is None else None
+)
+if DAILY_STORE_UNAVAILABLE_REASON:
+    DAILY_STORE_MODE = "off"
+DAILY_STORE_DIR = provider_data_path(
+    "daily",
+    Path(
+        os.getenv(
+            "DAILY_STORE_DIR",
+            str(Path(__file__).resolve().parents[1] / "data" / "daily"),
+        )
+    ),
+)
+# A stored bar is treated as final once it was fetched this long after its session date.
+DAILY_STORE_SETTLE_HOURS = max(1, int(os.getenv("DAILY_STORE_SETTLE_HOURS", "30")))
+
+KST = ZoneInfo("Asia/Seoul")
+_WRITE_LOCK = threading.Lock()
+
+DailyFetcher = Callable[[str, datetime, datetime], pd.DataFrame]
+DailyBatchFetcher = Callable[[list[str], datetime, datetime], dict[str, pd.DataFrame]]
+
+
+def _normalized_symbol(symbol: str) -> str:
+    return (symbol or "").strip().upper().replace("/", "_")
+
+
+def _store_path(symbol: str) -> Path:
+    return DAILY_STORE_DIR / f"{_normalized_symbol(symbol)}_1d.parquet"
+
+
+def _meta_path(symbol: str) -> Path:
+    return DAILY_STORE_DIR / f"{_normalized_symbol(symbol)}_1d.json"
+
+
+def _read_parquet(path: Path) -> pd.DataFrame | None:
+    if not path.exists():
+        return None
+    try:
+        frame = pd.read_parquet(path)
+    except Exception:
+        return None
+    if frame.empty:
+        return frame
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = pd.to_datetime(frame.index, errors="coerce")
+        frame = frame[~frame.index.isna()]
+    return frame.sort_index()
+
+
+def _read_meta(symbol: str) -> dict[str, Any]:
+    path = _meta_path(symbol)
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _write_store(symbol: str, frame: pd.DataFrame, meta: dict[str, Any]) -> bool:
+    try:
+        DAILY_STORE_DIR.mkdir(parents=True, exist_ok=True)
+        frame.to_parquet(_store_path(symbol))
+        _meta_path(symbol).write_text(json.dumps(meta), encoding="utf-8")
+        return True
+    except Exception:
+        return False
+
+
+def _naive_day(value: Any) -> datetime:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize().to_pydatetime()
+
+
+def _clip_by_range(frame: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    if frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+        return frame
+    idx = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+    return frame[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+
+def _has_weekday_between(first_day: datetime, last_day: datetime) -> bool:
+    cursor = first_day
+    while cursor <= last_day:
+        if cursor.weekday() < 5:
+            return True
+        cursor += timedelta(days=1)
+    return False
+
+
+def _plan_missing_ranges(
+    stored: pd.DataFrame | None,
+    meta: dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+    now: datetime,
+) -> list[tuple[datetime, datetime]]:
+    if stored is None or stored.empty:
+        return [(start_date, end_date)]
+
+    ranges: list[tuple[datetime, datetime]] = []
+    first_day = _naive_day(stored.index.min())
+    last_day = _naive_day(stored.index.max())
+    covered_from = _naive_day(meta.get("coveredFrom") or first_day)
+    if start_date < covered_from:
+        ranges.append((start_date, min(covered_from, end_date)))
+
+    last_requested_day = _naive_day(end_date) - timedelta(days=1)
+    if last_day > last_requested_day:
+        return ranges
+
+    fetched_at_raw = meta.get("fetchedAt")
+    fetched_at = pd.Timestamp(fetched_at_raw).to_pydatetime() if fetched_at_raw else datetime.min
+    last_bar_settled = fetched_at >= last_day + timedelta(hours=DAILY_STORE_SETTLE_HOURS)
+    newer_sessions_possible = _has_weekday_between(last_day + timedelta(days=1), min(last_requested_day, now))
+    if newer_sessions_possible or not last_bar_settled:
+        # Re-fetch from the last stored bar so a correction to it is merged as well.
+        ranges.append((max(last_day, start_date), end_date))
+    return ranges
+
+
+def _merge_frames(existing: pd.DataFrame | None, fetched: list[pd.DataFrame]) -> pd.DataFrame:
+    parts = [frame for frame in ([existing] if existing is not None else []) + fetched if frame is not None and not frame.empty]
+    if not parts:
+        return pd.DataFrame()
+    if len(parts) == 1:
+        return parts[0].sort_index()
+    merged = pd.concat(parts).sort_index()
+    return merged[~merged.index.duplicated(keep="last")]
+
+
+def _store_fetched(
+    symbol: str,
+    stored: pd.DataFrame | None,
+    meta: dict[str, Any],
+    fetched: list[tuple[datetime, datetime, pd.DataFrame]],
+    now: datetime,
+) -> pd.DataFrame:
+    # `fetched` pairs each frame with the range it was requested for.
+    frames = [frame for _, _, frame in fetched if frame is not None and not frame.empty]
+    merged = _merge_frames(stored, frames)
+    if merged.empty or not frames:
+        return merged
+    if meta.get("coveredFrom"):
+        covered_from: datetime | None = _naive_day(meta["coveredFrom"])
+    elif stored is not None and not stored.empty:
+        covered_from = _naive_day(stored.index.min())
+    else:
+        covered_from = None
+    # Coverage moves back only through a range that reached it and came back with bars: a failed head
+    # fetch next to a successful tail fetch leaves the head range to be asked for again.
+    for range_start, range_end, frame in sorted(fetched, key=lambda item: item[0], reverse=True):
+        if frame is None or frame.empty:
+            continue
+        if covered_from is None or range_start < covered_from <= range_end:
+            covered_from = range_start
+    next_meta = {
+        "coveredFrom": (covered_from or _naive_day(merged.index.min())).strftime("%Y-%m-%d"),
+        "fetchedAt": now.isoformat(),
+    }
+    with _WRITE_LOCK:
+        _write_store(symbol, merged, next_meta)
+    return merged
+
+
+def _now_kst_naive() -> datetime:
+    # Naive KST wall clock, the clock stored bar dates and fetchedAt are compared on.
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def load_cached_daily_frame(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    if DAILY_STORE_MODE != "parquet":
+        return pd.DataFrame()
+    frame = _read_parquet(_store_path(symbol))
+    if frame is None:
+        return pd.DataFrame()
+    return _clip_by_range(frame, start_date=start_date, end_date=end_date)
+
+
+def fetch_daily_with_store(
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    fetcher: DailyFetcher,
+    now: datetime | None = None,
+) -> pd.DataFrame:
+    if DAILY_STORE_MODE != "parquet":
+        return fetcher(symbol, start_date, end_date)
+
+    now_value = now or _now_kst_naive()
+    stored = _read_parquet(_store_path(symbol))
+    meta = _read_meta(symbol)
+    ranges = _plan_missing_ranges(stored, meta, start_date, end_date, now_value)
+    if not ranges:
+        return _clip_by_range(stored, start_date, end_date)
+
+    fetched: list[tuple[datetime, datetime, pd.DataFrame]] = []
+    for range_start, range_end in ranges:
+        try:
+            fetched.append((range_start, range_end, fetcher(symbol, range_start, range_end)))
+        except Exception:
+            continue
+    merged = _store_fetched(symbol, stored, meta, fetched, now_value)
+    return _clip_by_range(merged, start_date, end_date)
+
+
+def fetch_daily_many_with_store(
+    symbols: list[str],
+    start_date: datetime,
+    end_date: datetime,
+    batch_fetcher: DailyBatchFetcher,
+    now: datetime | None = None,
+) -> dict[str, pd.DataFrame]:
+    if DAILY_STORE_MODE != "parquet":
+        return batch_fetcher(symbols, start_date, end_date)
+
+    now_value = now or _now_kst_naive()
+    stored_by_symbol: dict[str, pd.DataFrame | None] = {}
+    meta_by_symbol: dict[str, dict[str, Any]] = {}
+    pending: dict[tuple[datetime, datetime], list[str]] = {}
+    for symbol in symbols:
+        stored = _read_parquet(_store_path(symbol))
+        meta = _read_meta(symbol)
+        stored_by_symbol[symbol] = stored
+        meta_by_symbol[symbol] = meta
+        for missing_range in _plan_missing_ranges(stored, meta, start_date, end_date, now_value):
+            pending.setdefault(missing_range, []).append(symbol)
+
+    # Symbols that share a gap (usually every symbol's tail) are fetched in one batch call.
+    fetched_by_symbol: dict[str, list[tuple[datetime, datetime, pd.DataFrame]]] = {}
+    for (range_start, range_end), group in pending.items():
+        try:
+            fetched = batch_fetcher(group, range_start, range_end)
+        except Exception:
+            continue
+        for symbol, frame in fetched.items():
+            fetched_by_symbol.setdefault(symbol, []).append((range_start, range_end, frame))
+
+    frames: dict[str, pd.DataFrame] = {}
+    for symbol in symbols:
+        stored = stored_by_symbol.get(symbol)
+        fetched = fetched_by_symbol.get(symbol, [])
+        if fetched:
+            merged = _store_fetched(symbol, stored, meta_by_symbol.get(symbol, {}), fetched, now_value)
+        elif stored is not None and not stored.empty:
+            merged = stored
+        else:
+            continue
+        frames[symbol] = _clip_by_range(merged, start_date, end_date)
+    return frames
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from services.market_data_service import provider_data_path
+
+EXCHANGE_SUFFIXES = (".KS", ".KQ")
+EXCHANGE_SUFFIX_MAP_PATH = provider_data_path(
+    "exchange_suffix_map.json",
+    Path(
+        os.getenv(
+            "EXCHANGE_SUFFIX_MAP_PATH",
+            str(Path(__file__).resolve().parents[1] / "data" / "exchange_suffix_map.json"),
+        )
+    ),
+)
+
+_LOCK = threading.Lock()
+_SUFFIX_BY_CODE: dict[str, str] | None = None
+# While a batch is open, learned codes only update the in-memory map; the file is written once
+# when the last open batch closes.
+_BATCH_DEPTH = 0
+_DIRTY = False
+
+
+def _split_symbol(symbol: str) -> tuple[str, str]:
+    normalized = (symbol or "").strip().upper()
+    for suffix in EXCHANGE_SUFFIXES:
+        if normalized.endswith(suffix):
+            return normalized[: -len(suffix)], suffix
+    return normalized, ""
+
+
+def _load_map() -> dict[str, str]:
+    global _SUFFIX_BY_CODE
+    if _SUFFIX_BY_CODE is not None:
+        return _SUFFIX_BY_CODE
+    loaded: dict[str, str] = {}
+    try:
+        payload = json.loads(EXCHANGE_SUFFIX_MAP_PATH.read_text(encoding="utf-8"))
+        if isinstance(payload, dict):
+            loaded = {str(code): str(suffix) for code, suffix in payload.items() if suffix in EXCHANGE_SUFFIXES}
+    except Exception:
+        loaded = {}
+    _SUFFIX_BY_CODE = loaded
+    return loaded
+
+
+def _save_map(mapping: dict[str, str]) -> None:
+    try:
+        EXCHANGE_SUFFIX_MAP_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = EXCHANGE_SUFFIX_MAP_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(mapping, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(EXCHANGE_SUFFIX_MAP_PATH)
+    except Exception:
+        return
+
+
+def resolved_suffix(code: str) -> str | None:
+    with _LOCK:
+        return _load_map().get(code.strip().upper())
+
+
+def candidate_symbols(code: str) -> list[str]:
+    # The learned exchange goes first, so a known KOSDAQ code no longer costs an empty .KS lookup.
+    normalized = code.strip().upper()
+    suffix = resolved_suffix(normalized)
+    ordered = [suffix] if suffix else []
+    ordered.extend(candidate for candidate in EXCHANGE_SUFFIXES if candidate not in ordered)
+    return [f"{normalized}{candidate}" for candidate in ordered]
+
+
+def record_symbol_result(symbol: str, has_data: bool) -> None:
+    # Only price lookups may call this: news and other endpoints answer for unknown tickers too.
+    global _DIRTY
+    code, suffix = _split_symbol(symbol)
+    if not code or not suffix:
+        return
+    with _LOCK:
+        mapping = _load_map()
+        current = mapping.get(code)
+        if has_data and current != suffix:
+            mapping[code] = suffix
+        elif not has_data and current == suffix:
+            # Only a resolved symbol that stopped returning data is invalidated.
+            mapping.pop(code, None)
+        else:
+            return
+        if _BATCH_DEPTH:
+            _DIRTY = True
+            return
+        _save_map(mapping)
+
+
+@contextmanager
+def batched_suffix_updates() -> Iterator[None]:
+    # Wraps a pass over many symbols so a cold full-market run writes the map once, not per code.
+    global _BATCH_DEPTH, _DIRTY
+    with _LOCK:
+        _BATCH_DEPTH += 1
+    try:
+        yield
+    finally:
+        with _LOCK:
+            _BATCH_DEPTH -= 1
+            if not _BATCH_DEPTH and _DIRTY:
+                _DIRTY = False
+                _save_map(_load_map())
+
+
+def reset_exchange_suffix_map() -> None:
+    global _SUFFIX_BY_CODE
+    with _LOCK:
+        _SUFFIX_BY_CODE = None
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+FETCH_MAX_WORKERS = max(1, int(os.getenv("FETCH_MAX_WORKERS", "8")))
+FETCH_VENDOR_CONCURRENCY = max(1, int(os.getenv("FETCH_VENDOR_CONCURRENCY", "4")))
+FETCH_RATE_LIMIT_PER_SEC = max(0.0, float(os.getenv("FETCH_RATE_LIMIT_PER_SEC", "10")))
+
+T = TypeVar("T")
+R = TypeVar("R")
+K = TypeVar("K", bound=Hashable)
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+_VENDOR_SEMAPHORES: dict[str, threading.BoundedSemaphore] = {}
+_VENDOR_LOCK = threading.Lock()
+_RATE_LOCK = threading.Lock()
+_next_slot_at = 0.0
+_worker_state = threading.local()
+_INFLIGHT: dict[Hashable, "_Flight"] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="fetch")
+        return _EXECUTOR
+
+
+def _vendor_semaphore(vendor: str) -> threading.BoundedSemaphore:
+    with _VENDOR_LOCK:
+        semaphore = _VENDOR_SEMAPHORES.get(vendor)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(FETCH_VENDOR_CONCURRENCY)
+            _VENDOR_SEMAPHORES[vendor] = semaphore
+        return semaphore
+
+
+def _wait_for_rate_slot() -> None:
+    global _next_slot_at
+    if FETCH_RATE_LIMIT_PER_SEC <= 0:
+        return
+    interval = 1.0 / FETCH_RATE_LIMIT_PER_SEC
+    with _RATE_LOCK:
+        now = time.monotonic()
+        slot = max(now, _next_slot_at)
+        _next_slot_at = slot + interval
+    delay = slot - now
+    if delay > 0:
+        time.sleep(delay)
+
+
+def run_rate_limited(fn: Callable[[], R], vendor: str = "yfinance") -> R:
+    # Wraps a single vendor round trip; cache and store hits never reach this.
+    with _vendor_semaphore(vendor):
+        _wait_for_rate_slot()
+        return fn()
+
+
+def map_bounded(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    default: R | None = None,
+    deadline: float | None = None,
+) -> list[R | None]:
+    # Results keep input order so rankings stay reproducible; a failing item yields `default`.
+    # `deadline` is a time.monotonic() value; items still unfinished by then also yield `default`.
+    # Tasks are not rate limited here: the provider applies run_rate_limited per vendor call.
+    values = list(items)
+    if not values:
+        return []
+
+    def _task(value: T) -> R | None:
+        _worker_state.active = True
+        try:
+            return fn(value)
+        except Exception:
+            return default
+        finally:
+            _worker_state.active = False
+
+    # Nested fan-out from a pool worker runs inline so it cannot starve the pool.
+    single_inline = len(values) == 1 and deadline is None
+    if single_inline or FETCH_MAX_WORKERS <= 1 or getattr(_worker_state, "active", False):
+        results: list[R | None] = []
+        for value in values:
+            if deadline_expired(deadline):
+                results.append(default)
+                continue
+            try:
+                results.append(fn(value))
+            except Exception:
+                results.append(default)
+        return results
+
+    executor = _get_executor()
+    futures = [executor.submit(_task, value) for value in values]
+    if deadline is None:
+        return [future.result() for future in futures]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeoutError:
+            future.cancel()
+            results.append(default)
+    return results
+
+
+def deadline_expired(deadline: float | None) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def call_with_deadline(fn: Callable[[], R], deadline: float | None, default: R) -> R:
+    # The call keeps running on the pool after a timeout, so its result can still warm caches.
+    if deadline is None or getattr(_worker_state, "active", False):
+        return fn()
+    if deadline_expired(deadline):
+        return default
+
+    def _task() -> R:
+        # Marked like a map_bounded task, so fan-out inside `fn` runs inline instead of queueing
+        # behind it on the same pool.
+        _worker_state.active = True
+        try:
+            return fn()
+        finally:
+            _worker_state.active = False
+
+    future = _get_executor().submit(_task)
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        return default
+
+
+def single_flight(key: Hashable, fn: Callable[[], R]) -> R:
+    # Concurrent callers with the same key wait for the first caller's fetch and share its result.
+    with _INFLIGHT_LOCK:
+        flight = _INFLIGHT.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _Flight()
+            _INFLIGHT[key] = flight
+
+    if not is_leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = fn()
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        flight.done.set()
+    return flight.result
+
+
+def single_flight_many(keys: Iterable[K], fn: Callable[[list[K]], dict[K, R]]) -> dict[K, R]:
+    # Per-key single_flight for batch fetches: keys already in flight (single or batch) are joined,
+    # one `fn` call fetches the rest. Keys missing from the result are left out of the returned dict.
+    led: list[K] = []
+    own: dict[K, _Flight] = {}
+    joined: dict[K, _Flight] = {}
+    with _INFLIGHT_LOCK:
+        for key in dict.fromkeys(keys):
+            flight = _INFLIGHT.get(key)
+            if flight is None:
+                flight = _Flight()
+                _INFLIGHT[key] = flight
+                own[key] = flight
+                led.append(key)
+            else:
+                joined[key] = flight
+
+    results: dict[K, R] = {}
+    if led:
+        try:
+            fetched = fn(led)
+            for key in led:
+                own[key].result = fetched.get(key)
+            results.update((key, fetched[key]) for key in led if fetched.get(key) is not None)
+        except BaseException as exc:
+            for flight in own.values():
+                flight.error = exc
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                for key in led:
+                    _INFLIGHT.pop(key, None)
+            for flight in own.values():
+                flight.done.set()
+
+    # Own keys are settled before waiting, so two overlapping batches cannot wait on each other.
+    for key, flight in joined.items():
+        flight.done.wait()
+        if flight.error is None and flight.result is not None:
+            results[key] = flight.result
+    return results
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+FRAME_CACHE_MAX_MB = max(0, int(os.getenv("FRAME_CACHE_MAX_MB", "256")))
+FRAME_CACHE_TTL_SEC = max(1, int(os.getenv("FRAME_CACHE_TTL_SEC", "21600")))
+FRAME_CACHE_LIVE_TTL_SEC = max(1, int(os.getenv("FRAME_CACHE_LIVE_TTL_SEC", "60")))
+
+_KST = ZoneInfo("Asia/Seoul")
+_LOCK = threading.Lock()
+# (kind, symbol, start, end) -> (frame, expires_at, nbytes), least recently used first.
+_ENTRIES: "OrderedDict[tuple[str, str, datetime, datetime], tuple[pd.DataFrame, float, int]]" = OrderedDict()
+_KEYS_BY_SYMBOL: dict[tuple[str, str], set[tuple[str, str, datetime, datetime]]] = {}
+_TOTAL_BYTES = 0
+_clock = time.monotonic
+
+
+def _today_kst() -> date:
+    return datetime.now(tz=_KST).date()
+
+
+def _ttl_for_range(end_date: datetime) -> int:
+    # The end bound is exclusive, so a range reaching past today still has an unfinished bar.
+    return FRAME_CACHE_LIVE_TTL_SEC if end_date.date() > _today_kst() else FRAME_CACHE_TTL_SEC
+
+
+def _clip(frame: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    if frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+        return frame.copy()
+    idx = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+    return frame[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+
+def _drop_entry(key: tuple[str, str, datetime, datetime]) -> None:
+    global _TOTAL_BYTES
+    entry = _ENTRIES.pop(key, None)
+    if entry is None:
+        return
+    _TOTAL_BYTES -= entry[2]
+    siblings = _KEYS_BY_SYMBOL.get((key[0], key[1]))
+    if siblings is not None:
+        siblings.discard(key)
+        if not siblings:
+            _KEYS_BY_SYMBOL.pop((key[0], key[1]), None)
+
+
+def get_cached_frame(
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    kind: str = "1d",
+) -> pd.DataFrame | None:
+    now = _clock()
+    with _LOCK:
+        hit_key = None
+        for key in list(_KEYS_BY_SYMBOL.get((kind, symbol), ())):
+            expires_at = _ENTRIES[key][1]
+            if expires_at <= now:
+                _drop_entry(key)
+                continue
+            if _ENTRIES[key][0].empty and (key[2], key[3]) != (start_date, end_date):
+                continue
+            if key[2] <= start_date and key[3] >= end_date:
+                hit_key = key
+                break
+        if hit_key is None:
+            return None
+        _ENTRIES.move_to_end(hit_key)
+        frame = _ENTRIES[hit_key][0]
+    return _clip(frame, start_date, end_date)
+
+
+def put_cached_frame(
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    frame: pd.DataFrame,
+    kind: str = "1d",
+) -> None:
+    global _TOTAL_BYTES
+    max_bytes = FRAME_CACHE_MAX_MB * 1024 * 1024
+    if max_bytes <= 0:
+        return
+    # Empty results are usually transient vendor failures, so keep them only briefly.
+    ttl = FRAME_CACHE_LIVE_TTL_SEC if frame.empty else _ttl_for_range(end_date)
+    nbytes = int(frame.memory_usage(index=True, deep=False).sum())
+    if nbytes > max_bytes:
+        return
+    key = (kind, symbol, start_date, end_date)
+    with _LOCK:
+        for existing in list(_KEYS_BY_SYMBOL.get((kind, symbol), ())):
+            # A wider non-empty frame makes narrower entries for the symbol redundant.
+            subsumed = not frame.empty and start_date <= existing[2] and existing[3] <= end_date
+            if existing == key or subsumed:
+                _drop_entry(existing)
+        _ENTRIES[key] = (frame, _clock() + ttl, nbytes)
+        _KEYS_BY_SYMBOL.setdefault((kind, symbol), set()).add(key)
+        _TOTAL_BYTES += nbytes
+        while _TOTAL_BYTES > max_bytes and _ENTRIES:
+            _drop_entry(next(iter(_ENTRIES)))
+
+
+def clear_frame_cache() -> None:
+    global _TOTAL_BYTES
+    with _LOCK:
+        _ENTRIES.clear()
+        _KEYS_BY_SYMBOL.clear()
+        _TOTAL_BYTES = 0
+
+
+def get_frame_cache_stats() -> dict[str, int]:
+    with _LOCK:
+        return {"entries": len(_ENTRIES), "bytes": _TOTAL_BYTES}
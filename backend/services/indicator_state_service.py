@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from services.market_data_service import provider_data_path
+
+_STATE_MODE = (os.getenv("INDICATOR_STATE_MODE", "off").strip().lower() or "off")
+INDICATOR_STATE_MODE = _STATE_MODE if _STATE_MODE in {"off", "memory", "json"} else "off"
+INDICATOR_STATE_DIR = provider_data_path(
+    "indicator_state",
+    Path(
+        os.getenv(
+            "INDICATOR_STATE_DIR",
+            str(Path(__file__).resolve().parents[1] / "data" / "indicator_state"),
+        )
+    ),
+)
+
+_STATE_VERSION = 2
+# Enough closes to rebuild the 60-bar drawdown over a 180-calendar-day scoring window.
+_CLOSE_BUFFER = 200
+_DRAWDOWN_WINDOW = 60
+_RETURN_WINDOW = 60
+_RSI_ALPHA = 1 / 14
+_ATR_ALPHA = 1 / 14
+_EMA12_ALPHA = 2 / 13
+_EMA26_ALPHA = 2 / 27
+_BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+_LOCK = threading.Lock()
+_STATES: dict[str, dict[str, Any]] = {}
+_SEEDING: set[str] = set()
+
+
+def _state_path(symbol: str) -> Path:
+    return INDICATOR_STATE_DIR / f"{(symbol or '').strip().upper().replace('/', '_')}.json"
+
+
+def _ewm_step(previous: float | None, value: float, alpha: float) -> float:
+    # Same arithmetic as pandas' adjust=False EWM kernel, so a cold start matches it bit for bit.
+    if previous is None:
+        return value
+    if previous == value:
+        return previous
+    return (((1 - alpha) * previous) + (alpha * value)) / ((1 - alpha) + alpha)
+
+
+def _empty_state() -> dict[str, Any]:
+    return {
+        "version": _STATE_VERSION,
+        "count": 0,
+        "ema12": None,
+        "ema26": None,
+        "avgGain": None,
+        "avgLoss": None,
+        "deltaCount": 0,
+        "atr": None,
+        "trCount": 0,
+        "returnSum": 0.0,
+        "returnSumSq": 0.0,
+        "dates": [],
+        "closes": [],
+        "drawdowns": [],
+        "highs": [],
+        "lows": [],
+        "volumes": [],
+        "returns": [],
+    }
+
+
+def _copy_state(state: dict[str, Any]) -> dict[str, Any]:
+    # Scalars plus flat lists: copying the lists is enough and far cheaper than deepcopy.
+    return {key: list(value) if isinstance(value, list) else value for key, value in state.items()}
+
+
+def _push(buffer: list[Any], value: Any, size: int) -> None:
+    buffer.append(value)
+    if len(buffer) > size:
+        del buffer[: len(buffer) - size]
+
+
+def apply_bar(state: dict[str, Any], bar_date: str, open_: float, high: float, low: float, close: float, volume: float) -> None:
+    prev_close = state["closes"][-1] if state["closes"] else None
+    state["ema12"] = _ewm_step(state["ema12"], close, _EMA12_ALPHA)
+    state["ema26"] = _ewm_step(state["ema26"], close, _EMA26_ALPHA)
+
+    if prev_close is None:
+        true_range = abs(high - low)
+    else:
+        delta = close - prev_close
+        state["avgGain"] = _ewm_step(state["avgGain"], max(delta, 0.0), _RSI_ALPHA)
+        state["avgLoss"] = _ewm_step(state["avgLoss"], -min(delta, 0.0), _RSI_ALPHA)
+        state["deltaCount"] += 1
+        # Running sums over the 60-return window, so volatility needs no pass over the buffer.
+        returns = state["returns"]
+        if len(returns) >= _RETURN_WINDOW:
+            dropped = returns.pop(0)
+            state["returnSum"] -= dropped
+            state["returnSumSq"] -= dropped * dropped
+        value = (close / prev_close) - 1.0
+        returns.append(value)
+        state["returnSum"] += value
+        state["returnSumSq"] += value * value
+        true_range = max(abs(high - low), abs(high - prev_close), abs(low - prev_close))
+    state["atr"] = _ewm_step(state["atr"], true_range, _ATR_ALPHA)
+    state["trCount"] += 1
+
+    _push(state["dates"], bar_date, _CLOSE_BUFFER)
+    _push(state["closes"], close, _CLOSE_BUFFER)
+    # Drawdown of this bar from the trailing 60-bar max, kept alongside the close it belongs to.
+    _push(state["drawdowns"], (close / max(state["closes"][-_DRAWDOWN_WINDOW:])) - 1.0, _CLOSE_BUFFER)
+    _push(state["highs"], high, 60)
+    _push(state["lows"], low, 10)
+    _push(state["volumes"], volume, 20)
+    state["count"] += 1
+
+
+def _window_drawdown(state: dict[str, Any], start: int) -> float:
+    # The scoring frame starts at the window, so its rolling max only sees closes from there: the
+    # first 59 bars use the running max since the window start, later bars the stored drawdowns.
+    closes = state["closes"][start:]
+    if not closes:
+        return math.nan
+    head = np.asarray(closes[: _DRAWDOWN_WINDOW - 1], dtype=float)
+    mdd = float(((head / np.maximum.accumulate(head)) - 1.0).min())
+    tail = state["drawdowns"][start + _DRAWDOWN_WINDOW - 1 :]
+    return min(mdd, min(tail)) if tail else mdd
+
+
+def indicators_from_state(state: dict[str, Any], window_start: datetime | None = None) -> dict[str, float]:
+    start = 0
+    if window_start is not None:
+        start = bisect_left(state["dates"], window_start.strftime("%Y-%m-%d"))
+
+    rsi = 50.0
+    if state["deltaCount"] >= 14 and state["avgLoss"] not in (None, 0.0):
+        rsi = 100 - (100 / (1 + (state["avgGain"] / state["avgLoss"])))
+
+    volatility = 0.0
+    count = len(state["returns"])
+    if count:
+        volatility = math.nan
+        if count >= _RETURN_WINDOW:
+            variance = (state["returnSumSq"] - (state["returnSum"] ** 2) / count) / (count - 1)
+            volatility = math.sqrt(max(variance, 0.0)) * math.sqrt(252)
+
+    closes = state["closes"]
+    volumes = state["volumes"]
+    return {
+        "sma5": math.fsum(closes[-5:]) / len(closes[-5:]),
+        "sma20": math.fsum(closes[-20:]) / len(closes[-20:]),
+        "rsi": float(rsi),
+        "macd": float(state["ema12"] - state["ema26"]),
+        "mdd": _window_drawdown(state, start),
+        "volatility": volatility,
+        "avgVol20": math.fsum(volumes) / len(volumes) if len(volumes) >= 20 else math.nan,
+        "atr14": float(state["atr"]) if state["trCount"] >= 14 else math.nan,
+        "high60": float(max(state["highs"])),
+        "low10": float(min(state["lows"])),
+    }
+
+
+def _frame_arrays(frame: pd.DataFrame) -> tuple[np.ndarray, np.ndarray] | None:
+    # Wall-clock bar times and an (n, 5) OHLCV matrix, read once per call as plain arrays: per-row
+    # pandas access is what made a warm call as slow as recomputing the whole panel.
+    index = frame.index
+    if not isinstance(index, pd.DatetimeIndex) or not index.is_monotonic_increasing:
+        return None
+    wall = (index if index.tz is None else index.tz_localize(None)).to_numpy()
+    try:
+        values = frame.to_numpy(dtype=float)
+        positions = [frame.columns.get_loc(name) for name in _BAR_COLUMNS]
+        if not all(isinstance(position, int) for position in positions):
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+    return wall, values[:, positions]
+
+
+def _bar_rows(wall: np.ndarray, values: np.ndarray, start: int = 0) -> list[tuple[str, float, float, float, float, float]] | None:
+    # Converts only rows from `start` on; None when one of them has a missing price.
+    tail = values[start:]
+    if np.isnan(tail[:, 1:4]).any():
+        return None
+    dates = np.datetime_as_string(wall[start:], unit="D").tolist()
+    return list(zip(dates, *tail.T.tolist()))
+
+
+def _load_state(symbol: str) -> dict[str, Any] | None:
+    state = _STATES.get(symbol)
+    if state is not None or INDICATOR_STATE_MODE != "json":
+        return state
+    path = _state_path(symbol)
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != _STATE_VERSION:
+        return None
+    _STATES[symbol] = payload
+    return payload
+
+
+def _save_state(symbol: str, state: dict[str, Any]) -> None:
+    _STATES[symbol] = state
+    if INDICATOR_STATE_MODE != "json":
+        return
+    try:
+        INDICATOR_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        _state_path(symbol).write_text(json.dumps(state), encoding="utf-8")
+    except Exception:
+        return
+
+
+def _is_historical(state: dict[str, Any] | None, wall: np.ndarray) -> bool:
+    # The frame ends before the state's last committed bar, e.g. a backtest window.
+    return bool(state and state["dates"]) and str(wall[-1].astype("datetime64[D]")) < state["dates"][-1]
+
+
+def _resume_position(state: dict[str, Any] | None, wall: np.ndarray, closes: np.ndarray) -> int | None:
+    # Index of the first uncommitted row, or None when the state no longer matches the data.
+    if not state or not state["dates"]:
+        return None
+    last_date = np.datetime64(state["dates"][-1], "D")
+    pos = int(np.searchsorted(wall, last_date, side="left"))
+    if pos >= len(wall) or wall[pos].astype("datetime64[D]") != last_date:
+        return None
+    return pos + 1 if float(closes[pos]) == state["closes"][-1] else None
+
+
+def incremental_indicators(
+    symbol: str,
+    frame: pd.DataFrame,
+    window_start: datetime | None = None,
+    rebuild: bool = True,
+) -> dict[str, float] | None:
+    # Bars up to t-1 are committed to the state; the latest bar may still be live, so it is
+    # only applied to a throwaway copy. Only rows after the committed ones are converted. With
+    # rebuild=False a symbol whose state cannot resume from the frame returns None untouched.
+    if frame is None or len(frame) < 2:
+        return None
+    arrays = _frame_arrays(frame)
+    if arrays is None:
+        return None
+    wall, values = arrays
+
+    with _LOCK:
+        state = _load_state(symbol)
+        historical = _is_historical(state, wall)
+        resume_at = None if historical else _resume_position(state, wall, values[:, 3])
+        if resume_at is None and not rebuild:
+            return None
+        if historical:
+            # Historical windows use a throwaway state instead of rewinding the stored one.
+            rows = _bar_rows(wall, values)
+            if rows is None:
+                return None
+            scratch = _empty_state()
+            for row in rows:
+                apply_bar(scratch, *row)
+            return indicators_from_state(scratch, window_start=window_start)
+        if resume_at is None:
+            # Cold start, or the stored last bar was revised by the vendor: rebuild once.
+            state = _empty_state()
+            resume_at = 0
+        if resume_at == len(wall):
+            return indicators_from_state(state, window_start=window_start)
+        rows = _bar_rows(wall, values, resume_at)
+        if rows is None:
+            return None
+        committed = rows[:-1]
+        if committed:
+            state = _copy_state(state)
+            for row in committed:
+                apply_bar(state, *row)
+            _save_state(symbol, state)
+
+    live = _copy_state(state)
+    apply_bar(live, *rows[-1])
+    return indicators_from_state(live, window_start=window_start)
+
+
+def seed_indicator_states(frames: dict[str, pd.DataFrame]) -> None:
+    # Builds states for symbols that could not resume, off the request path; a symbol already being
+    # seeded by an earlier request is skipped.
+    with _LOCK:
+        pending = {symbol: frame for symbol, frame in frames.items() if symbol not in _SEEDING}
+        _SEEDING.update(pending)
+    if not pending:
+        return
+
+    def _run() -> None:
+        try:
+            for symbol, frame in pending.items():
+                try:
+                    arrays = _frame_arrays(frame) if len(frame) >= 2 else None
+                    with _LOCK:
+                        if arrays is None or _is_historical(_load_state(symbol), arrays[0]):
+                            continue
+                    incremental_indicators(symbol, frame)
+                except Exception:
+                    continue
+        finally:
+            with _LOCK:
+                _SEEDING.difference_update(pending)
+
+    threading.Thread(target=_run, name="indicator-state-seed", daemon=True).start()
+
+
+def clear_indicator_states() -> None:
+    with _LOCK:
+        _STATES.clear()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from services.market_data_service import provider_data_path
+
+_STATE_MODE = (os.getenv("INTRADAY_SESSION_STATE_MODE", "off").strip().lower() or "off")
+INTRADAY_SESSION_STATE_MODE = _STATE_MODE if _STATE_MODE in {"off", "memory", "json"} else "off"
+INTRADAY_SESSION_STATE_DIR = provider_data_path(
+    "intraday_session_state",
+    Path(
+        os.getenv(
+            "INTRADAY_SESSION_STATE_DIR",
+            str(Path(__file__).resolve().parents[1] / "data" / "intraday_session_state"),
+        )
+    ),
+)
+
+_STATE_VERSION = 1
+# Opening range: the first three 5-minute bars of the session.
+_ORB_BARS = 3
+
+_LOCK = threading.Lock()
+_STATES: dict[str, dict[str, Any]] = {}
+
+SessionRow = tuple[str, int, float, float, float, float, float]
+
+
+def _state_path(symbol: str) -> Path:
+    return INTRADAY_SESSION_STATE_DIR / f"{(symbol or '').strip().upper().replace('/', '_')}.json"
+
+
+def new_session_state(session_date: str, prev_close: float, rvol_baseline: list[float]) -> dict[str, Any]:
+    return {
+        "version": _STATE_VERSION,
+        "sessionDate": session_date,
+        "prevClose": float(prev_close),
+        # Mean cumulative volume of earlier sessions per time-of-day slot, fixed for the session.
+        "rvolBaseline": [float(value) for value in rvol_baseline],
+        "barCount": 0,
+        "lastBar": None,
+        "lastRow": None,
+        "lastSlot": None,
+        "sessionOpen": None,
+        "orbHigh": None,
+        "orbLow": None,
+        "sessionHigh": None,
+        "sessionLow": None,
+        "lastClose": None,
+        "cumVolume": 0.0,
+        "vwapNumerator": 0.0,
+    }
+
+
+def apply_intraday_bar(
+    state: dict[str, Any],
+    bar_ts: str,
+    slot: int,
+    open_: float,
+    high: float,
+    low: float,
+    close: float,
+    volume: float,
+) -> None:
+    volume = max(volume, 0.0) if volume == volume else 0.0
+    if state["barCount"] == 0:
+        state["sessionOpen"] = open_
+        state["sessionHigh"] = high
+        state["sessionLow"] = low
+    else:
+        state["sessionHigh"] = max(state["sessionHigh"], high)
+        state["sessionLow"] = min(state["sessionLow"], low)
+    if state["barCount"] < _ORB_BARS:
+        state["orbHigh"] = high if state["orbHigh"] is None else max(state["orbHigh"], high)
+        state["orbLow"] = low if state["orbLow"] is None else min(state["orbLow"], low)
+    state["cumVolume"] += volume
+    state["vwapNumerator"] += ((high + low + close) / 3.0) * volume
+    state["lastClose"] = close
+    state["lastSlot"] = slot
+    state["lastBar"] = bar_ts
+    state["lastRow"] = [open_, high, low, close, volume]
+    state["barCount"] += 1
+
+
+def session_aggregates(state: dict[str, Any]) -> dict[str, float] | None:
+    if state["barCount"] < _ORB_BARS or state["cumVolume"] <= 0:
+        return None
+    baseline = state["rvolBaseline"]
+    slot = state["lastSlot"]
+    return {
+        "orbHigh": float(state["orbHigh"]),
+        "orbLow": float(state["orbLow"]),
+        "sessionOpen": float(state["sessionOpen"]),
+        "sessionHigh": float(state["sessionHigh"]),
+        "sessionLow": float(state["sessionLow"]),
+        "lastClose": float(state["lastClose"]),
+        "vwap": float(state["vwapNumerator"] / state["cumVolume"]),
+        "cumVolume": float(state["cumVolume"]),
+        "rvolBaseline": float(baseline[slot]) if 0 <= slot < len(baseline) else 0.0,
+        "prevClose": float(state["prevClose"]),
+    }
+
+
+def session_rows(session_bars: pd.DataFrame, slots: Any) -> list[SessionRow]:
+    stamps = [ts.isoformat() for ts in session_bars.index]
+    columns = [session_bars[name].to_numpy(dtype=float) for name in ("Open", "High", "Low", "Close", "Volume")]
+    return [
+        (stamps[i], int(slots[i])) + tuple(float(column[i]) for column in columns)
+        for i in range(len(stamps))
+    ]
+
+
+def _load_state(symbol: str) -> dict[str, Any] | None:
+    state = _STATES.get(symbol)
+    if state is not None or INTRADAY_SESSION_STATE_MODE != "json":
+        return state
+    path = _state_path(symbol)
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != _STATE_VERSION:
+        return None
+    _STATES[symbol] = payload
+    return payload
+
+
+def _save_state(symbol: str, state: dict[str, Any]) -> None:
+    _STATES[symbol] = state
+    if INTRADAY_SESSION_STATE_MODE != "json":
+        return
+    try:
+        INTRADAY_SESSION_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        _state_path(symbol).write_text(json.dumps(state), encoding="utf-8")
+    except Exception:
+        return
+
+
+def _resume_position(state: dict[str, Any] | None, rows: list[SessionRow]) -> int | None:
+    # Index of the first uncommitted row, or None when the state no longer matches the bars
+    # (a revised bar, or a hole filled in after it was skipped).
+    if state is None:
+        return None
+    if state["lastBar"] is None:
+        return 0
+    for pos in range(len(rows) - 1, -1, -1):
+        if rows[pos][0] == state["lastBar"]:
+            if pos + 1 != state["barCount"] or list(rows[pos][2:]) != state["lastRow"]:
+                return None
+            return pos + 1
+        if rows[pos][0] < state["lastBar"]:
+            return None
+    return None
+
+
+def incremental_session_aggregates(
+    symbol: str,
+    session_date: str,
+    rows: list[SessionRow],
+    build_context: Callable[[], tuple[float, list[float]] | None],
+) -> dict[str, float] | None:
+    # Closed bars are committed to the state; the newest bar may still be forming, so it is only
+    # applied to a throwaway copy. build_context supplies (prev close, RVOL baseline) and is only
+    # called when the session has to be rebuilt.
+    if not rows:
+        return None
+    with _LOCK:
+        stored = _load_state(symbol)
+    if stored is not None and stored["sessionDate"] > session_date:
+        # Historical sessions use a throwaway state instead of rewinding the stored one.
+        persist = False
+        state = None
+    else:
+        persist = True
+        state = stored if stored is not None and stored["sessionDate"] == session_date else None
+
+    resume_at = _resume_position(state, rows)
+    if resume_at is None:
+        context = build_context()
+        if context is None:
+            return None
+        state = new_session_state(session_date, *context)
+        resume_at = 0
+        committed_any = True
+    else:
+        state = dict(state)
+        committed_any = resume_at < len(rows) - 1
+    for row in rows[resume_at:-1]:
+        apply_intraday_bar(state, *row)
+    if persist and committed_any:
+        with _LOCK:
+            _save_state(symbol, state)
+
+    live = dict(state)
+    if resume_at < len(rows):
+        apply_intraday_bar(live, *rows[-1])
+    return session_aggregates(live)
+
+
+def clear_intraday_session_states() -> None:
+    with _LOCK:
+        _STATES.clear()
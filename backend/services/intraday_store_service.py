@@ -1,31 +1,106 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
 from pathlib import Path
 from typing import Callable
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
+from services.market_data_service import provider_data_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pa_ipc = None
+
 _STORE_MODE = (os.getenv("INTRADAY_STORE_MODE", "parquet").strip().lower() or "parquet")
-INTRADAY_STORE_MODE = _STORE_MODE if _STORE_MODE in {"off", "parquet"} else "parquet"
-INTRADAY_STORE_DIR = Path(
-    os.getenv(
-        "INTRADAY_STORE_DIR",
-        str(Path(__file__).resolve().parents[1] / "data" / "intraday"),
-    )
+INTRADAY_STORE_MODE = _STORE_MODE if _STORE_MODE in {"off", "parquet", "arrow"} else "parquet"
+if INTRADAY_STORE_MODE == "arrow" and pa is None:
+    INTRADAY_STORE_MODE = "parquet"
+INTRADAY_STORE_DIR = provider_data_path(
+    "intraday",
+    Path(
+        os.getenv(
+            "INTRADAY_STORE_DIR",
+            str(Path(__file__).resolve().parents[1] / "data" / "intraday"),
+        )
+    ),
 )
+# A session partition with more part files than this is compacted on the next append.
+INTRADAY_STORE_COMPACT_PARTS = max(2, int(os.getenv("INTRADAY_STORE_COMPACT_PARTS", "16")))
+# Vendors publish the last bars a little after the close; a session is sealed only after this.
+INTRADAY_SESSION_SETTLE_MINUTES = max(0, int(os.getenv("INTRADAY_SESSION_SETTLE_MINUTES", "10")))
+# A settled session the vendor returned no bars for (a halt, or before a listing) is asked again
+# only after this long.
+INTRADAY_NO_DATA_RETRY_MINUTES = max(1, int(os.getenv("INTRADAY_NO_DATA_RETRY_MINUTES", "360")))
+
+KST = ZoneInfo("Asia/Seoul")
+# Regular KRX session bar grid: the first bar opens at 09:00, the last one at 15:20.
+SESSION_FIRST_BAR = dt_time(hour=9, minute=0)
+SESSION_LAST_BAR = dt_time(hour=15, minute=20)
+SESSION_CLOSE = dt_time(hour=15, minute=30)
+_FIRST_BAR_SECONDS = SESSION_FIRST_BAR.hour * 3600 + SESSION_FIRST_BAR.minute * 60
+_LAST_BAR_SECONDS = SESSION_LAST_BAR.hour * 3600 + SESSION_LAST_BAR.minute * 60
+
+_PART_PREFIX = "part-"
+_PART_SUFFIXES = (".parquet", ".arrow")
+_COMPLETE_MARKER = "_COMPLETE"
+_NO_DATA_MARKER = "_NO_DATA"
+_ANSWERED_MARKER = "_ANSWERED"
+_INTERVAL_PATTERN = re.compile(r"^(\d+)(m|h)$")
+_WRITE_LOCK = threading.Lock()
 
 
 def _normalized_symbol(symbol: str) -> str:
     return (symbol or "").strip().upper().replace("/", "_")
 
 
+def _normalized_interval(interval: str) -> str:
+    return (interval or "5m").lower()
+
+
 def _store_path(symbol: str, interval: str) -> Path:
-    file_name = f"{_normalized_symbol(symbol)}_{(interval or '5m').lower()}.parquet"
+    # Single-file layout used before partitioning; migrated into partitions on first access.
+    file_name = f"{_normalized_symbol(symbol)}_{_normalized_interval(interval)}.parquet"
     return INTRADAY_STORE_DIR / file_name
 
 
+def _series_dir(symbol: str, interval: str) -> Path:
+    return INTRADAY_STORE_DIR / _normalized_symbol(symbol) / _normalized_interval(interval)
+
+
+def _partition_dir(symbol: str, interval: str, session_day: str) -> Path:
+    return _series_dir(symbol, interval) / session_day
+
+
+def _store_enabled() -> bool:
+    return INTRADAY_STORE_MODE in {"parquet", "arrow"}
+
+
+def _part_files(partition: Path) -> list[Path]:
+    if not partition.is_dir():
+        return []
+    # Part names start with a zero-padded timestamp, so name order is write order. Both formats
+    # are read, so switching INTRADAY_STORE_MODE keeps existing parts; compaction converts them.
+    return sorted(
+        path for path in partition.glob(f"{_PART_PREFIX}*") if path.suffix in _PART_SUFFIXES
+    )
+
+
+def _new_part_path(partition: Path) -> Path:
+    suffix = ".arrow" if INTRADAY_STORE_MODE == "arrow" else ".parquet"
+    return partition / f"{_PART_PREFIX}{time.time_ns():020d}-{os.getpid()}{suffix}"
+
+
 def _read_parquet(path: Path) -> pd.DataFrame | None:
     if not path.exists():
         return None
@@ -35,10 +110,33 @@ def _read_parquet(path: Path) -> pd.DataFrame | None:
         return None
     if frame.empty:
         return frame
+    return _datetime_sorted(frame)
+
+
+def _read_arrow(path: Path) -> pd.DataFrame | None:
+    if pa is None or not path.exists():
+        return None
+    try:
+        # Uncompressed IPC file on a memory map: numeric columns are views into the page cache,
+        # shared by every reader of the file instead of decoded into a private copy.
+        table = pa_ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        frame = table.to_pandas(split_blocks=True)
+    except Exception:
+        return None
+    if frame.empty:
+        return frame
+    return _datetime_sorted(frame)
+
+
+def _datetime_sorted(frame: pd.DataFrame) -> pd.DataFrame:
     if not isinstance(frame.index, pd.DatetimeIndex):
         frame.index = pd.to_datetime(frame.index, errors="coerce")
         frame = frame[~frame.index.isna()]
-    return frame.sort_index()
+    return frame if frame.index.is_monotonic_increasing else frame.sort_index()
+
+
+def _read_part(path: Path) -> pd.DataFrame | None:
+    return _read_arrow(path) if path.suffix == ".arrow" else _read_parquet(path)
 
 
 def _write_parquet(path: Path, frame: pd.DataFrame) -> bool:
@@ -50,6 +148,26 @@ def _write_parquet(path: Path, frame: pd.DataFrame) -> bool:
         return False
 
 
+def _write_arrow(path: Path, frame: pd.DataFrame) -> bool:
+    if pa is None:
+        return False
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return True
+    except Exception:
+        return False
+
+
+def _write_part(path: Path, frame: pd.DataFrame) -> bool:
+    # Temp files carry the target format in their stem (part-....arrow.tmp).
+    suffix = Path(path.stem).suffix if path.suffix == ".tmp" else path.suffix
+    return _write_arrow(path, frame) if suffix == ".arrow" else _write_parquet(path, frame)
+
+
 def _clip_by_range(frame: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
     if frame.empty:
         return frame
@@ -62,39 +180,320 @@ def _clip_by_range(frame: pd.DataFrame, start_date: datetime, end_date: datetime
     else:
         start_ts = pd.Timestamp(start_date)
         end_ts = pd.Timestamp(end_date)
+    if idx.is_monotonic_increasing:
+        # Positional slice: keeps memory-mapped columns as views.
+        return frame.iloc[idx.searchsorted(start_ts, side="left") : idx.searchsorted(end_ts, side="left")]
     clipped = frame[(idx >= start_ts) & (idx < end_ts)]
     return clipped.sort_index()
 
 
+def _merge_parts(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    parts = [part for part in parts if part is not None and not part.empty]
+    if not parts:
+        return pd.DataFrame()
+    merged = parts[0] if len(parts) == 1 else pd.concat(parts)
+    # Later parts win: a revised bar replaces the one written earlier.
+    if not merged.index.is_unique:
+        merged = merged[~merged.index.duplicated(keep="last")]
+    return merged if merged.index.is_monotonic_increasing else merged.sort_index()
+
+
+def _read_partition(partition: Path) -> pd.DataFrame:
+    return _merge_parts([_read_part(path) for path in _part_files(partition)])
+
+
+def _session_days(index: pd.DatetimeIndex) -> pd.Index:
+    # Partition by the wall-clock date of the index's own timezone, the same clock range reads clip on.
+    wall = index.tz_localize(None) if index.tz is not None else index
+    return wall.strftime("%Y-%m-%d")
+
+
+def _new_rows(existing: pd.DataFrame, incoming: pd.DataFrame) -> pd.DataFrame:
+    if existing.empty:
+        return incoming
+    known = incoming.index.isin(existing.index)
+    if not known.any():
+        return incoming
+    columns = [column for column in incoming.columns if column in existing.columns]
+    previous = existing.reindex(incoming.index[known])[columns]
+    current = incoming.loc[known, columns]
+    changed = ~((previous == current) | (previous.isna() & current.isna())).all(axis=1).to_numpy()
+    keep = ~known
+    keep[known] = changed
+    return incoming[keep]
+
+
+def _compact_partition(partition: Path) -> bool:
+    parts = _part_files(partition)
+    if len(parts) < 2:
+        return False
+    merged = _read_partition(partition)
+    if merged.empty:
+        return False
+    target = _new_part_path(partition)
+    temp = target.with_name(f"{target.name}.tmp")
+    if not _write_part(temp, merged):
+        return False
+    temp.replace(target)
+    for path in parts:
+        try:
+            path.unlink()
+        except OSError:
+            continue
+    return True
+
+
+def _append_partitions(symbol: str, frame: pd.DataFrame, interval: str) -> bool:
+    frame = frame[~frame.index.duplicated(keep="last")]
+    wrote = False
+    with _WRITE_LOCK:
+        for session_day, day_frame in frame.groupby(_session_days(frame.index), sort=True):
+            partition = _partition_dir(symbol, interval, str(session_day))
+            fresh = _new_rows(_read_partition(partition), day_frame.sort_index())
+            if fresh.empty:
+                continue
+            if not _write_part(_new_part_path(partition), fresh):
+                continue
+            wrote = True
+            if len(_part_files(partition)) > INTRADAY_STORE_COMPACT_PARTS:
+                _compact_partition(partition)
+    return wrote
+
+
+def _migrate_legacy_file(symbol: str, interval: str) -> None:
+    legacy_path = _store_path(symbol, interval=interval)
+    if not legacy_path.exists():
+        return
+    legacy = _read_parquet(legacy_path)
+    if legacy is not None and not legacy.empty and isinstance(legacy.index, pd.DatetimeIndex):
+        _append_partitions(symbol, legacy, interval)
+    try:
+        legacy_path.unlink()
+    except OSError:
+        return
+
+
 def load_cached_intraday_frame(
     symbol: str,
     start_date: datetime,
     end_date: datetime,
     interval: str = "5m",
 ) -> pd.DataFrame:
-    if INTRADAY_STORE_MODE != "parquet":
-        return pd.DataFrame()
-    path = _store_path(symbol, interval=interval)
-    frame = _read_parquet(path)
-    if frame is None:
+    if not _store_enabled():
         return pd.DataFrame()
-    return _clip_by_range(frame, start_date=start_date, end_date=end_date)
+    _migrate_legacy_file(symbol, interval)
+    # Only the session partitions overlapping [start_date, end_date) are opened.
+    day = start_date.date()
+    last_day = (end_date - timedelta(microseconds=1)).date()
+    parts: list[pd.DataFrame] = []
+    while day <= last_day:
+        partition = _partition_dir(symbol, interval, day.isoformat())
+        if partition.is_dir():
+            parts.append(_read_partition(partition))
+        day += timedelta(days=1)
+    merged = _merge_parts(parts)
+    if merged.empty:
+        return merged
+    return _clip_by_range(merged, start_date=start_date, end_date=end_date)
 
 
 def upsert_intraday_frame(symbol: str, frame: pd.DataFrame, interval: str = "5m") -> bool:
-    if INTRADAY_STORE_MODE != "parquet":
+    if not _store_enabled():
         return False
-    if frame.empty:
+    if frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
         return False
+    _migrate_legacy_file(symbol, interval)
+    return _append_partitions(symbol, frame, interval)
 
-    path = _store_path(symbol, interval=interval)
-    existing = _read_parquet(path)
-    if existing is None or existing.empty:
-        merged = frame.copy()
-    else:
-        merged = pd.concat([existing, frame]).sort_index()
-        merged = merged[~merged.index.duplicated(keep="last")]
-    return _write_parquet(path, merged)
+
+def compact_intraday_store(symbol: str | None = None, interval: str | None = None) -> int:
+    # Merges every multi-part session partition into one file; returns the number compacted.
+    if not _store_enabled() or not INTRADAY_STORE_DIR.is_dir():
+        return 0
+    symbol_dirs = (
+        [INTRADAY_STORE_DIR / _normalized_symbol(symbol)]
+        if symbol
+        else [path for path in INTRADAY_STORE_DIR.iterdir() if path.is_dir()]
+    )
+    compacted = 0
+    with _WRITE_LOCK:
+        for symbol_dir in symbol_dirs:
+            if not symbol_dir.is_dir():
+                continue
+            if interval:
+                interval_dirs = [symbol_dir / _normalized_interval(interval)]
+            else:
+                interval_dirs = [path for path in symbol_dir.iterdir() if path.is_dir()]
+            for interval_dir in interval_dirs:
+                if not interval_dir.is_dir():
+                    continue
+                for partition in sorted(path for path in interval_dir.iterdir() if path.is_dir()):
+                    if _compact_partition(partition):
+                        compacted += 1
+    return compacted
+
+
+def _interval_minutes(interval: str) -> int | None:
+    match = _INTERVAL_PATTERN.match(_normalized_interval(interval))
+    if not match:
+        return None
+    value = int(match.group(1)) * (60 if match.group(2) == "h" else 1)
+    return value if value > 0 else None
+
+
+def is_session_complete(symbol: str, interval: str, session_day: date) -> bool:
+    return (_partition_dir(symbol, interval, session_day.isoformat()) / _COMPLETE_MARKER).exists()
+
+
+def _mark_session_complete(symbol: str, interval: str, session_day: date) -> None:
+    partition = _partition_dir(symbol, interval, session_day.isoformat())
+    try:
+        partition.mkdir(parents=True, exist_ok=True)
+        (partition / _COMPLETE_MARKER).touch()
+    except OSError:
+        return
+
+
+def _read_session_marker(symbol: str, interval: str, session_day: date, marker: str) -> datetime | None:
+    path = _partition_dir(symbol, interval, session_day.isoformat()) / marker
+    try:
+        return datetime.fromisoformat(path.read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_session_marker(symbol: str, interval: str, session_day: date, marker: str, value: datetime) -> None:
+    partition = _partition_dir(symbol, interval, session_day.isoformat())
+    try:
+        partition.mkdir(parents=True, exist_ok=True)
+        (partition / marker).write_text(value.isoformat(), encoding="utf-8")
+    except OSError:
+        return
+
+
+def _kst_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    # Naive timestamps are KST wall-clock times, as the scoring side assumes.
+    return index.tz_localize(KST) if index.tz is None else index.tz_convert(KST)
+
+
+def session_slot_count(step_minutes: int) -> int:
+    return (_LAST_BAR_SECONDS - _FIRST_BAR_SECONDS) // (step_minutes * 60) + 1
+
+
+def session_slots(index: pd.DatetimeIndex, step_minutes: int) -> np.ndarray:
+    # Position of each bar on the session grid (0 = 09:00 bar); -1 outside 09:00-15:20 KST.
+    kst = _kst_index(index)
+    seconds = (kst - kst.normalize()).total_seconds().to_numpy()
+    offset = seconds - _FIRST_BAR_SECONDS
+    slots = np.floor_divide(offset, step_minutes * 60)
+    on_grid = (offset >= 0) & (seconds <= _LAST_BAR_SECONDS)
+    return np.where(on_grid, slots, -1).astype(np.int64)
+
+
+def cumulative_volume_profile(frame: pd.DataFrame, interval: str = "5m") -> pd.DataFrame:
+    """Days x session-slot matrix of cumulative volume up to and including each slot.
+
+    Rows are KST session dates, columns slot numbers. A cell is NaN until the day's first bar,
+    so a column mean only averages over days that had traded by that time of day.
+    """
+    step_minutes = _interval_minutes(interval)
+    if step_minutes is None or frame.empty or "Volume" not in frame.columns:
+        return pd.DataFrame()
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        return pd.DataFrame()
+    kst = _kst_index(frame.index)
+    slots = session_slots(kst, step_minutes)
+    on_grid = slots >= 0
+    if not on_grid.any():
+        return pd.DataFrame()
+    day_codes, days = pd.factorize(kst.tz_localize(None).normalize()[on_grid], sort=True)
+    volume = pd.to_numeric(frame["Volume"], errors="coerce").fillna(0.0).clip(lower=0.0).to_numpy(dtype=float)
+    slot_count = session_slot_count(step_minutes)
+    totals = np.zeros((len(days), slot_count))
+    counts = np.zeros((len(days), slot_count), dtype=np.int64)
+    np.add.at(totals, (day_codes, slots[on_grid]), volume[on_grid])
+    np.add.at(counts, (day_codes, slots[on_grid]), 1)
+    cumulative = totals.cumsum(axis=1)
+    cumulative[counts.cumsum(axis=1) == 0] = np.nan
+    return pd.DataFrame(cumulative, index=pd.DatetimeIndex(days), columns=range(slot_count))
+
+
+def _plan_gap_fetch(
+    symbol: str,
+    interval: str,
+    cached: pd.DataFrame,
+    start_date: datetime,
+    end_date: datetime,
+    now_kst: datetime,
+    step_minutes: int,
+    is_trading_day: Callable[[date], bool],
+) -> tuple[list[tuple[datetime, datetime, list[date]]], set[date], list[date]]:
+    # Returns the fetch windows with the sessions each one covers, the settled sessions among those,
+    # and the sessions that are already whole and can be sealed without fetching. Windows are whole
+    # KST days [day, day + 1): vendors such as Yahoo only honour the date of start/end and treat end
+    # as exclusive, so a minute-precision window would come back truncated or empty.
+    step = timedelta(minutes=step_minutes)
+    stored = (
+        pd.DatetimeIndex(_kst_index(cached.index)).floor(f"{step_minutes}min")
+        if not cached.empty and isinstance(cached.index, pd.DatetimeIndex)
+        else pd.DatetimeIndex([], tz=KST)
+    )
+    stored_days = stored.strftime("%Y-%m-%d") if len(stored) else pd.Index([])
+    gap_days: list[date] = []
+    settled_days: set[date] = set()
+    seal_now: list[date] = []
+
+    day = start_date.date()
+    last_day = min((end_date - timedelta(microseconds=1)).date(), now_kst.date())
+    while day <= last_day:
+        session_day = day
+        day += timedelta(days=1)
+        if not is_trading_day(session_day) or is_session_complete(symbol, interval, session_day):
+            continue
+        first_bar = datetime.combine(session_day, SESSION_FIRST_BAR, tzinfo=KST)
+        if now_kst < first_bar:
+            continue
+        grid = pd.date_range(first_bar, datetime.combine(session_day, SESSION_LAST_BAR, tzinfo=KST), freq=step)
+        have = stored[stored_days == session_day.isoformat()]
+        settled = now_kst >= datetime.combine(session_day, SESSION_CLOSE, tzinfo=KST) + timedelta(
+            minutes=INTRADAY_SESSION_SETTLE_MINUTES
+        )
+        if settled:
+            if grid.difference(have).empty:
+                seal_now.append(session_day)
+                continue
+            checked = _read_session_marker(symbol, interval, session_day, _NO_DATA_MARKER)
+            if checked is not None and now_kst < checked + timedelta(minutes=INTRADAY_NO_DATA_RETRY_MINUTES):
+                continue
+            gap_days.append(session_day)
+            settled_days.add(session_day)
+            continue
+        # Live session: ask again only once a bar has finished since the vendor last answered with bars
+        # for it. Holes before that point are bars without trades; the bar that was still forming then
+        # is picked up by the next whole-day request.
+        answered = _read_session_marker(symbol, interval, session_day, _ANSWERED_MARKER)
+        answered = max(answered, first_bar) if answered is not None else first_bar
+        gap_start = first_bar + ((answered - first_bar) // step) * step
+        if now_kst < gap_start + step:
+            continue
+        gap_days.append(session_day)
+
+    # Neighbouring gap sessions share one request unless a stored session lies between them.
+    known = set(stored_days)
+    windows: list[tuple[datetime, datetime, list[date]]] = []
+    for session_day in gap_days:
+        window_start = datetime.combine(session_day, dt_time())
+        window_end = window_start + timedelta(days=1)
+        if windows:
+            previous_start, previous_end, sessions = windows[-1]
+            between = previous_end.date()
+            while between < session_day and between.isoformat() not in known:
+                between += timedelta(days=1)
+            if between >= session_day:
+                windows[-1] = (previous_start, window_end, sessions + [session_day])
+                continue
+        windows.append((window_start, window_end, [session_day]))
+    return windows, settled_days, seal_now
 
 
 def fetch_intraday_with_store(
@@ -103,13 +502,67 @@ def fetch_intraday_with_store(
     end_date: datetime,
     interval: str,
     fetcher: Callable[[str, datetime, datetime, str], pd.DataFrame],
+    now: datetime | None = None,
+    is_trading_day: Callable[[date], bool] | None = None,
 ) -> pd.DataFrame:
     cached = load_cached_intraday_frame(symbol, start_date=start_date, end_date=end_date, interval=interval)
-    if not cached.empty:
+    step_minutes = _interval_minutes(interval)
+    if not _store_enabled() or step_minutes is None:
+        if not cached.empty:
+            return cached
+        fetched = fetcher(symbol, start_date, end_date, interval)
+        if fetched.empty:
+            return fetched
+        upsert_intraday_frame(symbol=symbol, frame=fetched, interval=interval)
+        return fetched
+
+    now_value = now or datetime.now(KST)
+    now_kst = now_value.astimezone(KST) if now_value.tzinfo else now_value.replace(tzinfo=KST)
+    windows, settled_days, seal_now = _plan_gap_fetch(
+        symbol,
+        interval,
+        cached,
+        start_date,
+        end_date,
+        now_kst,
+        step_minutes,
+        is_trading_day or (lambda day: day.weekday() < 5),
+    )
+    for session_day in seal_now:
+        _mark_session_complete(symbol, interval, session_day)
+    if not windows:
         return cached
 
-    fetched = fetcher(symbol, start_date, end_date, interval)
-    if fetched.empty:
-        return fetched
-    upsert_intraday_frame(symbol=symbol, frame=fetched, interval=interval)
-    return fetched
+    unstored: list[pd.DataFrame] = []
+    fetched_any = False
+    for fetch_start, fetch_end, sessions in windows:
+        # Whole naive KST days; the response is clipped to the caller's range when read back.
+        fetched = fetcher(symbol, fetch_start, fetch_end, interval)
+        answered_days = (
+            set(_session_days(_kst_index(fetched.index)))
+            if not fetched.empty and isinstance(fetched.index, pd.DatetimeIndex)
+            else set()
+        )
+        # Markers are written only for sessions the response has bars for: an empty or truncated answer
+        # leaves the session to be asked again instead of recording its missing bars as answered.
+        for session_day in sessions:
+            if session_day.isoformat() in answered_days:
+                if session_day in settled_days:
+                    # The request spanned the whole settled session, so bars still missing had no trades.
+                    _mark_session_complete(symbol, interval, session_day)
+                else:
+                    _write_session_marker(symbol, interval, session_day, _ANSWERED_MARKER, now_kst)
+            elif session_day in settled_days:
+                # No bars at all (a halt, or before a listing): asked again after the retry interval.
+                _write_session_marker(symbol, interval, session_day, _NO_DATA_MARKER, now_kst)
+        if fetched.empty:
+            continue
+        fetched_any = True
+        if not upsert_intraday_frame(symbol=symbol, frame=fetched, interval=interval):
+            unstored.append(fetched)
+    if not fetched_any:
+        return cached
+    stored_frame = load_cached_intraday_frame(symbol, start_date=start_date, end_date=end_date, interval=interval)
+    if not unstored:
+        return stored_frame
+    return _clip_by_range(_merge_parts([cached, stored_frame, *unstored]), start_date=start_date, end_date=end_date)
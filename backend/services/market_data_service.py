@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+import pandas as pd
+import yfinance as yf
+
+from services.fetch_executor_service import run_rate_limited
+
+_PROVIDER_MODE = (os.getenv("MARKET_DATA_PROVIDER", "yfinance").strip().lower() or "yfinance")
+MARKET_DATA_PROVIDER = _PROVIDER_MODE if _PROVIDER_MODE in {"yfinance", "replay", "record"} else "yfinance"
+MARKET_DATA_REPLAY_DIR = Path(
+    os.getenv(
+        "MARKET_DATA_REPLAY_DIR",
+        str(Path(__file__).resolve().parents[1] / "data" / "replay"),
+    )
+)
+MARKET_DATA_REPLAY_LATENCY_MS = max(0, int(os.getenv("MARKET_DATA_REPLAY_LATENCY_MS", "0")))
+MARKET_DATA_BATCH_SIZE = max(1, int(os.getenv("MARKET_DATA_BATCH_SIZE", "50")))
+
+
+def provider_data_path(name: str, default: Path) -> Path:
+    # Record/replay runs keep the stores, state files and exchange map under the replay root, so
+    # fixture bars never reach the production data and recording is not short-circuited by it.
+    if MARKET_DATA_PROVIDER in {"replay", "record"}:
+        return MARKET_DATA_REPLAY_DIR / "state" / name
+    return default
+
+
+class MarketDataProvider(Protocol):
+    name: str
+
+    def daily(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame: ...
+
+    def daily_batch(self, symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]: ...
+
+    def intraday(self, symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame: ...
+
+    def news(self, symbol: str) -> list[dict[str, Any]]: ...
+
+
+def _flatten_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame.columns = frame.columns.droplevel(1)
+    return frame
+
+
+def _split_multi_ticker_frame(frame: pd.DataFrame, symbols: list[str]) -> dict[str, pd.DataFrame]:
+    if frame is None or frame.empty:
+        return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return {symbols[0]: frame} if len(symbols) == 1 else {}
+
+    available = set(str(value) for value in frame.columns.get_level_values(1))
+    split: dict[str, pd.DataFrame] = {}
+    for symbol in symbols:
+        if symbol not in available:
+            continue
+        # Multi-ticker results share a union index, so drop the rows another symbol contributed.
+        split[symbol] = frame.xs(symbol, axis=1, level=1).dropna(how="all")
+    return split
+
+
+def _clip_by_range(frame: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    if frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+        return frame
+    idx = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+    return frame[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+
+class YFinanceProvider:
+    name = "yfinance"
+
+    # Every Yahoo round trip takes one rate slot and one vendor concurrency permit; a batch
+    # chunk counts once, like the single HTTP call it is.
+    def daily(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        frame = run_rate_limited(
+            lambda: yf.download(
+                symbol,
+                start=start_date.strftime("%Y-%m-%d"),
+                end=end_date.strftime("%Y-%m-%d"),
+                progress=False,
+                auto_adjust=False,
+            ),
+            vendor=self.name,
+        )
+        return _flatten_columns(frame)
+
+    def daily_batch(self, symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]:
+        unique_symbols = list(dict.fromkeys(symbol for symbol in symbols if symbol))
+        frames: dict[str, pd.DataFrame] = {}
+        for offset in range(0, len(unique_symbols), MARKET_DATA_BATCH_SIZE):
+            chunk = unique_symbols[offset : offset + MARKET_DATA_BATCH_SIZE]
+            try:
+                raw = run_rate_limited(
+                    lambda: yf.download(
+                        chunk,
+                        start=start_date.strftime("%Y-%m-%d"),
+                        end=end_date.strftime("%Y-%m-%d"),
+                        progress=False,
+                        auto_adjust=False,
+                        group_by="column",
+                    ),
+                    vendor=self.name,
+                )
+            except Exception:
+                continue
+            frames.update(_split_multi_ticker_frame(raw, chunk))
+        return frames
+
+    def intraday(self, symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        frame = run_rate_limited(
+            lambda: yf.download(
+                symbol,
+                start=start_date.strftime("%Y-%m-%d"),
+                end=end_date.strftime("%Y-%m-%d"),
+                interval=interval,
+                progress=False,
+                auto_adjust=False,
+                prepost=False,
+            ),
+            vendor=self.name,
+        )
+        return _flatten_columns(frame)
+
+    def news(self, symbol: str) -> list[dict[str, Any]]:
+        return list(run_rate_limited(lambda: yf.Ticker(symbol).news, vendor=f"{self.name}-news") or [])
+
+
+def _fixture_stem(symbol: str) -> str:
+    return (symbol or "").strip().upper().replace("/", "_")
+
+
+def _bars_fixture_path(root: Path, symbol: str, interval: str) -> Path:
+    return root / f"{_fixture_stem(symbol)}_{(interval or '1d').lower()}.parquet"
+
+
+def _news_fixture_path(root: Path, symbol: str) -> Path:
+    return root / f"{_fixture_stem(symbol)}_news.json"
+
+
+def _read_fixture_frame(path: Path) -> pd.DataFrame:
+    if not path.exists():
+        return pd.DataFrame()
+    try:
+        frame = pd.read_parquet(path)
+    except Exception:
+        return pd.DataFrame()
+    if not frame.empty and not isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = pd.to_datetime(frame.index, errors="coerce")
+        frame = frame[~frame.index.isna()]
+    return frame.sort_index()
+
+
+class ReplayProvider:
+    name = "replay"
+
+    def __init__(self, root: Path | None = None, latency_ms: int | None = None) -> None:
+        self.root = root or MARKET_DATA_REPLAY_DIR
+        self.latency_ms = MARKET_DATA_REPLAY_LATENCY_MS if latency_ms is None else max(0, latency_ms)
+
+    def _simulate_latency(self) -> None:
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+
+    def daily(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        self._simulate_latency()
+        return _clip_by_range(_read_fixture_frame(_bars_fixture_path(self.root, symbol, "1d")), start_date, end_date)
+
+    def daily_batch(self, symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]:
+        # One injected delay per batch, like a single multi-ticker vendor round trip.
+        self._simulate_latency()
+        frames: dict[str, pd.DataFrame] = {}
+        for symbol in dict.fromkeys(symbols):
+            frame = _clip_by_range(_read_fixture_frame(_bars_fixture_path(self.root, symbol, "1d")), start_date, end_date)
+            if not frame.empty:
+                frames[symbol] = frame
+        return frames
+
+    def intraday(self, symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        self._simulate_latency()
+        return _clip_by_range(_read_fixture_frame(_bars_fixture_path(self.root, symbol, interval)), start_date, end_date)
+
+    def news(self, symbol: str) -> list[dict[str, Any]]:
+        self._simulate_latency()
+        path = _news_fixture_path(self.root, symbol)
+        if not path.exists():
+            return []
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return []
+        return payload if isinstance(payload, list) else []
+
+
+class RecordingProvider:
+    name = "record"
+
+    def __init__(self, inner: MarketDataProvider | None = None, root: Path | None = None) -> None:
+        self.inner = inner or YFinanceProvider()
+        self.root = root or MARKET_DATA_REPLAY_DIR
+        self._lock = threading.Lock()
+
+    def _record_frame(self, symbol: str, interval: str, frame: pd.DataFrame) -> None:
+        if frame is None or frame.empty:
+            return
+        path = _bars_fixture_path(self.root, symbol, interval)
+        with self._lock:
+            try:
+                existing = _read_fixture_frame(path)
+                merged = pd.concat([existing, frame]).sort_index() if not existing.empty else frame.sort_index()
+                merged = merged[~merged.index.duplicated(keep="last")]
+                self.root.mkdir(parents=True, exist_ok=True)
+                merged.to_parquet(path)
+            except Exception:
+                return
+
+    def daily(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        frame = self.inner.daily(symbol, start_date, end_date)
+        self._record_frame(symbol, "1d", frame)
+        return frame
+
+    def daily_batch(self, symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]:
+        frames = self.inner.daily_batch(symbols, start_date, end_date)
+        for symbol, frame in frames.items():
+            self._record_frame(symbol, "1d", frame)
+        return frames
+
+    def intraday(self, symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        frame = self.inner.intraday(symbol, start_date, end_date, interval)
+        self._record_frame(symbol, interval, frame)
+        return frame
+
+    def news(self, symbol: str) -> list[dict[str, Any]]:
+        items = self.inner.news(symbol)
+        if items:
+            with self._lock:
+                try:
+                    self.root.mkdir(parents=True, exist_ok=True)
+                    _news_fixture_path(self.root, symbol).write_text(json.dumps(items, default=str), encoding="utf-8")
+                except Exception:
+                    pass
+        return items
+
+
+_PROVIDER: MarketDataProvider | None = None
+_PROVIDER_LOCK = threading.Lock()
+
+
+def _build_provider(mode: str) -> MarketDataProvider:
+    if mode == "replay":
+        return ReplayProvider()
+    if mode == "record":
+        return RecordingProvider()
+    return YFinanceProvider()
+
+
+def get_market_data_provider() -> MarketDataProvider:
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        if _PROVIDER is None:
+            _PROVIDER = _build_provider(MARKET_DATA_PROVIDER)
+        return _PROVIDER
+
+
+def set_market_data_provider(provider: MarketDataProvider | None) -> None:
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        _PROVIDER = provider
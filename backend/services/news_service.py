@@ -3,11 +3,13 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Any
 
-import yfinance as yf
 from sqlalchemy import select
 
 from db.models import StockNewsCache
 from db.session import is_db_enabled, session_scope
+from services.exchange_suffix_service import candidate_symbols, resolved_suffix
+from services.fetch_executor_service import single_flight
+from services.market_data_service import get_market_data_provider
 from services.theme_service import extract_themes
 
 
@@ -22,16 +24,23 @@ def _to_iso_timestamp(raw_ts: Any) -> str:
 def _ticker_candidates(code: str) -> list[str]:
     if "." in code:
         return [code]
-    return [f"{code}.KS", f"{code}.KQ"]
+    # Yahoo returns generic news for tickers it does not list, so an unresolved code asks every
+    # exchange; only an exchange learned from price data narrows it to one.
+    suffix = resolved_suffix(code.strip().upper())
+    return [f"{code.strip().upper()}{suffix}"] if suffix else candidate_symbols(code)
 
 
 def fetch_stock_news_items(code: str, max_items: int = 10) -> list[dict[str, str]]:
+    return single_flight(("news", code, max_items), lambda: _fetch_stock_news_items_from_provider(code, max_items))
+
+
+def _fetch_stock_news_items_from_provider(code: str, max_items: int) -> list[dict[str, str]]:
     seen_urls: set[str] = set()
     parsed: list[dict[str, str]] = []
 
     for ticker in _ticker_candidates(code):
         try:
-            raw_items = yf.Ticker(ticker).news or []
+            raw_items = get_market_data_provider().news(ticker)
         except Exception:
             raw_items = []
 
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from services.scoring_service import (
+    KST,
+    MARKET_CLOSE_STRATEGY_START_TIME,
+    MARKET_INTRADAY_START_TIME,
+    MARKET_PREMARKET_START_TIME,
+    is_krx_trading_day,
+    now_in_kst,
+)
+
+PREFETCH_SCHEDULER_ENABLED = (os.getenv("PREFETCH_SCHEDULER_ENABLED", "false").strip().lower() == "true")
+PREFETCH_LEAD_MINUTES = max(0, int(os.getenv("PREFETCH_LEAD_MINUTES", "5")))
+# Upper bound on one sleep so calendar answers and clock jumps are re-checked regularly.
+PREFETCH_MAX_SLEEP_SEC = 900
+
+PREFETCH_WINDOWS = (
+    ("premarket", MARKET_PREMARKET_START_TIME),
+    ("intraday", MARKET_INTRADAY_START_TIME),
+    ("close", MARKET_CLOSE_STRATEGY_START_TIME),
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PrefetchWarmer = Callable[[str, datetime], Any]
+
+_STOP_EVENT = threading.Event()
+_THREAD: threading.Thread | None = None
+_LOCK = threading.Lock()
+_LAST_RUNS: dict[str, str] = {}
+
+
+def next_prefetch_run(now_kst_value: datetime, lookahead_days: int = 10) -> tuple[datetime, str, datetime] | None:
+    now_value = now_kst_value.astimezone(KST) if now_kst_value.tzinfo else now_kst_value.replace(tzinfo=KST)
+    lead = timedelta(minutes=PREFETCH_LEAD_MINUTES)
+    for offset in range(lookahead_days + 1):
+        day = now_value.date() + timedelta(days=offset)
+        if day.weekday() >= 5 or not is_krx_trading_day(day.isoformat()):
+            continue
+        for strategy, start_time in PREFETCH_WINDOWS:
+            window_open = datetime.combine(day, start_time, tzinfo=KST)
+            if window_open <= now_value:
+                continue
+            return max(window_open - lead, now_value), strategy, window_open
+    return None
+
+
+def _run_loop(warm: PrefetchWarmer) -> None:
+    while not _STOP_EVENT.is_set():
+        now_value = now_in_kst()
+        planned = next_prefetch_run(now_value)
+        if planned is None:
+            _STOP_EVENT.wait(PREFETCH_MAX_SLEEP_SEC)
+            continue
+        run_at, strategy, window_open = planned
+        delay = (run_at - now_value).total_seconds()
+        if delay > 0:
+            _STOP_EVENT.wait(min(delay, PREFETCH_MAX_SLEEP_SEC))
+            continue
+        run_key = f"{strategy}:{window_open.isoformat()}"
+        if _LAST_RUNS.get(strategy) != run_key:
+            _LAST_RUNS[strategy] = run_key
+            try:
+                warm(strategy, window_open)
+            except Exception:
+                _LOGGER.exception("prefetch for %s window at %s failed", strategy, window_open.isoformat())
+        # Wait for the window to open so the same slot is not planned again.
+        _STOP_EVENT.wait(max(1.0, (window_open - now_in_kst()).total_seconds()))
+
+
+def start_prefetch_scheduler(warm: PrefetchWarmer) -> bool:
+    global _THREAD
+    with _LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            return False
+        _STOP_EVENT.clear()
+        _THREAD = threading.Thread(target=_run_loop, args=(warm,), name="prefetch-scheduler", daemon=True)
+        _THREAD.start()
+        return True
+
+
+def stop_prefetch_scheduler(timeout: float = 5.0) -> None:
+    global _THREAD
+    with _LOCK:
+        thread = _THREAD
+        _THREAD = None
+    _STOP_EVENT.set()
+    if thread is not None:
+        thread.join(timeout=timeout)
@@ -1,13 +1,21 @@
 ﻿from __future__ import annotations
 
+import heapq
+import multiprocessing
 import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import date, datetime, time, timedelta
-from typing import Any, Literal
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Any, Callable, Iterator, Literal
 from zoneinfo import ZoneInfo
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
 try:
     import exchange_calendars as xcals
@@ -19,11 +27,47 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     holiday_lib = None
 
+from services.daily_store_service import fetch_daily_many_with_store, fetch_daily_with_store
+from services.exchange_suffix_service import (
+    batched_suffix_updates,
+    candidate_symbols,
+    record_symbol_result,
+    resolved_suffix,
+)
+from services.fetch_executor_service import (
+    call_with_deadline,
+    deadline_expired,
+    map_bounded,
+    single_flight,
+    single_flight_many,
+)
+from services.frame_cache_service import get_cached_frame, put_cached_frame
+from services.indicator_state_service import INDICATOR_STATE_MODE, incremental_indicators, seed_indicator_states
+from services.market_data_service import get_market_data_provider
 from services.news_service import fetch_stock_news_items
-from services.sparkline_service import build_sparkline60
-from services.intraday_store_service import fetch_intraday_with_store
+from services.shared_frame_service import read_shared_frames, shared_frames_available, write_shared_frames
+from services.sparkline_service import build_sparklines60
+from services.symbol_master_service import master_record, symbol_master_universe
+from services.intraday_session_state_service import (
+    INTRADAY_SESSION_STATE_MODE,
+    incremental_session_aggregates,
+    session_rows,
+)
+from services.intraday_store_service import (
+    cumulative_volume_profile,
+    fetch_intraday_with_store,
+    session_slot_count,
+    session_slots,
+)
 
 StrategyKind = Literal["premarket", "close", "intraday"]
+# Every strategy overlay the dashboard and validation can ask for, keyed by strategy_variant_key().
+STRATEGY_VARIANTS: tuple[tuple[StrategyKind, str | None], ...] = (
+    ("premarket", None),
+    ("intraday", "baseline"),
+    ("intraday", "phase2"),
+    ("close", None),
+)
 
 TICKERS = {
     "005930.KS": "삼성전자",
@@ -196,8 +240,31 @@ MARKET_CLOSE_STRATEGY_START_TIME = time(hour=15, minute=0)
 MARKET_CLOSE_TIME = time(hour=15, minute=30)
 INTRADAY_MODE = (os.getenv("INTRADAY_MODE", "proxy").strip().lower() or "proxy")
 INTRADAY_SIGNAL_BRANCH = (os.getenv("INTRADAY_SIGNAL_BRANCH", "phase2").strip().lower() or "phase2")
+RAW_FACTOR_CACHE_MAX_ENTRIES = max(0, int(os.getenv("RAW_FACTOR_CACHE_MAX_ENTRIES", "32")))
+RAW_FACTOR_CACHE_TTL_SEC = max(1, int(os.getenv("RAW_FACTOR_CACHE_TTL_SEC", "1800")))
+RAW_FACTOR_CACHE_LIVE_TTL_SEC = max(1, int(os.getenv("RAW_FACTOR_CACHE_LIVE_TTL_SEC", "60")))
+_UNIVERSE_MODE = (os.getenv("UNIVERSE_MODE", "curated").strip().lower() or "curated")
+UNIVERSE_MODE = _UNIVERSE_MODE if _UNIVERSE_MODE in {"curated", "full"} else "curated"
+UNIVERSE_MEMORY_BUDGET_MB = max(1, int(os.getenv("UNIVERSE_MEMORY_BUDGET_MB", "256")))
+UNIVERSE_MIN_CHUNK_SIZE = 50
+# A streaming caller gets each slice this size as soon as it is fetched and scored.
+CANDIDATE_STREAM_BATCH_SIZE = max(1, int(os.getenv("CANDIDATE_STREAM_BATCH_SIZE", "50")))
+# Rough peak footprint of one symbol while scoring: ~125 daily bars plus indicator panel intermediates.
+_ESTIMATED_BYTES_PER_SYMBOL = 64 * 1024
+_EXECUTION_MODE = (os.getenv("SCORING_EXECUTION_MODE", "thread").strip().lower() or "thread")
+SCORING_EXECUTION_MODE = _EXECUTION_MODE if _EXECUTION_MODE in {"thread", "process"} else "thread"
+SCORING_PROCESS_WORKERS = max(1, int(os.getenv("SCORING_PROCESS_WORKERS", str(os.cpu_count() or 1))))
+SCORING_PROCESS_MIN_SYMBOLS = max(1, int(os.getenv("SCORING_PROCESS_MIN_SYMBOLS", "200")))
+SPARKLINE_MAX_CANDIDATES = max(0, int(os.getenv("SPARKLINE_MAX_CANDIDATES", "0")))
+# Lookback used to confirm that a learned exchange suffix really stopped returning daily bars.
+SUFFIX_MISS_CONFIRM_DAYS = max(7, int(os.getenv("SUFFIX_MISS_CONFIRM_DAYS", "30")))
 
 _TRADING_DAY_CACHE: dict[str, bool] = {}
+_RAW_FACTOR_CACHE: "OrderedDict[tuple[Any, ...], tuple[list[dict[str, Any]], list[dict[str, str]], float]]" = OrderedDict()
+_RAW_FACTOR_LOCK = threading.Lock()
+_CLOSE_TAIL_KEY = "_closeTail"
+_PROCESS_POOL: ProcessPoolExecutor | None = None
+_PROCESS_POOL_LOCK = threading.Lock()
 _KRX_CALENDAR: Any | None = None
 _KRX_CALENDAR_ATTEMPTED = False
 _KRX_CALENDAR_ERROR: str | None = None
@@ -241,7 +308,10 @@ def resolve_company_name(code: str) -> str:
     normalized = (code or "").strip().upper().replace(".KS", "").replace(".KQ", "")
     if not normalized:
         return ""
-    return CODE_TO_NAME.get(normalized, normalized)
+    if normalized in CODE_TO_NAME:
+        return CODE_TO_NAME[normalized]
+    record = master_record(normalized)
+    return str(record["name"]) if record else normalized
 
 
 def _code_from_symbol(symbol: str) -> str:
@@ -292,17 +362,81 @@ def now_in_kst() -> datetime:
     return datetime.now(tz=KST)
 
 
+def _fetch_daily_from_provider(ticker_symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    return get_market_data_provider().daily(ticker_symbol, start_date, end_date)
+
+
+def _fetch_daily_batch_from_provider(
+    symbols: list[str],
+    start_date: datetime,
+    end_date: datetime,
+) -> dict[str, pd.DataFrame]:
+    return get_market_data_provider().daily_batch(symbols, start_date, end_date)
+
+
 def _download_frame(ticker_symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-    frame = yf.download(
-        ticker_symbol,
-        start=start_date.strftime("%Y-%m-%d"),
-        end=end_date.strftime("%Y-%m-%d"),
-        progress=False,
-        auto_adjust=False,
-    )
-    if isinstance(frame.columns, pd.MultiIndex):
-        frame.columns = frame.columns.droplevel(1)
-    return frame
+    cached = get_cached_frame(ticker_symbol, start_date, end_date)
+    if cached is not None:
+        return cached
+
+    def _load() -> pd.DataFrame:
+        frame = fetch_daily_with_store(
+            symbol=ticker_symbol,
+            start_date=start_date,
+            end_date=end_date,
+            fetcher=_fetch_daily_from_provider,
+        )
+        put_cached_frame(ticker_symbol, start_date, end_date, frame)
+        return frame
+
+    return single_flight(("1d", ticker_symbol, start_date, end_date), _load)
+
+
+def _download_frames(symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]:
+    frames: dict[str, pd.DataFrame] = {}
+    missing: list[str] = []
+    for symbol in dict.fromkeys(symbol for symbol in symbols if symbol):
+        cached = get_cached_frame(symbol, start_date, end_date)
+        if cached is None:
+            missing.append(symbol)
+        else:
+            frames[symbol] = cached
+    if not missing:
+        return frames
+
+    def _load(keys: list[tuple[str, str, datetime, datetime]]) -> dict[tuple[str, str, datetime, datetime], pd.DataFrame]:
+        fetched = fetch_daily_many_with_store(
+            symbols=[key[1] for key in keys],
+            start_date=start_date,
+            end_date=end_date,
+            batch_fetcher=_fetch_daily_batch_from_provider,
+        )
+        for symbol, frame in fetched.items():
+            put_cached_frame(symbol, start_date, end_date, frame)
+        return {key: fetched[key[1]] for key in keys if key[1] in fetched}
+
+    # Same keys as _download_frame, so a batch joins single fetches in flight and vice versa;
+    # only symbols nobody else is fetching go into this caller's batch.
+    coalesced = single_flight_many([("1d", symbol, start_date, end_date) for symbol in missing], _load)
+    for key, frame in coalesced.items():
+        frames[key[1]] = frame
+    return frames
+
+
+def _fetch_universe_frames(
+    symbols: list[str],
+    start_date: datetime,
+    end_date: datetime,
+    deadline: float | None = None,
+) -> dict[str, pd.DataFrame]:
+    frames = call_with_deadline(lambda: _download_frames(symbols, start_date, end_date), deadline, {})
+    # Batch chunks can fail or come back partially rate-limited; retry those symbols one by one.
+    missing = [symbol for symbol in symbols if frames.get(symbol) is None or frames[symbol].empty]
+    fallback = map_bounded(lambda symbol: _download_frame(symbol, start_date, end_date), missing, deadline=deadline)
+    for symbol, frame in zip(missing, fallback):
+        if frame is not None:
+            frames[symbol] = frame
+    return frames
 
 
 def _download_intraday_frame(
@@ -311,26 +445,19 @@ def _download_intraday_frame(
     end_date: datetime,
     interval: str = "5m",
 ) -> pd.DataFrame:
-    def _fetch_from_yf(symbol: str, start_dt: datetime, end_dt: datetime, tf: str) -> pd.DataFrame:
-        frame = yf.download(
-            symbol,
-            start=start_dt.strftime("%Y-%m-%d"),
-            end=end_dt.strftime("%Y-%m-%d"),
-            interval=tf,
-            progress=False,
-            auto_adjust=False,
-            prepost=False,
-        )
-        if isinstance(frame.columns, pd.MultiIndex):
-            frame.columns = frame.columns.droplevel(1)
-        return frame
-
-    return fetch_intraday_with_store(
-        symbol=ticker_symbol,
-        start_date=start_date,
-        end_date=end_date,
-        interval=interval,
-        fetcher=_fetch_from_yf,
+    def _fetch_from_provider(symbol: str, start_dt: datetime, end_dt: datetime, tf: str) -> pd.DataFrame:
+        return get_market_data_provider().intraday(symbol, start_dt, end_dt, tf)
+
+    return single_flight(
+        ("intraday", ticker_symbol, interval, start_date, end_date),
+        lambda: fetch_intraday_with_store(
+            symbol=ticker_symbol,
+            start_date=start_date,
+            end_date=end_date,
+            interval=interval,
+            fetcher=_fetch_from_provider,
+            is_trading_day=lambda day: is_krx_trading_day(day.isoformat()),
+        ),
     )
 
 
@@ -343,13 +470,6 @@ def _to_kst_datetime_index(index: Any) -> pd.DatetimeIndex:
     return parsed.tz_convert(KST)
 
 
-def _between_time_inclusive(frame: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
-    try:
-        return frame.between_time(start, end, inclusive="both")
-    except TypeError:
-        return frame.between_time(start, end, include_start=True, include_end=True)
-
-
 def _load_krx_exchange_calendar() -> Any | None:
     global _KRX_CALENDAR, _KRX_CALENDAR_ATTEMPTED, _KRX_CALENDAR_ERROR
     if _KRX_CALENDAR_ATTEMPTED:
@@ -676,21 +796,30 @@ def _normalize_ticker(raw: str) -> list[str]:
     if "." in ticker:
         return [ticker]
     if ticker.isdigit() and len(ticker) == 6:
-        return [f"{ticker}.KS", f"{ticker}.KQ"]
+        return candidate_symbols(ticker)
     return [ticker]
 
 
+def _base_universe() -> dict[str, str]:
+    if UNIVERSE_MODE == "full":
+        full_market = symbol_master_universe()
+        if full_market:
+            return full_market
+    return TICKERS
+
+
 def _build_universe(
     custom_tickers: list[str] | None = None,
     restrict_symbols: list[str] | None = None,
 ) -> dict[str, str]:
+    base = _base_universe()
     if restrict_symbols:
-        restricted = [symbol for symbol in restrict_symbols if symbol in TICKERS]
-        universe = {symbol: TICKERS[symbol] for symbol in restricted}
+        restricted = [symbol for symbol in restrict_symbols if symbol in base]
+        universe = {symbol: base[symbol] for symbol in restricted}
         if not universe:
-            universe = dict(TICKERS)
+            universe = dict(base)
     else:
-        universe = dict(TICKERS)
+        universe = dict(base)
     existing_codes = {_code_from_symbol(symbol) for symbol in universe.keys()}
     if not custom_tickers:
         return universe
@@ -707,13 +836,20 @@ def _build_universe(
 
 
 def _infer_sector(code: str) -> str:
-    return SECTOR_BY_CODE.get(code, "Other")
+    sector = SECTOR_BY_CODE.get(code)
+    if sector:
+        return sector
+    record = master_record(code)
+    return (record or {}).get("sector") or "Other"
 
 
 def _infer_market_cap_bucket(code: str, avg_vol_20: float | None = None) -> str:
     predefined = MARKET_CAP_BUCKET_BY_CODE.get(code)
     if predefined:
         return predefined
+    record = master_record(code)
+    if record and record.get("marketCapBucket"):
+        return str(record["marketCapBucket"])
     if avg_vol_20 is None:
         return "mid"
     if avg_vol_20 >= 8_000_000:
@@ -761,30 +897,37 @@ def _atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) ->
     return tr.ewm(alpha=1 / length, min_periods=length, adjust=False).mean()
 
 
-def _compute_scores(close: pd.Series, volume: pd.Series) -> tuple[dict[str, float], dict[str, float]]:
-    sma5 = _sma(close, length=5)
-    sma20 = _sma(close, length=20)
-    rsi_series = _rsi(close, length=14)
-    macd_series = _macd(close)
+def _indicator_values(close: pd.Series, volume: pd.Series) -> dict[str, float]:
+    daily_returns = close.pct_change().dropna()
+    return {
+        "sma5": float(_sma(close, length=5).iloc[-1]),
+        "sma20": float(_sma(close, length=20).iloc[-1]),
+        "rsi": float(_rsi(close, length=14).iloc[-1]),
+        "macd": float(_macd(close).iloc[-1]),
+        "mdd": float(((close / close.rolling(window=60, min_periods=1).max()) - 1.0).min()),
+        "volatility": (
+            float(daily_returns.rolling(window=60).std().iloc[-1] * np.sqrt(252)) if not daily_returns.empty else 0.0
+        ),
+        "avgVol20": float(volume.rolling(20).mean().iloc[-1]),
+    }
+
 
-    rsi_val = float(rsi_series.iloc[-1])
-    macd_val = float(macd_series.iloc[-1])
+def _scores_from_indicators(values: dict[str, float]) -> tuple[dict[str, float], dict[str, float]]:
+    rsi_val = values["rsi"]
+    macd_val = values["macd"]
 
-    ma_score = 10.0 if sma5.iloc[-1] > sma20.iloc[-1] else 4.0
+    ma_score = 10.0 if values["sma5"] > values["sma20"] else 4.0
     rsi_score = 10.0 if 40 <= rsi_val <= 70 else (5.0 if rsi_val > 70 else 8.0)
     macd_score = 10.0 if macd_val > 0 else 5.0
     return_score = round((ma_score * 0.4) + (rsi_score * 0.3) + (macd_score * 0.3), 1)
 
-    rolling_max = close.rolling(window=60, min_periods=1).max()
-    drawdown = (close / rolling_max) - 1.0
-    mdd = float(drawdown.min())
-    daily_returns = close.pct_change().dropna()
-    volatility = float(daily_returns.rolling(window=60).std().iloc[-1] * np.sqrt(252)) if not daily_returns.empty else 0.0
+    mdd = values["mdd"]
+    volatility = values["volatility"]
     mdd_score = max(0.0, 10.0 - (abs(mdd) * 100 / 3))
     vol_score = max(0.0, 10.0 - (volatility * 10))
     stability_score = round((mdd_score * 0.6) + (vol_score * 0.4), 1)
 
-    avg_vol_20 = float(volume.rolling(20).mean().iloc[-1])
+    avg_vol_20 = values["avgVol20"]
     # Use a log scale so high-liquidity large caps no longer saturate the market factor too easily.
     log_volume = float(np.log10(max(avg_vol_20, 1.0)))
     market_score = 1.0 + (((log_volume - 4.5) / 3.0) * 9.0)
@@ -799,6 +942,91 @@ def _compute_scores(close: pd.Series, volume: pd.Series) -> tuple[dict[str, floa
     )
 
 
+def _compute_scores(close: pd.Series, volume: pd.Series) -> tuple[dict[str, float], dict[str, float]]:
+    return _scores_from_indicators(_indicator_values(close, volume))
+
+
+def _tail_aligned_panel(frames: dict[str, pd.DataFrame], column: str, length: int) -> pd.DataFrame:
+    # Rows are positions counted back from each symbol's latest bar, so symbols with
+    # different calendars or history lengths still line up on their last row.
+    symbols = list(frames.keys())
+    values = np.full((length, len(symbols)), np.nan, dtype=float)
+    for col, symbol in enumerate(symbols):
+        series = frames[symbol][column].to_numpy(dtype=float)[-length:]
+        values[length - len(series) :, col] = series
+    return pd.DataFrame(values, columns=symbols)
+
+
+def _compute_indicator_panel(frames: dict[str, pd.DataFrame]) -> dict[str, dict[str, float]]:
+    # Symbols with gaps inside their close history keep the per-series path, because
+    # the series volatility drops those rows before its rolling window.
+    eligible: dict[str, pd.DataFrame] = {}
+    for symbol, frame in frames.items():
+        try:
+            close_values = frame["Close"].to_numpy(dtype=float)
+            if len(close_values) >= 2 and not np.isnan(close_values).any():
+                eligible[symbol] = frame
+        except Exception:
+            continue
+    if not eligible:
+        return {}
+
+    length = max(len(frame) for frame in eligible.values())
+    close = _tail_aligned_panel(eligible, "Close", length)
+    high = _tail_aligned_panel(eligible, "High", length)
+    low = _tail_aligned_panel(eligible, "Low", length)
+    volume = _tail_aligned_panel(eligible, "Volume", length)
+
+    sma5 = _sma(close, length=5).iloc[-1]
+    sma20 = _sma(close, length=20).iloc[-1]
+    rsi = _rsi(close, length=14).iloc[-1]
+    macd = _macd(close).iloc[-1]
+    mdd = ((close / close.rolling(window=60, min_periods=1).max()) - 1.0).min()
+    volatility = close.pct_change().rolling(window=60).std().iloc[-1] * np.sqrt(252)
+    avg_vol_20 = volume.rolling(20).mean().iloc[-1]
+
+    prev_close = close.shift(1)
+    true_range = np.fmax(np.fmax((high - low).abs(), (high - prev_close).abs()), (low - prev_close).abs())
+    atr = true_range.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean().iloc[-1]
+    high_60 = high.rolling(window=60, min_periods=1).max().iloc[-1]
+    low_10 = low.rolling(window=10, min_periods=1).min().iloc[-1]
+
+    indicators: dict[str, dict[str, float]] = {}
+    for symbol in eligible:
+        indicators[symbol] = {
+            "sma5": float(sma5[symbol]),
+            "sma20": float(sma20[symbol]),
+            "rsi": float(rsi[symbol]),
+            "macd": float(macd[symbol]),
+            "mdd": float(mdd[symbol]),
+            "volatility": float(volatility[symbol]),
+            "avgVol20": float(avg_vol_20[symbol]),
+            "atr14": float(atr[symbol]),
+            "high60": float(high_60[symbol]),
+            "low10": float(low_10[symbol]),
+        }
+    return indicators
+
+
+def _compute_universe_indicators(frames: dict[str, pd.DataFrame], window_start: datetime) -> dict[str, dict[str, float]]:
+    if INDICATOR_STATE_MODE == "off":
+        return _compute_indicator_panel(frames)
+    # Resuming a warm state beats the panel, but building one bar by bar is slower than the panel:
+    # symbols without a resumable state take the panel now and are seeded in the background.
+    indicators: dict[str, dict[str, float]] = {}
+    cold: dict[str, pd.DataFrame] = {}
+    for symbol, frame in frames.items():
+        values = incremental_indicators(symbol, frame, window_start=window_start, rebuild=False)
+        if values is None:
+            cold[symbol] = frame
+        else:
+            indicators[symbol] = values
+    if cold:
+        indicators.update(_compute_indicator_panel(cold))
+        seed_indicator_states(cold)
+    return indicators
+
+
 def _compute_news_sentiment_score(titles: list[str]) -> float:
     if not titles:
         return 5.0
@@ -816,8 +1044,10 @@ def _collect_news_titles_for_window(
     code: str,
     window_start_kst: datetime,
     window_end_kst: datetime,
+    news_items: list[dict[str, str]] | None = None,
 ) -> tuple[list[str], bool]:
-    news_items = fetch_stock_news_items(code, max_items=20)
+    if news_items is None:
+        news_items = fetch_stock_news_items(code, max_items=20)
     primary_titles: list[str] = []
     fallback_titles: list[str] = []
     fallback_start = window_end_kst - timedelta(hours=24)
@@ -874,12 +1104,12 @@ def _apply_premarket_adjustments(
     *,
     code: str,
     raw_scores: dict[str, float],
-    score_weights: dict[str, float],
     tags: list[str],
     session_date: str,
     signal_date: str,
     overnight_proxy: float | None = None,
-) -> tuple[dict[str, float], dict[str, float], float, dict[str, Any], list[str]]:
+    news_items: list[dict[str, str]] | None = None,
+) -> tuple[dict[str, float], dict[str, Any], list[str]]:
     session_dt = datetime.strptime(session_date, "%Y-%m-%d")
     signal_dt = datetime.strptime(signal_date, "%Y-%m-%d")
     window_start = datetime.combine(signal_dt.date(), MARKET_CLOSE_TIME, tzinfo=KST)
@@ -889,6 +1119,7 @@ def _apply_premarket_adjustments(
         code=code,
         window_start_kst=window_start,
         window_end_kst=window_end,
+        news_items=news_items,
     )
     news_sentiment = _compute_news_sentiment_score(titles)
     resolved_overnight_proxy = overnight_proxy if overnight_proxy is not None else _compute_overnight_proxy_score(session_date)
@@ -898,12 +1129,6 @@ def _apply_premarket_adjustments(
         "stability": _clamp_score(raw_scores["stability"]),
         "market": _clamp_score((raw_scores["market"] * 0.70) + (resolved_overnight_proxy * 0.30)),
     }
-    adjusted_weighted = {
-        "return": round(adjusted_raw["return"] * score_weights["return"], 3),
-        "stability": round(adjusted_raw["stability"] * score_weights["stability"], 3),
-        "market": round(adjusted_raw["market"] * score_weights["market"], 3),
-    }
-    total_score = round(sum(adjusted_weighted.values()), 1)
 
     merged_tags = ["PREMARKET", *tags] if "PREMARKET" not in tags else tags[:]
     premarket_signals = {
@@ -914,7 +1139,147 @@ def _apply_premarket_adjustments(
         "usedPrimaryWindow": used_primary_window,
         "analyzedNewsCount": len(titles),
     }
-    return adjusted_raw, adjusted_weighted, total_score, premarket_signals, merged_tags
+    return adjusted_raw, premarket_signals, merged_tags
+
+
+def _rvol_baseline_profile(history: pd.DataFrame) -> list[float]:
+    # Mean cumulative volume per session slot over earlier days; 0.0 where no day had traded yet.
+    profile = cumulative_volume_profile(history, "5m")
+    if profile.empty:
+        return [0.0] * session_slot_count(5)
+    values = profile.to_numpy()
+    traded = ~np.isnan(values)
+    counts = traded.sum(axis=0)
+    sums = np.where(traded, values, 0.0).sum(axis=0)
+    return [float(total / count) if count else 0.0 for total, count in zip(sums, counts)]
+
+
+def _previous_daily_close(symbol: str, session_day: date) -> float:
+    daily_end = datetime.combine(session_day + timedelta(days=1), time.min)
+    daily_start = daily_end - timedelta(days=60)
+    daily_frame = _download_frame(symbol, daily_start, daily_end)
+    if daily_frame.empty or "Close" not in daily_frame:
+        return 0.0
+    daily_frame = daily_frame.copy()
+    daily_frame.index = pd.to_datetime(daily_frame.index, errors="coerce")
+    daily_frame = daily_frame[~daily_frame.index.isna()]
+    daily_wall = daily_frame.index.tz_localize(None) if daily_frame.index.tz is not None else daily_frame.index
+    prev_close_series = daily_frame[daily_wall.normalize() < pd.Timestamp(session_day)]["Close"]
+    if not prev_close_series.empty and pd.notna(prev_close_series.iloc[-1]):
+        return float(prev_close_series.iloc[-1])
+    return 0.0
+
+
+def _kst_session_bars(bars: pd.DataFrame, session_day: date) -> tuple[pd.DataFrame, np.ndarray, pd.DataFrame] | None:
+    # (session bars, their grid slots, earlier on-grid bars) from a vendor/store frame.
+    required_cols = {"Open", "High", "Low", "Close", "Volume"}
+    if not required_cols.issubset(set(str(col) for col in bars.columns)):
+        return None
+    bars = bars.copy()
+    bars.index = _to_kst_datetime_index(bars.index)
+    bars = bars[~bars.index.isna()]
+    if bars.empty:
+        return None
+    slots = session_slots(bars.index, 5)
+    bar_days = bars.index.tz_localize(None).normalize()
+    session_ts = pd.Timestamp(session_day)
+    session_mask = (slots >= 0) & (bar_days == session_ts)
+    history_mask = (slots >= 0) & (bar_days < session_ts)
+    return bars[session_mask], slots[session_mask], bars[history_mask]
+
+
+def _intraday_signals_payload(aggregates: dict[str, float]) -> dict[str, float]:
+    orb_high = aggregates["orbHigh"]
+    orb_low = aggregates["orbLow"]
+    session_open = aggregates["sessionOpen"]
+    last_close = aggregates["lastClose"]
+    vwap_val = aggregates["vwap"]
+    prev_close = aggregates["prevClose"]
+
+    orb_mid = (orb_high + orb_low) / 2.0
+    orb_span = max(orb_high - orb_low, max(session_open * 0.002, 0.01))
+    orb_breakout = (last_close - orb_mid) / orb_span
+    orb_score = _clamp_score(5.0 + (orb_breakout * 2.4))
+
+    vwap_dev_pct = ((last_close - vwap_val) / vwap_val) * 100 if vwap_val else 0.0
+    vwap_score = _clamp_score(5.0 + (vwap_dev_pct * 2.0))
+
+    baseline = aggregates["rvolBaseline"]
+    rvol_profile_ratio = aggregates["cumVolume"] / baseline if baseline > 0 else 1.0
+    rvol_score = _clamp_score(5.0 + ((rvol_profile_ratio - 1.0) * 3.2))
+
+    overnight_return_pct = ((session_open - prev_close) / prev_close) * 100 if prev_close else 0.0
+    intraday_return_pct = ((last_close - session_open) / session_open) * 100 if session_open else 0.0
+    intraday_momentum_score = _clamp_score(5.0 + (intraday_return_pct * 2.4))
+
+    is_reversal = overnight_return_pct * intraday_return_pct < 0
+    reversal_mag = min(abs(overnight_return_pct), abs(intraday_return_pct))
+    overnight_reversal_score = _clamp_score(
+        5.0 + (2.0 if is_reversal else -1.0) + (reversal_mag * 1.1)
+    )
+
+    session_range_pct = ((aggregates["sessionHigh"] - aggregates["sessionLow"]) / max(session_open, 1e-9)) * 100
+    in_play_score = _clamp_score(4.5 + (session_range_pct * 1.1) + ((rvol_profile_ratio - 1.0) * 2.0))
+
+    return {
+        "orbScore": round(orb_score, 3),
+        "vwapScore": round(vwap_score, 3),
+        "rvolScore": round(rvol_score, 3),
+        "orbHigh": round(orb_high, 3),
+        "orbLow": round(orb_low, 3),
+        "vwap": round(vwap_val, 3),
+        "lastPrice": round(last_close, 3),
+        "rvolProfileRatio": round(rvol_profile_ratio, 3),
+        "inPlayScore": round(in_play_score, 3),
+        "intradayMomentumScore": round(intraday_momentum_score, 3),
+        "overnightReversalScore": round(overnight_reversal_score, 3),
+        "overnightReturnPct": round(overnight_return_pct, 3),
+        "intradayReturnPct": round(intraday_return_pct, 3),
+    }
+
+
+def _incremental_intraday_bars_signals(symbol: str, session_day: date) -> dict[str, float] | None:
+    # Reads only the session partition; the 14-day RVOL baseline and the previous close are
+    # loaded once per session when the state has to be (re)built.
+    session_start = datetime.combine(session_day, time.min)
+    bars = _download_intraday_frame(
+        symbol,
+        start_date=session_start,
+        end_date=session_start + timedelta(days=1),
+        interval="5m",
+    )
+    if bars.empty:
+        return None
+    record_symbol_result(symbol, has_data=True)
+    selected = _kst_session_bars(bars, session_day)
+    if selected is None:
+        return None
+    session_bars, slots, _ = selected
+    if len(session_bars) < 3 or session_bars[["Open", "High", "Low", "Close"]].isna().to_numpy().any():
+        return None
+    order = np.argsort(session_bars.index.to_numpy(), kind="stable")
+
+    def _context() -> tuple[float, list[float]] | None:
+        history_bars = _download_intraday_frame(
+            symbol,
+            start_date=session_start + timedelta(days=1) - timedelta(days=14),
+            end_date=session_start,
+            interval="5m",
+        )
+        history: pd.DataFrame = pd.DataFrame()
+        if not history_bars.empty:
+            history_selected = _kst_session_bars(history_bars, session_day)
+            if history_selected is not None:
+                history = history_selected[2]
+        return _previous_daily_close(symbol, session_day), _rvol_baseline_profile(history)
+
+    aggregates = incremental_session_aggregates(
+        symbol,
+        session_day.isoformat(),
+        session_rows(session_bars.iloc[order], slots[order]),
+        _context,
+    )
+    return _intraday_signals_payload(aggregates) if aggregates is not None else None
 
 
 def _compute_intraday_bars_signals(
@@ -933,6 +1298,11 @@ def _compute_intraday_bars_signals(
 
     for symbol in symbols:
         try:
+            if INTRADAY_SESSION_STATE_MODE != "off":
+                signals = _incremental_intraday_bars_signals(symbol, session_day)
+                if signals is not None:
+                    return signals
+
             intraday_end = datetime.combine(session_day + timedelta(days=1), time.min)
             intraday_start = intraday_end - timedelta(days=14)
             bars = _download_intraday_frame(
@@ -943,120 +1313,53 @@ def _compute_intraday_bars_signals(
             )
             if bars.empty:
                 continue
-            required_cols = {"Open", "High", "Low", "Close", "Volume"}
-            if not required_cols.issubset(set(str(col) for col in bars.columns)):
-                continue
-
-            bars = bars.copy()
-            bars.index = _to_kst_datetime_index(bars.index)
-            bars = bars[~bars.index.isna()]
-            if bars.empty:
-                continue
-
-            bars = _between_time_inclusive(bars, "09:00", "15:20")
-            if bars.empty:
+            record_symbol_result(symbol, has_data=True)
+            selected = _kst_session_bars(bars, session_day)
+            if selected is None:
                 continue
-
-            session_bars = bars[[idx.date() == session_day for idx in bars.index]]
+            session_bars, session_slot_index, history = selected
             if session_bars.empty or len(session_bars) < 3:
                 continue
 
             first_range = session_bars.iloc[:3]
-            orb_high = float(first_range["High"].max())
-            orb_low = float(first_range["Low"].min())
-            session_open = float(session_bars["Open"].iloc[0])
-            last_close = float(session_bars["Close"].iloc[-1])
-            session_high = float(session_bars["High"].max())
-            session_low = float(session_bars["Low"].min())
-
             volume = pd.to_numeric(session_bars["Volume"], errors="coerce").fillna(0.0).clip(lower=0.0)
             cum_volume = volume.cumsum()
             if cum_volume.empty or float(cum_volume.iloc[-1]) <= 0:
                 continue
+            last_close = float(session_bars["Close"].iloc[-1])
             typical_price = (session_bars["High"] + session_bars["Low"] + session_bars["Close"]) / 3.0
             vwap_series = ((typical_price * volume).cumsum() / cum_volume.replace(0, np.nan)).ffill()
             vwap_val = float(vwap_series.iloc[-1]) if not vwap_series.empty and pd.notna(vwap_series.iloc[-1]) else last_close
 
-            orb_mid = (orb_high + orb_low) / 2.0
-            orb_span = max(orb_high - orb_low, max(session_open * 0.002, 0.01))
-            orb_breakout = (last_close - orb_mid) / orb_span
-            orb_score = _clamp_score(5.0 + (orb_breakout * 2.4))
-
-            vwap_dev_pct = ((last_close - vwap_val) / vwap_val) * 100 if vwap_val else 0.0
-            vwap_score = _clamp_score(5.0 + (vwap_dev_pct * 2.0))
-
-            current_ts = session_bars.index[-1]
-            current_tod = current_ts.time()
-            current_cum_volume = float(cum_volume.iloc[-1])
-
-            history = bars[[idx.date() < session_day for idx in bars.index]]
-            rvol_profile_ratio = 1.0
-            if not history.empty:
-                hist_vol = pd.to_numeric(history["Volume"], errors="coerce").fillna(0.0).clip(lower=0.0)
-                history = history.copy()
-                history["_volume"] = hist_vol
-                historical_cums: list[float] = []
-                for _, day_frame in history.groupby(history.index.date):
-                    sliced = day_frame[[ts.time() <= current_tod for ts in day_frame.index]]
-                    if sliced.empty:
-                        continue
-                    historical_cums.append(float(sliced["_volume"].sum()))
-                baseline = float(np.mean(historical_cums)) if historical_cums else 0.0
-                if baseline > 0:
-                    rvol_profile_ratio = current_cum_volume / baseline
-
-            rvol_score = _clamp_score(5.0 + ((rvol_profile_ratio - 1.0) * 3.2))
-
-            daily_end = datetime.combine(session_day + timedelta(days=1), time.min)
-            daily_start = daily_end - timedelta(days=60)
-            daily_frame = _download_frame(symbol, daily_start, daily_end)
-            prev_close = 0.0
-            if not daily_frame.empty and "Close" in daily_frame:
-                daily_frame = daily_frame.copy()
-                daily_frame.index = pd.to_datetime(daily_frame.index, errors="coerce")
-                daily_frame = daily_frame[~daily_frame.index.isna()]
-                prev_close_series = daily_frame[[idx.date() < session_day for idx in daily_frame.index]]["Close"]
-                if not prev_close_series.empty and pd.notna(prev_close_series.iloc[-1]):
-                    prev_close = float(prev_close_series.iloc[-1])
-
-            overnight_return_pct = ((session_open - prev_close) / prev_close) * 100 if prev_close else 0.0
-            intraday_return_pct = ((last_close - session_open) / session_open) * 100 if session_open else 0.0
-            intraday_momentum_score = _clamp_score(5.0 + (intraday_return_pct * 2.4))
-
-            is_reversal = overnight_return_pct * intraday_return_pct < 0
-            reversal_mag = min(abs(overnight_return_pct), abs(intraday_return_pct))
-            overnight_reversal_score = _clamp_score(
-                5.0 + (2.0 if is_reversal else -1.0) + (reversal_mag * 1.1)
+            # RVOL baseline: mean cumulative volume at the same time-of-day slot on earlier sessions.
+            current_slot = int(session_slot_index[-1])
+            return _intraday_signals_payload(
+                {
+                    "orbHigh": float(first_range["High"].max()),
+                    "orbLow": float(first_range["Low"].min()),
+                    "sessionOpen": float(session_bars["Open"].iloc[0]),
+                    "sessionHigh": float(session_bars["High"].max()),
+                    "sessionLow": float(session_bars["Low"].min()),
+                    "lastClose": last_close,
+                    "vwap": vwap_val,
+                    "cumVolume": float(cum_volume.iloc[-1]),
+                    "rvolBaseline": _rvol_baseline_profile(history)[current_slot],
+                    "prevClose": _previous_daily_close(symbol, session_day),
+                }
             )
-
-            session_range_pct = ((session_high - session_low) / max(session_open, 1e-9)) * 100
-            in_play_score = _clamp_score(4.5 + (session_range_pct * 1.1) + ((rvol_profile_ratio - 1.0) * 2.0))
-
-            return {
-                "orbScore": round(orb_score, 3),
-                "vwapScore": round(vwap_score, 3),
-                "rvolScore": round(rvol_score, 3),
-                "orbHigh": round(orb_high, 3),
-                "orbLow": round(orb_low, 3),
-                "vwap": round(vwap_val, 3),
-                "lastPrice": round(last_close, 3),
-                "rvolProfileRatio": round(rvol_profile_ratio, 3),
-                "inPlayScore": round(in_play_score, 3),
-                "intradayMomentumScore": round(intraday_momentum_score, 3),
-                "overnightReversalScore": round(overnight_reversal_score, 3),
-                "overnightReturnPct": round(overnight_return_pct, 3),
-                "intradayReturnPct": round(intraday_return_pct, 3),
-            }
         except Exception:
             continue
     return None
 
 
+def _uses_intraday_bar_signals(mode: str, signal_branch: str) -> bool:
+    return mode == "bars" and signal_branch == "phase2"
+
+
 def _apply_intraday_proxy_adjustments(
     *,
     code: str,
     raw_scores: dict[str, float],
-    score_weights: dict[str, float],
     tags: list[str],
     open_price: float,
     current_price: float,
@@ -1067,14 +1370,12 @@ def _apply_intraday_proxy_adjustments(
     session_date: str,
     mode: str,
     signal_branch: str,
-) -> tuple[dict[str, float], dict[str, float], float, dict[str, Any], list[str]]:
+    bar_signals: dict[str, float] | None = None,
+) -> tuple[dict[str, float], dict[str, Any], list[str]]:
     resolved_mode = mode if mode in {"proxy", "bars"} else "proxy"
     resolved_branch = signal_branch if signal_branch in {"baseline", "phase2"} else "phase2"
-    bar_signals = (
-        _compute_intraday_bars_signals(code=code, session_date=session_date)
-        if resolved_mode == "bars" and resolved_branch == "phase2"
-        else None
-    )
+    if not _uses_intraday_bar_signals(resolved_mode, resolved_branch):
+        bar_signals = None
 
     # Proxy fallback blends opening-range drift, proxy-VWAP deviation and relative volume.
     range_span = max(day_high - day_low, max(current_price * 0.005, 1.0))
@@ -1141,12 +1442,6 @@ def _apply_intraday_proxy_adjustments(
             "stability": _clamp_score((raw_scores["stability"] * 0.70) + ((10.0 - abs(vwap_proxy_score - 5.0)) * 0.30)),
             "market": _clamp_score((raw_scores["market"] * 0.55) + (rvol_score * 0.45)),
         }
-    adjusted_weighted = {
-        "return": round(adjusted_raw["return"] * score_weights["return"], 3),
-        "stability": round(adjusted_raw["stability"] * score_weights["stability"], 3),
-        "market": round(adjusted_raw["market"] * score_weights["market"], 3),
-    }
-    total_score = round(sum(adjusted_weighted.values()), 1)
 
     intraday_signals = {
         "mode": signal_mode,
@@ -1177,14 +1472,16 @@ def _apply_intraday_proxy_adjustments(
     if intraday_return_pct is not None:
         intraday_signals["intradayReturnPct"] = round(float(intraday_return_pct), 3)
     merged_tags = ["INTRADAY", *tags] if "INTRADAY" not in tags else tags[:]
-    return adjusted_raw, adjusted_weighted, total_score, intraday_signals, merged_tags
+    return adjusted_raw, intraday_signals, merged_tags
 
 
 def apply_sector_exposure_cap(
     candidates: list[dict[str, Any]],
     top_n: int = 5,
     max_per_sector: int = 2,
+    in_place: bool = False,
 ) -> list[dict[str, Any]]:
+    # in_place skips the per-item copy for callers that already own the candidate dicts.
     if not candidates or max_per_sector <= 0:
         return candidates
 
@@ -1195,7 +1492,8 @@ def apply_sector_exposure_cap(
     for candidate in candidates:
         sector = candidate.get("sector", "Other")
         capped = len(selected) < top_n and sector_count.get(sector, 0) >= max_per_sector
-        item = {**candidate, "exposureDeferred": capped}
+        item = candidate if in_place else {**candidate}
+        item["exposureDeferred"] = capped
         if capped:
             deferred.append(item)
             continue
@@ -1222,28 +1520,11 @@ def apply_diversified_sampling(
     top_n: int = BALANCE_TOP_N,
     max_per_sector: int = BALANCE_MAX_PER_SECTOR,
     max_per_market_cap_bucket: int = BALANCE_MAX_PER_MARKET_CAP_BUCKET,
+    in_place: bool = False,
 ) -> list[dict[str, Any]]:
     if not candidates:
         return candidates
 
-    def _select_candidate_index(deferred_items: list[dict[str, Any]], strict: bool) -> int | None:
-        chosen_idx: int | None = None
-        chosen_key: tuple[float, float, float] | None = None
-        for idx, item in enumerate(deferred_items):
-            sector = str(item.get("sector", "Other"))
-            bucket = str(item.get("marketCapBucket", "mid"))
-            sector_used = float(sector_count.get(sector, 0))
-            bucket_used = float(bucket_count.get(bucket, 0))
-            if strict and (sector_used >= max_per_sector or bucket_used >= max_per_market_cap_bucket):
-                continue
-
-            score = float(item.get("score", 0.0))
-            candidate_key = (sector_used, bucket_used, -score)
-            if chosen_key is None or candidate_key < chosen_key:
-                chosen_key = candidate_key
-                chosen_idx = idx
-        return chosen_idx
-
     selected: list[dict[str, Any]] = []
     deferred: list[dict[str, Any]] = []
     sector_count: dict[str, int] = {}
@@ -1256,7 +1537,8 @@ def apply_diversified_sampling(
         bucket_limited = bucket_count.get(bucket, 0) >= max_per_market_cap_bucket
         should_defer = len(selected) < top_n and (sector_limited or bucket_limited)
 
-        item = {**candidate, "balanceDeferred": should_defer}
+        item = candidate if in_place else {**candidate}
+        item["balanceDeferred"] = should_defer
         if should_defer:
             deferred.append(item)
             continue
@@ -1267,20 +1549,47 @@ def apply_diversified_sampling(
             bucket_count[bucket] = bucket_count.get(bucket, 0) + 1
 
     if len(selected) < top_n and deferred:
-        while len(selected) < top_n and deferred:
-            pick_idx = _select_candidate_index(deferred, strict=True)
-            if pick_idx is None:
-                pick_idx = _select_candidate_index(deferred, strict=False)
-            if pick_idx is None:
+        # Items sharing a (sector, bucket) group share their usage counts, so each group only needs
+        # its best (-score, position) at the head of a heap. A refill scans group heads, not the
+        # whole deferred list, and keeps the (sector_used, bucket_used, -score) order with the
+        # earliest deferred position winning ties.
+        groups: dict[tuple[str, str], list[tuple[float, int]]] = {}
+        for position, item in enumerate(deferred):
+            group = (str(item.get("sector", "Other")), str(item.get("marketCapBucket", "mid")))
+            groups.setdefault(group, []).append((-float(item.get("score", 0.0)), position))
+        for heap in groups.values():
+            heapq.heapify(heap)
+
+        def _best_group(strict: bool) -> tuple[str, str] | None:
+            chosen_group: tuple[str, str] | None = None
+            chosen_key: tuple[float, float, float, int] | None = None
+            for group, heap in groups.items():
+                if not heap:
+                    continue
+                sector_used = float(sector_count.get(group[0], 0))
+                bucket_used = float(bucket_count.get(group[1], 0))
+                if strict and (sector_used >= max_per_sector or bucket_used >= max_per_market_cap_bucket):
+                    continue
+                candidate_key = (sector_used, bucket_used, heap[0][0], heap[0][1])
+                if chosen_key is None or candidate_key < chosen_key:
+                    chosen_key = candidate_key
+                    chosen_group = group
+            return chosen_group
+
+        picked: set[int] = set()
+        while len(selected) < top_n and len(picked) < len(deferred):
+            group = _best_group(strict=True) or _best_group(strict=False)
+            if group is None:
                 break
-
-            item = deferred.pop(pick_idx)
+            _, position = heapq.heappop(groups[group])
+            picked.add(position)
+            item = deferred[position]
             item["balanceDeferred"] = False
-            sector = str(item.get("sector", "Other"))
-            bucket = str(item.get("marketCapBucket", "mid"))
-            sector_count[sector] = sector_count.get(sector, 0) + 1
-            bucket_count[bucket] = bucket_count.get(bucket, 0) + 1
+            sector_count[group[0]] = sector_count.get(group[0], 0) + 1
+            bucket_count[group[1]] = bucket_count.get(group[1], 0) + 1
             selected.append(item)
+        if picked:
+            deferred = [item for position, item in enumerate(deferred) if position not in picked]
 
     final = selected + deferred
     for idx, item in enumerate(final):
@@ -1330,184 +1639,485 @@ def detect_market_regime(candidates: list[dict[str, Any]], indices: list[dict[st
     }
 
 
-def fetch_and_score_stocks(
-    date_str: str | None = None,
-    weights: dict[str, float] | None = None,
-    include_sparkline: bool = True,
-    custom_tickers: list[str] | None = None,
-    enforce_exposure_cap: bool = False,
-    max_per_sector: int = 2,
-    cap_top_n: int = 5,
-    strategy: StrategyKind = "close",
-    session_date_str: str | None = None,
-    intraday_signal_branch: str | None = None,
-    restrict_symbols: list[str] | None = None,
-) -> dict[str, Any]:
-    strategy_value = str(strategy).lower()
-    if strategy_value == "premarket":
-        normalized_strategy: StrategyKind = "premarket"
-    elif strategy_value == "intraday":
-        normalized_strategy = "intraday"
-    else:
-        normalized_strategy = "close"
+def _raw_factor_cache_key(
+    *,
+    strategy: str,
+    signal_date: str,
+    session_date: str,
+    intraday_mode: str,
+    intraday_branch: str,
+    universe: dict[str, str],
+    live: bool,
+) -> tuple[Any, ...]:
+    # Keyed on the request rather than the fetched frames, so a hit skips the fetch as well. A live
+    # entry also carries the 5-minute bar bucket and otherwise expires through its TTL.
+    live_bucket = ""
+    if live:
+        now = now_in_kst()
+        live_bucket = now.replace(minute=(now.minute // 5) * 5, second=0, microsecond=0).strftime("%Y%m%d%H%M")
+    return (
+        strategy,
+        signal_date,
+        session_date,
+        intraday_mode,
+        intraday_branch,
+        tuple(universe.items()),
+        live_bucket,
+    )
 
-    if normalized_strategy == "premarket":
-        session_date = session_date_str or date_str or now_in_kst().date().isoformat()
-        signal_date = get_previous_trading_date(session_date)
-    elif normalized_strategy == "intraday":
-        session_date = session_date_str or date_str or now_in_kst().date().isoformat()
-        signal_date = session_date
-    else:
-        signal_date = get_latest_trading_date(date_str)
-        session_date = session_date_str or signal_date
 
-    score_weights = normalize_weights(
-        (weights or DEFAULT_WEIGHTS).get("return"),
-        (weights or DEFAULT_WEIGHTS).get("stability"),
-        (weights or DEFAULT_WEIGHTS).get("market"),
-    )
-    end_date = datetime.strptime(signal_date, "%Y-%m-%d") + timedelta(days=1)
-    start_date = end_date - timedelta(days=180)
-    candidates: list[dict[str, Any]] = []
+def _get_raw_factors(key: tuple[Any, ...]) -> tuple[list[dict[str, Any]], list[dict[str, str]]] | None:
+    with _RAW_FACTOR_LOCK:
+        entry = _RAW_FACTOR_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= monotonic():
+            _RAW_FACTOR_CACHE.pop(key, None)
+            return None
+        _RAW_FACTOR_CACHE.move_to_end(key)
+        return entry[0], entry[1]
+
+
+def _put_raw_factors(
+    key: tuple[Any, ...],
+    scored: list[dict[str, Any]],
+    live: bool,
+    failures: list[dict[str, str]] | None = None,
+) -> None:
+    if RAW_FACTOR_CACHE_MAX_ENTRIES <= 0:
+        return
+    ttl = RAW_FACTOR_CACHE_LIVE_TTL_SEC if live else RAW_FACTOR_CACHE_TTL_SEC
+    with _RAW_FACTOR_LOCK:
+        _RAW_FACTOR_CACHE[key] = (scored, list(failures or []), monotonic() + ttl)
+        _RAW_FACTOR_CACHE.move_to_end(key)
+        while len(_RAW_FACTOR_CACHE) > RAW_FACTOR_CACHE_MAX_ENTRIES:
+            _RAW_FACTOR_CACHE.popitem(last=False)
+
+
+def clear_raw_factor_cache() -> None:
+    with _RAW_FACTOR_LOCK:
+        _RAW_FACTOR_CACHE.clear()
+
+
+def _weighted_scores(raw_scores: dict[str, float], score_weights: dict[str, float]) -> tuple[dict[str, float], float]:
+    weighted = {
+        "return": round(raw_scores["return"] * score_weights["return"], 3),
+        "stability": round(raw_scores["stability"] * score_weights["stability"], 3),
+        "market": round(raw_scores["market"] * score_weights["market"], 3),
+    }
+    return weighted, round(sum(weighted.values()), 1)
 
-    if restrict_symbols is None:
-        universe = _build_universe(custom_tickers=custom_tickers)
-    else:
-        universe = _build_universe(custom_tickers=custom_tickers, restrict_symbols=restrict_symbols)
-    overnight_proxy_cache = _compute_overnight_proxy_score(session_date) if normalized_strategy == "premarket" else None
-    intraday_mode = INTRADAY_MODE if INTRADAY_MODE in {"proxy", "bars"} else "proxy"
-    resolved_intraday_branch = (
-        str(intraday_signal_branch).strip().lower()
-        if intraday_signal_branch is not None
-        else INTRADAY_SIGNAL_BRANCH
-    )
-    if resolved_intraday_branch not in {"baseline", "phase2"}:
-        resolved_intraday_branch = "phase2"
 
+@contextmanager
+def _timed_stage(diagnostics: dict[str, Any], name: str) -> Iterator[dict[str, Any]]:
+    # Stages repeated per universe chunk accumulate into one entry.
+    stage = next((item for item in diagnostics["stages"] if item["name"] == name), None)
+    if stage is None:
+        stage = {"name": name, "elapsedMs": 0.0, "count": 0}
+        diagnostics["stages"].append(stage)
+    started = perf_counter()
+    try:
+        yield stage
+    finally:
+        stage["elapsedMs"] = round(stage["elapsedMs"] + (perf_counter() - started) * 1000, 2)
+
+
+def _record_failure(failures: list[dict[str, str]], symbol: str, stage: str, reason: str) -> None:
+    failures.append({"symbol": symbol, "stage": stage, "reason": reason})
+
+
+def _describe_error(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"[:200]
+
+
+def _new_diagnostics() -> dict[str, Any]:
+    return {"stages": [], "failures": []}
+
+
+def _build_symbol_features(
+    universe: dict[str, str],
+    frames_by_symbol: dict[str, pd.DataFrame],
+    start_date: datetime,
+    failures: list[dict[str, str]],
+) -> dict[str, dict[str, Any]]:
+    indicator_panel = _compute_universe_indicators(frames_by_symbol, window_start=start_date)
+    features: dict[str, dict[str, Any]] = {}
     for ticker_symbol, name in universe.items():
+        df = frames_by_symbol.get(ticker_symbol)
+        if df is None:
+            continue
         try:
-            df = _download_frame(ticker_symbol, start_date, end_date)
-            if df.empty or len(df) < 60:
-                continue
-
             close = df["Close"]
             volume = df["Volume"]
             high = df["High"]
             low = df["Low"]
-            open_ = df["Open"]
 
             current_price = float(close.iloc[-1])
             prev_price = float(close.iloc[-2]) if len(close) > 1 else current_price
             change_rate = round(((current_price - prev_price) / prev_price) * 100, 2) if prev_price else 0.0
 
-            raw_scores, signals = _compute_scores(close=close, volume=volume)
+            indicators = indicator_panel.get(ticker_symbol)
+            if indicators is None:
+                indicators = _indicator_values(close, volume)
+                atr = _atr(high=high, low=low, close=close, length=14)
+                indicators["atr14"] = float(atr.iloc[-1]) if atr is not None and not atr.empty else float("nan")
+                indicators["high60"] = float(high.rolling(window=60, min_periods=1).max().iloc[-1])
+                indicators["low10"] = float(low.rolling(window=10, min_periods=1).min().iloc[-1])
+            raw_scores, signals = _scores_from_indicators(indicators)
 
             code = _code_from_symbol(ticker_symbol)
-            sector = _infer_sector(code)
-            market_cap_bucket = _infer_market_cap_bucket(code=code, avg_vol_20=float(signals.get("avgVol20", 0.0)))
-            tags = ["Value"] if raw_scores["stability"] > 8 else (["TechnicalRebound"] if signals["rsi"] < 40 else ["Momentum"])
+            features[ticker_symbol] = {
+                "name": name,
+                "code": code,
+                "frame": df,
+                "currentPrice": current_price,
+                "changeRate": change_rate,
+                "indicators": indicators,
+                "rawScores": raw_scores,
+                "signals": signals,
+                "sector": _infer_sector(code),
+                "marketCapBucket": _infer_market_cap_bucket(code=code, avg_vol_20=float(signals.get("avgVol20", 0.0))),
+                "tags": (
+                    ["Value"]
+                    if raw_scores["stability"] > 8
+                    else (["TechnicalRebound"] if signals["rsi"] < 40 else ["Momentum"])
+                ),
+            }
+        except Exception as exc:
+            _record_failure(failures, ticker_symbol, "features", _describe_error(exc))
+    return features
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            # Spawned workers do not inherit the server's threads or locks.
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=SCORING_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PROCESS_POOL
+
+
+def shutdown_scoring_process_pool() -> None:
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        pool = _PROCESS_POOL
+        _PROCESS_POOL = None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _uses_process_pool(symbol_count: int) -> bool:
+    # Incremental indicator state lives in the parent process, so it keeps the in-process path.
+    return (
+        SCORING_EXECUTION_MODE == "process"
+        and SCORING_PROCESS_WORKERS > 1
+        and symbol_count >= SCORING_PROCESS_MIN_SYMBOLS
+        and INDICATOR_STATE_MODE == "off"
+        and shared_frames_available()
+    )
+
+
+def _build_symbol_features_shard(
+    frames_path: str,
+    universe: dict[str, str],
+    start_date: datetime,
+) -> tuple[dict[str, dict[str, Any]], list[dict[str, str]]]:
+    # Runs in a worker process: frames come from the memory-mapped shard file, not from pickling.
+    failures: list[dict[str, str]] = []
+    features = _build_symbol_features(universe, read_shared_frames(Path(frames_path)), start_date, failures)
+    for item in features.values():
+        item.pop("frame", None)
+    return features, failures
+
+
+def _build_symbol_features_sharded(
+    universe: dict[str, str],
+    frames_by_symbol: dict[str, pd.DataFrame],
+    start_date: datetime,
+    failures: list[dict[str, str]],
+) -> dict[str, dict[str, Any]]:
+    symbols = [symbol for symbol in universe if symbol in frames_by_symbol]
+    shard_count = max(1, min(SCORING_PROCESS_WORKERS, len(symbols)))
+    shard_size = -(-len(symbols) // shard_count)
+    shards = [symbols[offset : offset + shard_size] for offset in range(0, len(symbols), shard_size)]
+
+    features: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="scoring-shards-") as tmp_dir:
+        pending = []
+        for index, shard in enumerate(shards):
+            shard_path = Path(tmp_dir) / f"shard-{index}.arrow"
+            write_shared_frames({symbol: frames_by_symbol[symbol] for symbol in shard}, shard_path)
+            shard_universe = {symbol: universe[symbol] for symbol in shard}
+            future = _get_process_pool().submit(_build_symbol_features_shard, str(shard_path), shard_universe, start_date)
+            pending.append((shard_universe, future))
+        for shard_universe, future in pending:
+            try:
+                shard_features, shard_failures = future.result()
+            except Exception:
+                # A broken worker only costs this shard its parallelism.
+                shard_features = _build_symbol_features(shard_universe, frames_by_symbol, start_date, failures)
+                shard_failures = []
+            failures.extend(shard_failures)
+            features.update(shard_features)
+
+    ordered: dict[str, dict[str, Any]] = {}
+    for symbol in universe:
+        item = features.get(symbol)
+        if item is not None:
+            ordered[symbol] = {**item, "frame": frames_by_symbol[symbol]}
+    return ordered
+
+
+def _apply_strategy_overlay(
+    features: dict[str, dict[str, Any]],
+    *,
+    normalized_strategy: StrategyKind,
+    session_date: str,
+    signal_date: str,
+    intraday_mode: str,
+    resolved_intraday_branch: str,
+    failures: list[dict[str, str]],
+    deadline: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    overlaid: dict[str, dict[str, Any]] = {}
+    if normalized_strategy == "close":
+        for ticker_symbol, item in features.items():
+            overlaid[ticker_symbol] = {**item, "scoringRaw": item["rawScores"]}
+        return overlaid
+
+    codes = [item["code"] for item in features.values()]
+    overnight_proxy_cache = _compute_overnight_proxy_score(session_date) if normalized_strategy == "premarket" else None
+    news_by_code: dict[str, list[dict[str, str]]] = {}
+    bar_signals_by_code: dict[str, dict[str, float] | None] = {}
+    if normalized_strategy == "premarket":
+        news_results = map_bounded(
+            lambda code: fetch_stock_news_items(code, max_items=20),
+            codes,
+            default=[],
+            deadline=deadline,
+        )
+        news_by_code = dict(zip(codes, news_results))
+    elif _uses_intraday_bar_signals(intraday_mode, resolved_intraday_branch):
+        # Bar lookups learn exchange suffixes; the map is written once after the pass.
+        with batched_suffix_updates():
+            bar_results = map_bounded(
+                lambda code: _compute_intraday_bars_signals(code=code, session_date=session_date),
+                codes,
+                deadline=deadline,
+            )
+        bar_signals_by_code = dict(zip(codes, bar_results))
 
-            premarket_signals: dict[str, Any] | None = None
-            intraday_signals: dict[str, Any] | None = None
-            scoring_raw = raw_scores
+    for ticker_symbol, item in features.items():
+        code = item["code"]
+        try:
             if normalized_strategy == "premarket":
-                adjusted_raw, adjusted_weighted, total_score, premarket_signals, tags = _apply_premarket_adjustments(
+                scoring_raw, strategy_signals, tags = _apply_premarket_adjustments(
                     code=code,
-                    raw_scores=raw_scores,
-                    score_weights=score_weights,
-                    tags=tags,
+                    raw_scores=item["rawScores"],
+                    tags=item["tags"],
                     session_date=session_date,
                     signal_date=signal_date,
                     overnight_proxy=overnight_proxy_cache,
+                    news_items=news_by_code.get(code),
                 )
-                scoring_raw = adjusted_raw
-                weighted_scores = adjusted_weighted
-            elif normalized_strategy == "intraday":
-                adjusted_raw, adjusted_weighted, total_score, intraday_signals, tags = _apply_intraday_proxy_adjustments(
+            else:
+                df = item["frame"]
+                scoring_raw, strategy_signals, tags = _apply_intraday_proxy_adjustments(
                     code=code,
-                    raw_scores=raw_scores,
-                    score_weights=score_weights,
-                    tags=tags,
-                    open_price=float(open_.iloc[-1]),
-                    current_price=current_price,
-                    day_high=float(high.iloc[-1]),
-                    day_low=float(low.iloc[-1]),
-                    today_volume=float(volume.iloc[-1]),
-                    avg_vol_20=float(signals.get("avgVol20", 0.0)),
+                    raw_scores=item["rawScores"],
+                    tags=item["tags"],
+                    open_price=float(df["Open"].iloc[-1]),
+                    current_price=item["currentPrice"],
+                    day_high=float(df["High"].iloc[-1]),
+                    day_low=float(df["Low"].iloc[-1]),
+                    today_volume=float(df["Volume"].iloc[-1]),
+                    avg_vol_20=float(item["signals"].get("avgVol20", 0.0)),
                     session_date=session_date,
                     mode=intraday_mode,
                     signal_branch=resolved_intraday_branch,
+                    bar_signals=bar_signals_by_code.get(code),
                 )
-                scoring_raw = adjusted_raw
-                weighted_scores = adjusted_weighted
-            else:
-                weighted_scores = {
-                    "return": round(scoring_raw["return"] * score_weights["return"], 3),
-                    "stability": round(scoring_raw["stability"] * score_weights["stability"], 3),
-                    "market": round(scoring_raw["market"] * score_weights["market"], 3),
-                }
-                total_score = round(sum(weighted_scores.values()), 1)
+            overlaid[ticker_symbol] = {**item, "scoringRaw": scoring_raw, "strategySignals": strategy_signals, "tags": tags}
+        except Exception as exc:
+            _record_failure(failures, ticker_symbol, "overlay", _describe_error(exc))
+    return overlaid
 
-            atr = _atr(high=high, low=low, close=close, length=14)
-            atr_val = float(atr.iloc[-1]) if atr is not None and not atr.empty and pd.notna(atr.iloc[-1]) else current_price * 0.05
+
+def _build_candidate_payloads(
+    overlaid: dict[str, dict[str, Any]],
+    *,
+    normalized_strategy: StrategyKind,
+    session_date: str,
+    signal_date: str,
+    failures: list[dict[str, str]],
+    on_payload: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    scored: list[dict[str, Any]] = []
+    for ticker_symbol, item in overlaid.items():
+        try:
+            indicators = item["indicators"]
+            signals = item["signals"]
+            current_price = item["currentPrice"]
+            strategy_signals = item.get("strategySignals")
+
+            atr_val = indicators["atr14"] if pd.notna(indicators["atr14"]) else current_price * 0.05
             target_price = round(current_price + (atr_val * 2))
             stop_loss = round(current_price - (atr_val * 1.5))
 
-            high_60 = float(high.rolling(window=60, min_periods=1).max().iloc[-1])
-            low_10 = float(low.rolling(window=10, min_periods=1).min().iloc[-1])
             summary = (
                 f"RSI {signals['rsi']:.1f}, MACD {signals['macd']:.2f}, "
                 f"MDD {abs(signals['mdd']) * 100:.1f}%"
             )
-            if normalized_strategy == "premarket" and premarket_signals is not None:
+            if normalized_strategy == "premarket" and strategy_signals is not None:
                 summary = (
-                    f"장전 합성 신호(뉴스={premarket_signals['newsSentiment']:.1f}, "
-                    f"야간프록시={premarket_signals['overnightProxy']:.1f}). "
+                    f"장전 합성 신호(뉴스={strategy_signals['newsSentiment']:.1f}, "
+                    f"야간프록시={strategy_signals['overnightProxy']:.1f}). "
                     f"{summary}"
                 )
-            elif normalized_strategy == "intraday" and intraday_signals is not None:
+            elif normalized_strategy == "intraday" and strategy_signals is not None:
                 summary = (
-                    f"장중 단타 신호(ORB={intraday_signals['orbProxyScore']:.1f}, "
-                    f"VWAP={intraday_signals['vwapProxyScore']:.1f}, "
-                    f"RVOL={intraday_signals['rvolScore']:.1f}, "
-                    f"branch={intraday_signals.get('signalBranch', 'phase2')}, "
-                    f"mode={intraday_signals['mode']}). "
+                    f"장중 단타 신호(ORB={strategy_signals['orbProxyScore']:.1f}, "
+                    f"VWAP={strategy_signals['vwapProxyScore']:.1f}, "
+                    f"RVOL={strategy_signals['rvolScore']:.1f}, "
+                    f"branch={strategy_signals.get('signalBranch', 'phase2')}, "
+                    f"mode={strategy_signals['mode']}). "
                     f"{summary}"
                 )
 
-            sparkline60 = build_sparkline60(close.tolist(), length=60) if include_sparkline else []
-
             candidate_payload: dict[str, Any] = {
-                "name": name,
-                "code": code,
-                "score": total_score,
-                "changeRate": change_rate,
+                "name": item["name"],
+                "code": item["code"],
+                "changeRate": item["changeRate"],
                 "price": current_price,
                 "targetPrice": target_price,
                 "stopLoss": stop_loss,
-                "high60": high_60,
-                "low10": low_10,
-                "tags": tags,
-                "sector": sector,
-                "marketCapBucket": market_cap_bucket,
+                "high60": indicators["high60"],
+                "low10": indicators["low10"],
+                "tags": item["tags"],
+                "sector": item["sector"],
+                "marketCapBucket": item["marketCapBucket"],
                 "summary": summary,
-                "sparkline60": sparkline60,
+                "sparkline60": [],
                 "strategy": normalized_strategy,
                 "sessionDate": session_date,
                 "signalDate": signal_date,
                 "details": {
-                    "raw": scoring_raw,
-                    "weighted": weighted_scores,
+                    "raw": item["scoringRaw"],
                 },
             }
-            if premarket_signals is not None:
-                candidate_payload["details"]["premarketSignals"] = premarket_signals
-            if intraday_signals is not None:
-                candidate_payload["details"]["intradaySignals"] = intraday_signals
+            if strategy_signals is not None:
+                signals_key = "premarketSignals" if normalized_strategy == "premarket" else "intradaySignals"
+                candidate_payload["details"][signals_key] = strategy_signals
+            # Only the close tail is kept; sparklines are drawn after ranking for the returned candidates.
+            candidate_payload[_CLOSE_TAIL_KEY] = item["frame"]["Close"].to_numpy(dtype=float)[-60:].copy()
+
+            scored.append(candidate_payload)
+            if on_payload is not None:
+                on_payload(candidate_payload)
+        except Exception as exc:
+            _record_failure(failures, ticker_symbol, "payload", _describe_error(exc))
+    return scored
 
-            candidates.append(candidate_payload)
-        except Exception:
-            continue
+
+def _compute_symbol_features(
+    universe: dict[str, str],
+    frames_by_symbol: dict[str, pd.DataFrame],
+    start_date: datetime,
+    failures: list[dict[str, str]],
+) -> dict[str, dict[str, Any]]:
+    if _uses_process_pool(len(frames_by_symbol)):
+        return _build_symbol_features_sharded(universe, frames_by_symbol, start_date, failures)
+    return _build_symbol_features(universe, frames_by_symbol, start_date, failures)
+
+
+def _score_universe_raw(
+    *,
+    universe: dict[str, str],
+    frames_by_symbol: dict[str, pd.DataFrame],
+    normalized_strategy: StrategyKind,
+    session_date: str,
+    signal_date: str,
+    start_date: datetime,
+    intraday_mode: str,
+    resolved_intraday_branch: str,
+    diagnostics: dict[str, Any] | None = None,
+    on_payload: Callable[[dict[str, Any]], None] | None = None,
+    deadline: float | None = None,
+) -> list[dict[str, Any]]:
+    diagnostics = diagnostics if diagnostics is not None else _new_diagnostics()
+    failures: list[dict[str, str]] = diagnostics["failures"]
+
+    with _timed_stage(diagnostics, "features") as stage:
+        features = _compute_symbol_features(universe, frames_by_symbol, start_date, failures)
+        stage["count"] += len(features)
+    return _score_features(
+        features,
+        normalized_strategy=normalized_strategy,
+        session_date=session_date,
+        signal_date=signal_date,
+        intraday_mode=intraday_mode,
+        resolved_intraday_branch=resolved_intraday_branch,
+        diagnostics=diagnostics,
+        on_payload=on_payload,
+        deadline=deadline,
+    )
+
+
+def _score_features(
+    features: dict[str, dict[str, Any]],
+    *,
+    normalized_strategy: StrategyKind,
+    session_date: str,
+    signal_date: str,
+    intraday_mode: str,
+    resolved_intraday_branch: str,
+    diagnostics: dict[str, Any],
+    on_payload: Callable[[dict[str, Any]], None] | None = None,
+    deadline: float | None = None,
+) -> list[dict[str, Any]]:
+    failures: list[dict[str, str]] = diagnostics["failures"]
+    with _timed_stage(diagnostics, "overlay") as stage:
+        overlaid = _apply_strategy_overlay(
+            features,
+            normalized_strategy=normalized_strategy,
+            session_date=session_date,
+            signal_date=signal_date,
+            intraday_mode=intraday_mode,
+            resolved_intraday_branch=resolved_intraday_branch,
+            failures=failures,
+            deadline=deadline,
+        )
+        stage["count"] += len(overlaid)
+    with _timed_stage(diagnostics, "payload") as stage:
+        scored = _build_candidate_payloads(
+            overlaid,
+            normalized_strategy=normalized_strategy,
+            session_date=session_date,
+            signal_date=signal_date,
+            failures=failures,
+            on_payload=on_payload,
+        )
+        stage["count"] += len(scored)
+    return scored
+
+
+def _rank_scored_candidates(
+    scored: list[dict[str, Any]],
+    *,
+    score_weights: dict[str, float],
+    enforce_exposure_cap: bool,
+    max_per_sector: int,
+    cap_top_n: int,
+) -> list[dict[str, Any]]:
+    candidates: list[dict[str, Any]] = []
+    for payload in scored:
+        weighted_scores, total_score = _weighted_scores(payload["details"]["raw"], score_weights)
+        details = {"raw": payload["details"]["raw"], "weighted": weighted_scores}
+        details.update({key: value for key, value in payload["details"].items() if key != "raw"})
+        candidates.append({**payload, "score": total_score, "details": details})
 
     deduped_by_code: dict[str, dict[str, Any]] = {}
     for candidate in candidates:
@@ -1518,19 +2128,226 @@ def fetch_and_score_stocks(
     candidates = list(deduped_by_code.values())
 
     candidates.sort(key=lambda x: x["score"], reverse=True)
-    candidates = apply_diversified_sampling(candidates)
+    candidates = apply_diversified_sampling(candidates, in_place=True)
     for item in candidates:
         item["exposureDeferred"] = False
 
     if enforce_exposure_cap:
-        candidates = apply_sector_exposure_cap(candidates, top_n=cap_top_n, max_per_sector=max_per_sector)
+        candidates = apply_sector_exposure_cap(
+            candidates,
+            top_n=cap_top_n,
+            max_per_sector=max_per_sector,
+            in_place=True,
+        )
 
     for idx, item in enumerate(candidates):
         rank = int(item.get("rank", idx + 1))
         item["rank"] = rank
         item["strongRecommendation"] = rank <= 5
+    return candidates
 
-    return {
+
+def _attach_sparklines(candidates: list[dict[str, Any]], *, include_sparkline: bool) -> None:
+    tails = [item.pop(_CLOSE_TAIL_KEY, None) for item in candidates]
+    if not include_sparkline:
+        return
+    limit = SPARKLINE_MAX_CANDIDATES if SPARKLINE_MAX_CANDIDATES > 0 else len(candidates)
+    targets = [idx for idx, tail in enumerate(tails[:limit]) if tail is not None]
+    for idx, points in zip(targets, build_sparklines60([tails[idx] for idx in targets], length=60)):
+        candidates[idx]["sparkline60"] = points
+
+
+def _candidate_emitter(
+    on_candidate: Callable[[dict[str, Any]], None],
+    score_weights: dict[str, float],
+) -> Callable[[dict[str, Any]], None]:
+    # Streams each payload with its weighted score before the universe-wide rank/diversify step.
+    def _emit(payload: dict[str, Any]) -> None:
+        weighted_scores, total_score = _weighted_scores(payload["details"]["raw"], score_weights)
+        candidate = {key: value for key, value in payload.items() if key != _CLOSE_TAIL_KEY}
+        candidate["score"] = total_score
+        candidate["details"] = {**payload["details"], "weighted": weighted_scores}
+        try:
+            on_candidate(candidate)
+        except Exception:
+            return
+
+    return _emit
+
+
+def _universe_chunk_size() -> int:
+    budget_bytes = UNIVERSE_MEMORY_BUDGET_MB * 1024 * 1024
+    return max(UNIVERSE_MIN_CHUNK_SIZE, budget_bytes // _ESTIMATED_BYTES_PER_SYMBOL)
+
+
+def _screen_fetched_frames(
+    universe: dict[str, str],
+    fetched: dict[str, pd.DataFrame],
+    out_of_time: bool,
+    failures: list[dict[str, str]],
+    skipped: list[str],
+) -> dict[str, pd.DataFrame]:
+    frames_by_symbol: dict[str, pd.DataFrame] = {}
+    for symbol in universe:
+        frame = fetched.get(symbol)
+        if (frame is None or frame.empty) and out_of_time:
+            skipped.append(symbol)
+            _record_failure(failures, symbol, "fetch", "deadline exceeded")
+        elif frame is None or frame.empty:
+            _record_failure(failures, symbol, "fetch", "no data")
+        elif len(frame) < 60:
+            _record_failure(failures, symbol, "fetch", f"insufficient history ({len(frame)} bars)")
+        else:
+            frames_by_symbol[symbol] = frame
+    return frames_by_symbol
+
+
+def _score_universe_chunk(
+    universe: dict[str, str],
+    *,
+    normalized_strategy: StrategyKind,
+    session_date: str,
+    signal_date: str,
+    start_date: datetime,
+    end_date: datetime,
+    intraday_mode: str,
+    resolved_intraday_branch: str,
+    refresh: bool,
+    live: bool,
+    diagnostics: dict[str, Any],
+    on_payload: Callable[[dict[str, Any]], None] | None = None,
+    deadline: float | None = None,
+) -> tuple[list[dict[str, Any]], bool, list[str]]:
+    failures: list[dict[str, str]] = diagnostics["failures"]
+    skipped: list[str] = []
+    # Raw factors do not depend on weights, so a weight change only re-ranks the cached payloads.
+    raw_key = _raw_factor_cache_key(
+        strategy=normalized_strategy,
+        signal_date=signal_date,
+        session_date=session_date,
+        intraday_mode=intraday_mode,
+        intraday_branch=resolved_intraday_branch,
+        universe=universe,
+        live=live,
+    )
+    cached = None if refresh else _get_raw_factors(raw_key)
+    if cached is not None:
+        scored, cached_failures = cached
+        failures.extend(cached_failures)
+        if on_payload is not None:
+            for payload in scored:
+                on_payload(payload)
+        return scored, True, skipped
+
+    first_failure = len(failures)
+    symbols = list(universe)
+    # Streaming callers score the chunk slice by slice so candidates go out during a cold fetch; the
+    # cache entry still covers the whole chunk.
+    step = CANDIDATE_STREAM_BATCH_SIZE if on_payload is not None else max(1, len(symbols))
+    scored: list[dict[str, Any]] = []
+    for offset in range(0, len(symbols), step):
+        part = {symbol: universe[symbol] for symbol in symbols[offset : offset + step]}
+        with _timed_stage(diagnostics, "fetch") as stage:
+            fetched = _fetch_universe_frames(list(part), start_date, end_date, deadline=deadline)
+            frames_by_symbol = _screen_fetched_frames(part, fetched, deadline_expired(deadline), failures, skipped)
+            del fetched
+            stage["count"] += len(frames_by_symbol)
+        scored.extend(
+            _score_universe_raw(
+                universe=part,
+                frames_by_symbol=frames_by_symbol,
+                normalized_strategy=normalized_strategy,
+                session_date=session_date,
+                signal_date=signal_date,
+                start_date=start_date,
+                intraday_mode=intraday_mode,
+                resolved_intraday_branch=resolved_intraday_branch,
+                diagnostics=diagnostics,
+                on_payload=on_payload,
+                deadline=deadline,
+            )
+        )
+    # Once the deadline has passed, overlay lookups may have been cut short too, so nothing is cached.
+    if not skipped and not deadline_expired(deadline):
+        _put_raw_factors(raw_key, scored, live=live, failures=failures[first_failure:])
+    return scored, False, skipped
+
+
+def _resolve_strategy_dates(
+    strategy: str,
+    date_str: str | None,
+    session_date_str: str | None,
+) -> tuple[StrategyKind, str, str]:
+    strategy_value = str(strategy).lower()
+    if strategy_value == "premarket":
+        normalized_strategy: StrategyKind = "premarket"
+    elif strategy_value == "intraday":
+        normalized_strategy = "intraday"
+    else:
+        normalized_strategy = "close"
+
+    if normalized_strategy == "premarket":
+        session_date = session_date_str or date_str or now_in_kst().date().isoformat()
+        signal_date = get_previous_trading_date(session_date)
+    elif normalized_strategy == "intraday":
+        session_date = session_date_str or date_str or now_in_kst().date().isoformat()
+        signal_date = session_date
+    else:
+        signal_date = get_latest_trading_date(date_str)
+        session_date = session_date_str or signal_date
+    return normalized_strategy, session_date, signal_date
+
+
+def _scoring_window(signal_date: str) -> tuple[datetime, datetime]:
+    end_date = datetime.strptime(signal_date, "%Y-%m-%d") + timedelta(days=1)
+    return end_date - timedelta(days=180), end_date
+
+
+def _resolve_intraday_mode() -> str:
+    return INTRADAY_MODE if INTRADAY_MODE in {"proxy", "bars"} else "proxy"
+
+
+def _resolve_intraday_branch(intraday_signal_branch: str | None) -> str:
+    resolved = (
+        str(intraday_signal_branch).strip().lower()
+        if intraday_signal_branch is not None
+        else INTRADAY_SIGNAL_BRANCH
+    )
+    return resolved if resolved in {"baseline", "phase2"} else "phase2"
+
+
+def _finalize_strategy_result(
+    scored: list[dict[str, Any]],
+    *,
+    normalized_strategy: StrategyKind,
+    session_date: str,
+    signal_date: str,
+    score_weights: dict[str, float],
+    include_sparkline: bool,
+    enforce_exposure_cap: bool,
+    max_per_sector: int,
+    cap_top_n: int,
+    diagnostics: dict[str, Any],
+    cache_hits: list[bool],
+    partial: bool,
+    skipped_symbols: list[str],
+    include_diagnostics: bool,
+    started: float,
+) -> dict[str, Any]:
+    with _timed_stage(diagnostics, "rank") as stage:
+        candidates = _rank_scored_candidates(
+            scored,
+            score_weights=score_weights,
+            enforce_exposure_cap=enforce_exposure_cap,
+            max_per_sector=max_per_sector,
+            cap_top_n=cap_top_n,
+        )
+        stage["count"] = len(candidates)
+    with _timed_stage(diagnostics, "sparkline") as stage:
+        _attach_sparklines(candidates, include_sparkline=include_sparkline)
+        stage["count"] = sum(1 for item in candidates if item.get("sparkline60"))
+
+    result: dict[str, Any] = {
         "date": signal_date,
         "sessionDate": session_date,
         "signalDate": signal_date,
@@ -1548,7 +2365,301 @@ def fetch_and_score_stocks(
             "maxPerSector": BALANCE_MAX_PER_SECTOR,
             "maxPerMarketCapBucket": BALANCE_MAX_PER_MARKET_CAP_BUCKET,
         },
+        "partial": partial,
+        "skippedSymbols": skipped_symbols,
     }
+    if include_diagnostics:
+        diagnostics["rawFactorCache"] = (
+            "hit" if cache_hits and all(cache_hits) else ("partial" if any(cache_hits) else "miss")
+        )
+        diagnostics["totalMs"] = round((perf_counter() - started) * 1000, 2)
+        result["diagnostics"] = diagnostics
+    return result
+
+
+def fetch_and_score_stocks(
+    date_str: str | None = None,
+    weights: dict[str, float] | None = None,
+    include_sparkline: bool = True,
+    custom_tickers: list[str] | None = None,
+    enforce_exposure_cap: bool = False,
+    max_per_sector: int = 2,
+    cap_top_n: int = 5,
+    strategy: StrategyKind = "close",
+    session_date_str: str | None = None,
+    intraday_signal_branch: str | None = None,
+    restrict_symbols: list[str] | None = None,
+    refresh: bool = False,
+    include_diagnostics: bool = False,
+    on_candidate: Callable[[dict[str, Any]], None] | None = None,
+    deadline: float | None = None,
+) -> dict[str, Any]:
+    started = perf_counter()
+    diagnostics = _new_diagnostics()
+    failures: list[dict[str, str]] = diagnostics["failures"]
+    normalized_strategy, session_date, signal_date = _resolve_strategy_dates(strategy, date_str, session_date_str)
+    score_weights = normalize_weights(
+        (weights or DEFAULT_WEIGHTS).get("return"),
+        (weights or DEFAULT_WEIGHTS).get("stability"),
+        (weights or DEFAULT_WEIGHTS).get("market"),
+    )
+    start_date, end_date = _scoring_window(signal_date)
+
+    with _timed_stage(diagnostics, "universe") as stage:
+        if restrict_symbols is None:
+            universe = _build_universe(custom_tickers=custom_tickers)
+        else:
+            universe = _build_universe(custom_tickers=custom_tickers, restrict_symbols=restrict_symbols)
+        stage["count"] = len(universe)
+    intraday_mode = _resolve_intraday_mode()
+    resolved_intraday_branch = _resolve_intraday_branch(intraday_signal_branch)
+
+    emit_candidate = _candidate_emitter(on_candidate, score_weights) if on_candidate is not None else None
+    symbols = list(universe.keys())
+    chunk_size = _universe_chunk_size()
+    live = session_date >= now_in_kst().date().isoformat()
+    scored: list[dict[str, Any]] = []
+    cache_hits: list[bool] = []
+    skipped_symbols: list[str] = []
+    partial = False
+    # Frames are only held one chunk at a time; the scored payloads are small enough to keep.
+    for offset in range(0, len(symbols), chunk_size):
+        chunk_universe = {symbol: universe[symbol] for symbol in symbols[offset : offset + chunk_size]}
+        if deadline_expired(deadline):
+            partial = True
+            skipped_symbols.extend(chunk_universe)
+            for symbol in chunk_universe:
+                _record_failure(failures, symbol, "fetch", "deadline exceeded")
+            continue
+        chunk_scored, cache_hit, chunk_skipped = _score_universe_chunk(
+            chunk_universe,
+            normalized_strategy=normalized_strategy,
+            session_date=session_date,
+            signal_date=signal_date,
+            start_date=start_date,
+            end_date=end_date,
+            intraday_mode=intraday_mode,
+            resolved_intraday_branch=resolved_intraday_branch,
+            refresh=refresh,
+            live=live,
+            diagnostics=diagnostics,
+            on_payload=emit_candidate,
+            deadline=deadline,
+        )
+        scored.extend(chunk_scored)
+        cache_hits.append(cache_hit)
+        skipped_symbols.extend(chunk_skipped)
+        partial = partial or bool(chunk_skipped) or (not cache_hit and deadline_expired(deadline))
+
+    return _finalize_strategy_result(
+        scored,
+        normalized_strategy=normalized_strategy,
+        session_date=session_date,
+        signal_date=signal_date,
+        score_weights=score_weights,
+        include_sparkline=include_sparkline,
+        enforce_exposure_cap=enforce_exposure_cap,
+        max_per_sector=max_per_sector,
+        cap_top_n=cap_top_n,
+        diagnostics=diagnostics,
+        cache_hits=cache_hits,
+        partial=partial,
+        skipped_symbols=skipped_symbols,
+        include_diagnostics=include_diagnostics,
+        started=started,
+    )
+
+
+def strategy_variant_key(strategy: str, intraday_signal_branch: str | None = None) -> str:
+    if strategy == "intraday":
+        return f"intraday:{_resolve_intraday_branch(intraday_signal_branch)}"
+    return strategy
+
+
+def _clip_frame_window(frame: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    if frame is None or frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+        return frame
+    idx = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+    return frame[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+
+def _add_stage(diagnostics: dict[str, Any], name: str, elapsed_ms: float, count: int) -> None:
+    stage = next((item for item in diagnostics["stages"] if item["name"] == name), None)
+    if stage is None:
+        stage = {"name": name, "elapsedMs": 0.0, "count": 0}
+        diagnostics["stages"].append(stage)
+    stage["elapsedMs"] = round(stage["elapsedMs"] + elapsed_ms, 2)
+    stage["count"] += count
+
+
+def fetch_and_score_strategy_set(
+    date_str: str | None = None,
+    weights: dict[str, float] | None = None,
+    include_sparkline: bool = True,
+    custom_tickers: list[str] | None = None,
+    enforce_exposure_cap: bool = False,
+    max_per_sector: int = 2,
+    cap_top_n: int = 5,
+    session_date_str: str | None = None,
+    restrict_symbols: list[str] | None = None,
+    refresh: bool = False,
+    include_diagnostics: bool = False,
+    variants: tuple[tuple[str, str | None], ...] = STRATEGY_VARIANTS,
+    deadline: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    # One fetch over the union of the strategy windows and one feature pass per distinct signal
+    # window (premarket signals from the previous session, so it cannot share close's features).
+    # Each overlay fills the same raw-factor cache entry a standalone fetch_and_score_stocks call uses.
+    started = perf_counter()
+    score_weights = normalize_weights(
+        (weights or DEFAULT_WEIGHTS).get("return"),
+        (weights or DEFAULT_WEIGHTS).get("stability"),
+        (weights or DEFAULT_WEIGHTS).get("market"),
+    )
+    intraday_mode = _resolve_intraday_mode()
+    today = now_in_kst().date().isoformat()
+    plans: dict[str, dict[str, Any]] = {}
+    for strategy, branch in variants:
+        normalized_strategy, session_date, signal_date = _resolve_strategy_dates(strategy, date_str, session_date_str)
+        key = strategy_variant_key(normalized_strategy, branch)
+        if key in plans:
+            continue
+        plans[key] = {
+            "strategy": normalized_strategy,
+            "branch": _resolve_intraday_branch(branch),
+            "sessionDate": session_date,
+            "signalDate": signal_date,
+            "window": _scoring_window(signal_date),
+            "live": session_date >= today,
+            "diagnostics": _new_diagnostics(),
+            "scored": [],
+            "cacheHits": [],
+            "skipped": [],
+            "partial": False,
+        }
+    if not plans:
+        return {}
+    windows = list(dict.fromkeys(plan["window"] for plan in plans.values()))
+
+    universe_started = perf_counter()
+    if restrict_symbols is None:
+        universe = _build_universe(custom_tickers=custom_tickers)
+    else:
+        universe = _build_universe(custom_tickers=custom_tickers, restrict_symbols=restrict_symbols)
+    universe_ms = (perf_counter() - universe_started) * 1000
+    for plan in plans.values():
+        _add_stage(plan["diagnostics"], "universe", universe_ms, len(universe))
+
+    symbols = list(universe.keys())
+    chunk_size = _universe_chunk_size()
+    for offset in range(0, len(symbols), chunk_size):
+        chunk_universe = {symbol: universe[symbol] for symbol in symbols[offset : offset + chunk_size]}
+        pending: list[tuple[dict[str, Any], tuple[Any, ...]]] = []
+        for plan in plans.values():
+            raw_key = _raw_factor_cache_key(
+                strategy=plan["strategy"],
+                signal_date=plan["signalDate"],
+                session_date=plan["sessionDate"],
+                intraday_mode=intraday_mode,
+                intraday_branch=plan["branch"],
+                universe=chunk_universe,
+                live=plan["live"],
+            )
+            cached = None if refresh else _get_raw_factors(raw_key)
+            if cached is None:
+                pending.append((plan, raw_key))
+                continue
+            plan["diagnostics"]["failures"].extend(cached[1])
+            plan["scored"].extend(cached[0])
+            plan["cacheHits"].append(True)
+        if not pending:
+            continue
+        if deadline_expired(deadline):
+            for plan, _ in pending:
+                plan["partial"] = True
+                plan["skipped"].extend(chunk_universe)
+                for symbol in chunk_universe:
+                    _record_failure(plan["diagnostics"]["failures"], symbol, "fetch", "deadline exceeded")
+            continue
+        pending_windows = {plan["window"] for plan, _ in pending}
+        fetch_started = perf_counter()
+        fetched = _fetch_universe_frames(
+            list(chunk_universe),
+            min(start for start, _ in pending_windows),
+            max(end for _, end in pending_windows),
+            deadline=deadline,
+        )
+        fetch_ms = (perf_counter() - fetch_started) * 1000
+        out_of_time = deadline_expired(deadline)
+
+        for start_date, end_date in windows:
+            group = [(plan, raw_key) for plan, raw_key in pending if plan["window"] == (start_date, end_date)]
+            if not group:
+                continue
+            group_diagnostics = _new_diagnostics()
+            skipped: list[str] = []
+            clipped = {symbol: _clip_frame_window(frame, start_date, end_date) for symbol, frame in fetched.items()}
+            frames_by_symbol = _screen_fetched_frames(
+                chunk_universe, clipped, out_of_time, group_diagnostics["failures"], skipped
+            )
+            del clipped
+            with _timed_stage(group_diagnostics, "features") as stage:
+                features = _compute_symbol_features(
+                    chunk_universe, frames_by_symbol, start_date, group_diagnostics["failures"]
+                )
+                stage["count"] = len(features)
+            features_stage = group_diagnostics["stages"][0]
+            for plan, raw_key in group:
+                diagnostics = plan["diagnostics"]
+                _add_stage(diagnostics, "fetch", fetch_ms, len(frames_by_symbol))
+                _add_stage(diagnostics, "features", features_stage["elapsedMs"], features_stage["count"])
+                plan["skipped"].extend(skipped)
+                plan["partial"] = plan["partial"] or bool(skipped)
+                diagnostics["failures"].extend(group_diagnostics["failures"])
+                overlay_failures = len(diagnostics["failures"])
+                scored = _score_features(
+                    features,
+                    normalized_strategy=plan["strategy"],
+                    session_date=plan["sessionDate"],
+                    signal_date=plan["signalDate"],
+                    intraday_mode=intraday_mode,
+                    resolved_intraday_branch=plan["branch"],
+                    diagnostics=diagnostics,
+                    deadline=deadline,
+                )
+                plan["scored"].extend(scored)
+                plan["cacheHits"].append(False)
+                if skipped or deadline_expired(deadline):
+                    plan["partial"] = True
+                else:
+                    _put_raw_factors(
+                        raw_key,
+                        scored,
+                        live=plan["live"],
+                        failures=group_diagnostics["failures"] + diagnostics["failures"][overlay_failures:],
+                    )
+        del fetched
+
+    results: dict[str, dict[str, Any]] = {}
+    for key, plan in plans.items():
+        results[key] = _finalize_strategy_result(
+            plan["scored"],
+            normalized_strategy=plan["strategy"],
+            session_date=plan["sessionDate"],
+            signal_date=plan["signalDate"],
+            score_weights=score_weights,
+            include_sparkline=include_sparkline,
+            enforce_exposure_cap=enforce_exposure_cap,
+            max_per_sector=max_per_sector,
+            cap_top_n=cap_top_n,
+            diagnostics=plan["diagnostics"],
+            cache_hits=plan["cacheHits"],
+            partial=plan["partial"],
+            skipped_symbols=plan["skipped"],
+            include_diagnostics=include_diagnostics,
+            started=started,
+        )
+    return results
 
 
 def get_market_indices(date_str: str) -> list[dict[str, Any]]:
@@ -1594,12 +2705,27 @@ def get_market_overview(candidates: list[dict[str, Any]], indices: list[dict[str
     }
 
 
+def _record_lookup_result(symbol: str, frame: pd.DataFrame) -> None:
+    if not frame.empty:
+        record_symbol_result(symbol, has_data=True)
+        return
+    # A narrow window is legitimately empty on holidays, future dates and validation look-aheads,
+    # so a learned exchange is only dropped when a wide recent window is empty as well.
+    code, _, suffix = symbol.rpartition(".")
+    if not code or resolved_suffix(code) != f".{suffix}":
+        return
+    confirm_end = datetime.combine(now_in_kst().date() + timedelta(days=1), time.min)
+    confirm = _download_frame(symbol, confirm_end - timedelta(days=SUFFIX_MISS_CONFIRM_DAYS), confirm_end)
+    record_symbol_result(symbol, has_data=not confirm.empty)
+
+
 def get_price_series_for_ticker(code: str, trade_date: str, future_days: int = 7) -> pd.Series:
     start = datetime.strptime(trade_date, "%Y-%m-%d") - timedelta(days=2)
     end = datetime.strptime(trade_date, "%Y-%m-%d") + timedelta(days=future_days + 7)
-    symbols = [code] if "." in code else [f"{code}.KS", f"{code}.KQ"]
+    symbols = [code] if "." in code else candidate_symbols(code)
     for symbol in symbols:
         frame = _download_frame(symbol, start, end)
+        _record_lookup_result(symbol, frame)
         if not frame.empty:
             return frame["Close"]
     return pd.Series(dtype=float)
@@ -1609,11 +2735,12 @@ def get_trade_day_ohlc_for_ticker(code: str, trade_date: str) -> dict[str, float
     start = datetime.strptime(trade_date, "%Y-%m-%d") - timedelta(days=2)
     end = datetime.strptime(trade_date, "%Y-%m-%d") + timedelta(days=2)
     target_day = datetime.strptime(trade_date, "%Y-%m-%d").date()
-    symbols = [code] if "." in code else [f"{code}.KS", f"{code}.KQ"]
+    symbols = [code] if "." in code else candidate_symbols(code)
 
     for symbol in symbols:
         try:
             frame = _download_frame(symbol, start, end)
+            _record_lookup_result(symbol, frame)
             if frame.empty:
                 continue
             idx = pd.to_datetime(frame.index)
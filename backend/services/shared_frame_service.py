@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pa_ipc = None
+
+_DATE_COLUMN = "__date"
+_LAYOUT_KEY = b"symbol_rows"
+
+
+def shared_frames_available() -> bool:
+    return pa is not None
+
+
+def _wall_dates(frame: pd.DataFrame) -> np.ndarray:
+    index = pd.DatetimeIndex(frame.index)
+    return (index.tz_localize(None) if index.tz is not None else index).to_numpy()
+
+
+def _shard_table(frames: dict[str, pd.DataFrame]) -> "pa.Table":
+    columns = list(next(iter(frames.values())).columns)
+    if all(list(frame.columns) == columns for frame in frames.values()):
+        try:
+            # OHLCV frames share their columns: stack them as one float matrix, one numpy pass per
+            # frame instead of a per-frame reset_index and concat.
+            values = np.concatenate([frame.to_numpy(dtype=float) for frame in frames.values()])
+            dates = np.concatenate([_wall_dates(frame) for frame in frames.values()])
+            arrays = [pa.array(dates)] + [pa.array(np.ascontiguousarray(values[:, pos])) for pos in range(len(columns))]
+            return pa.Table.from_arrays(arrays, names=[_DATE_COLUMN, *map(str, columns)])
+        except (TypeError, ValueError):
+            pass
+    parts = []
+    for frame in frames.values():
+        part = frame.reset_index(drop=True)
+        part.insert(0, _DATE_COLUMN, _wall_dates(frame))
+        parts.append(part)
+    return pa.Table.from_pandas(pd.concat(parts, ignore_index=True), preserve_index=False)
+
+
+def write_shared_frames(frames: dict[str, pd.DataFrame], path: Path) -> None:
+    # One Arrow IPC file per shard with the symbols stored back to back; the schema metadata keeps
+    # each symbol's row range, so a reader slices its frame out instead of regrouping the table.
+    if pa is None:
+        raise RuntimeError("pyarrow is required for shared frames")
+    layout: dict[str, list[int]] = {}
+    offset = 0
+    for symbol, frame in frames.items():
+        layout[symbol] = [offset, len(frame)]
+        offset += len(frame)
+    table = _shard_table(frames) if frames else pa.table({_DATE_COLUMN: pa.array([], pa.timestamp("ns"))})
+    table = table.replace_schema_metadata({_LAYOUT_KEY: json.dumps(layout).encode("utf-8")})
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_shared_frames(path: Path) -> dict[str, pd.DataFrame]:
+    # One zero-copy conversion of the mapped file; each symbol's frame is a positional slice of it,
+    # so null-free columns stay views into the page cache rather than per-symbol copies.
+    if pa is None:
+        raise RuntimeError("pyarrow is required for shared frames")
+    table = pa_ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    layout = json.loads((table.schema.metadata or {}).get(_LAYOUT_KEY, b"{}"))
+    if not layout:
+        return {}
+    combined = table.to_pandas(split_blocks=True).set_index(_DATE_COLUMN)
+    combined.index.name = None
+    return {symbol: combined.iloc[offset : offset + length] for symbol, (offset, length) in layout.items()}
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import base64
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+SPARKLINE_ENCODINGS = ("float", "u8", "b64")
 
 
 def normalize_sparkline(values: Iterable[float]) -> List[float]:
@@ -21,3 +26,40 @@ def build_sparkline60(values: Iterable[float], length: int = 60) -> List[float]:
         return []
     tail = points[-length:]
     return normalize_sparkline(tail)
+
+
+def normalize_sparkline_batch(tails: np.ndarray) -> np.ndarray:
+    # Row-wise normalize_sparkline over a 2D array; NaN marks left padding of shorter series.
+    low = np.nanmin(tails, axis=1, keepdims=True)
+    high = np.nanmax(tails, axis=1, keepdims=True)
+    scale = high - low
+    flat = scale == 0
+    normalized = np.round(((tails - low) / np.where(flat, 1.0, scale)) * 100, 2)
+    return np.where(flat & ~np.isnan(tails), 50.0, normalized)
+
+
+def build_sparklines60(series: Sequence[Sequence[float] | np.ndarray], length: int = 60) -> List[List[float]]:
+    if not series:
+        return []
+    matrix = np.full((len(series), length), np.nan)
+    widths: list[int] = []
+    for row, values in enumerate(series):
+        tail = np.asarray(values, dtype=float)[-length:]
+        widths.append(len(tail))
+        if len(tail):
+            matrix[row, length - len(tail) :] = tail
+    filled = [row for row, width in enumerate(widths) if width]
+    normalized = np.full_like(matrix, np.nan)
+    if filled:
+        normalized[filled] = normalize_sparkline_batch(matrix[filled])
+    return [normalized[row, length - width :].tolist() if width else [] for row, width in enumerate(widths)]
+
+
+def encode_sparkline(points: List[float], encoding: str = "float") -> List[float] | List[int] | str:
+    # u8 quantizes the 0-100 scale to one byte per point; b64 packs those bytes for compact JSON.
+    if encoding not in {"u8", "b64"}:
+        return points
+    quantized = np.clip(np.floor(np.asarray(points, dtype=float) * 255 / 100 + 0.5), 0, 255).astype(np.uint8)
+    if encoding == "u8":
+        return quantized.tolist()
+    return base64.b64encode(quantized.tobytes()).decode("ascii")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import csv
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+SYMBOL_MASTER_PATH = Path(
+    os.getenv(
+        "SYMBOL_MASTER_PATH",
+        str(Path(__file__).resolve().parents[1] / "data" / "symbol_master.csv"),
+    )
+)
+
+# Lookups reuse the loaded master and only stat the file for changes this often.
+SYMBOL_MASTER_RECHECK_SEC = max(0.0, float(os.getenv("SYMBOL_MASTER_RECHECK_SEC", "60")))
+
+MARKET_SUFFIX = {"KOSPI": ".KS", "KOSDAQ": ".KQ"}
+# Market-cap cut-offs in KRW for the mega / large / mid buckets used by diversification.
+MEGA_CAP_MIN_KRW = 20_000_000_000_000
+LARGE_CAP_MIN_KRW = 2_000_000_000_000
+
+_LOCK = threading.Lock()
+_MASTER: dict[str, dict[str, Any]] | None = None
+_MASTER_MTIME: float | None = None
+_NEXT_CHECK_AT = 0.0
+
+
+def _cap_bucket(market_cap: float | None) -> str | None:
+    if market_cap is None or market_cap <= 0:
+        return None
+    if market_cap >= MEGA_CAP_MIN_KRW:
+        return "mega"
+    if market_cap >= LARGE_CAP_MIN_KRW:
+        return "large"
+    return "mid"
+
+
+def _parse_row(row: dict[str, str]) -> dict[str, Any] | None:
+    code = str(row.get("code") or "").strip().upper()
+    market = str(row.get("market") or "").strip().upper()
+    if not (len(code) == 6 and code.isdigit()) or market not in MARKET_SUFFIX:
+        return None
+    try:
+        market_cap = float(str(row.get("marketCap") or "").replace(",", "")) or None
+    except ValueError:
+        market_cap = None
+    return {
+        "code": code,
+        "symbol": f"{code}{MARKET_SUFFIX[market]}",
+        "name": str(row.get("name") or "").strip() or code,
+        "market": market,
+        "sector": str(row.get("sector") or "").strip() or None,
+        "marketCapBucket": _cap_bucket(market_cap),
+    }
+
+
+def load_symbol_master() -> dict[str, dict[str, Any]]:
+    # Keyed by 6-digit code; reloaded when the file on disk changes. Sector, cap and name lookups
+    # call this per symbol, so between mtime checks it returns the loaded dict without the lock.
+    global _MASTER, _MASTER_MTIME, _NEXT_CHECK_AT
+    master = _MASTER
+    if master is not None and time.monotonic() < _NEXT_CHECK_AT:
+        return master
+    with _LOCK:
+        _NEXT_CHECK_AT = time.monotonic() + SYMBOL_MASTER_RECHECK_SEC
+        try:
+            mtime = SYMBOL_MASTER_PATH.stat().st_mtime
+        except OSError:
+            _MASTER, _MASTER_MTIME = {}, None
+            return _MASTER
+        if _MASTER is not None and _MASTER_MTIME == mtime:
+            return _MASTER
+        loaded: dict[str, dict[str, Any]] = {}
+        try:
+            with SYMBOL_MASTER_PATH.open(encoding="utf-8-sig", newline="") as handle:
+                for row in csv.DictReader(handle):
+                    record = _parse_row(row)
+                    if record is not None:
+                        loaded.setdefault(record["code"], record)
+        except Exception:
+            loaded = {}
+        _MASTER, _MASTER_MTIME = loaded, mtime
+        return loaded
+
+
+def symbol_master_universe() -> dict[str, str]:
+    return {record["symbol"]: record["name"] for record in load_symbol_master().values()}
+
+
+def master_record(code: str) -> dict[str, Any] | None:
+    return load_symbol_master().get((code or "").strip().upper())
+
+
+def reset_symbol_master() -> None:
+    global _MASTER, _MASTER_MTIME, _NEXT_CHECK_AT
+    with _LOCK:
+        _MASTER, _MASTER_MTIME, _NEXT_CHECK_AT = None, None, 0.0
@@ -14,10 +14,12 @@ import pandas as pd
 from services.scoring_service import (
     DEFAULT_WEIGHTS,
     fetch_and_score_stocks,
+    fetch_and_score_strategy_set,
     get_latest_trading_date,
     get_price_series_for_ticker,
     is_krx_trading_day,
     normalize_weights,
+    strategy_variant_key,
 )
 
 _ALLOWED_STRATEGIES = {"premarket", "intraday", "close"}
@@ -256,6 +258,48 @@ def _compute_basic_metrics(net_returns: list[float], turnover_steps: int) -> dic
     }
 
 
+def _score_session(
+    *,
+    session_date: str,
+    strategy: str,
+    universe: list[str] | None,
+    weights: dict[str, float],
+    intraday_signal_branch: str,
+    session_payloads: dict[tuple[str, str], dict[str, Any]] | None,
+) -> dict[str, Any]:
+    if session_payloads is None:
+        return fetch_and_score_stocks(
+            date_str=session_date,
+            strategy=strategy,
+            session_date_str=session_date,
+            include_sparkline=False,
+            custom_tickers=universe,
+            weights=weights,
+            enforce_exposure_cap=False,
+            intraday_signal_branch=intraday_signal_branch,
+        )
+    key = (session_date, strategy_variant_key(strategy, intraday_signal_branch))
+    if key not in session_payloads:
+        # Both intraday branches are scored from one data load; the other branch's run reads them from here.
+        variants = (
+            tuple(("intraday", branch) for branch in sorted(_ALLOWED_INTRADAY_BRANCHES))
+            if strategy == "intraday"
+            else ((strategy, intraday_signal_branch),)
+        )
+        results = fetch_and_score_strategy_set(
+            date_str=session_date,
+            session_date_str=session_date,
+            include_sparkline=False,
+            custom_tickers=universe,
+            weights=weights,
+            enforce_exposure_cap=False,
+            variants=variants,
+        )
+        for variant_key, payload in results.items():
+            session_payloads[(session_date, variant_key)] = payload
+    return session_payloads[key]
+
+
 def _evaluate_sessions(
     *,
     sessions: list[str],
@@ -264,6 +308,7 @@ def _evaluate_sessions(
     weights: dict[str, float],
     cost_bps: float,
     intraday_signal_branch: str,
+    session_payloads: dict[tuple[str, str], dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     round_trip_cost_pct = _cost_pct(cost_bps)
     net_returns: list[float] = []
@@ -271,15 +316,13 @@ def _evaluate_sessions(
 
     for session_date in sessions:
         try:
-            payload = fetch_and_score_stocks(
-                date_str=session_date,
+            payload = _score_session(
+                session_date=session_date,
                 strategy=strategy,
-                session_date_str=session_date,
-                include_sparkline=False,
-                custom_tickers=universe,
+                universe=universe,
                 weights=weights,
-                enforce_exposure_cap=False,
                 intraday_signal_branch=intraday_signal_branch,
+                session_payloads=session_payloads,
             )
             candidates = payload.get("candidates", [])
             if not candidates:
@@ -347,6 +390,7 @@ def run_walk_forward_validation(
     universe: list[str] | None,
     params: dict[str, Any] | None,
     as_of_date: str | None,
+    session_payloads: dict[tuple[str, str], dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     normalized_strategy = _normalize_strategy(strategy)
     reference_date = get_latest_trading_date(as_of_date)
@@ -355,6 +399,8 @@ def run_walk_forward_validation(
     intraday_signal_branch = _normalize_intraday_signal_branch(params.get("intradaySignalBranch"))
     compare_branches = _to_bool(params.get("compareBranches")) and normalized_strategy == "intraday"
     emit_monitoring = _to_bool(params.get("emitMonitoring", True))
+    if compare_branches and session_payloads is None:
+        session_payloads = {}
 
     if normalized_strategy not in VALIDATION_ENABLED_STRATEGIES:
         disabled_result: dict[str, Any] = {
@@ -470,6 +516,7 @@ def run_walk_forward_validation(
             weights=weights,
             cost_bps=cost_bps,
             intraday_signal_branch=intraday_signal_branch,
+            session_payloads=session_payloads,
         )
         test_eval = _evaluate_sessions(
             sessions=eval_slice,
@@ -478,6 +525,7 @@ def run_walk_forward_validation(
             weights=weights,
             cost_bps=cost_bps,
             intraday_signal_branch=intraday_signal_branch,
+            session_payloads=session_payloads,
         )
         train_sharpe = float(train_eval["metrics"].get("netSharpe", 0.0))
         test_sharpe = float(test_eval["metrics"].get("netSharpe", 0.0))
@@ -555,12 +603,14 @@ def run_walk_forward_validation(
             universe=universe,
             params={**shared_params, "intradaySignalBranch": "baseline", "emitMonitoring": False},
             as_of_date=reference_date,
+            session_payloads=session_payloads,
         )
         phase2_summary = run_walk_forward_validation(
             strategy=normalized_strategy,
             universe=universe,
             params={**shared_params, "intradaySignalBranch": "phase2", "emitMonitoring": False},
             as_of_date=reference_date,
+            session_payloads=session_payloads,
         )
         baseline_metrics = baseline_summary.get("metrics", {}) if isinstance(baseline_summary.get("metrics"), dict) else {}
         phase2_metrics = phase2_summary.get("metrics", {}) if isinstance(phase2_summary.get("metrics"), dict) else {}
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.daily_store_service as daily_store_service  # noqa: E402
+import services.exchange_suffix_service as exchange_suffix_service  # noqa: E402
+import services.indicator_state_service as indicator_state_service  # noqa: E402
+import services.intraday_session_state_service as intraday_session_state_service  # noqa: E402
+import services.intraday_store_service as intraday_store_service  # noqa: E402
+import services.scoring_service as scoring_service  # noqa: E402
+from services.frame_cache_service import clear_frame_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_raw_factor_cache():
+    scoring_service.clear_raw_factor_cache()
+    yield
+    scoring_service.clear_raw_factor_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_persistent_state(monkeypatch, tmp_path_factory):
+    # Stores and the learned exchange map write to backend/data by default; keep test runs out of it.
+    root = tmp_path_factory.mktemp("state")
+    monkeypatch.setattr(exchange_suffix_service, "EXCHANGE_SUFFIX_MAP_PATH", root / "exchange_suffix_map.json")
+    monkeypatch.setattr(daily_store_service, "DAILY_STORE_DIR", root / "daily")
+    monkeypatch.setattr(intraday_store_service, "INTRADAY_STORE_DIR", root / "intraday")
+    monkeypatch.setattr(indicator_state_service, "INDICATOR_STATE_DIR", root / "indicator_state")
+    monkeypatch.setattr(intraday_session_state_service, "INTRADAY_SESSION_STATE_DIR", root / "intraday_session_state")
+    exchange_suffix_service.reset_exchange_suffix_map()
+    clear_frame_cache()
+    yield
+    exchange_suffix_service.reset_exchange_suffix_map()
+    clear_frame_cache()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
 import sys
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -9,6 +12,7 @@ from fastapi.testclient import TestClient
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 import main as api_main  # noqa: E402
+import services.scoring_service as scoring_service  # noqa: E402
 
 
 def _allow_strategy_guard(
@@ -330,6 +334,10 @@ def test_health_contains_llm_status(monkeypatch) -> None:
     assert payload["llm"]["effectiveModel"] == "GLM-4.7"
     assert isinstance(payload["warnings"], list)
 
+    monkeypatch.setattr(api_main, "DAILY_STORE_UNAVAILABLE_REASON", "pyarrow is not installed")
+    warnings = client.get("/api/v1/health").json()["warnings"]
+    assert any("pyarrow is not installed" in warning for warning in warnings)
+
 
 def test_stock_candidates_rejects_future_date() -> None:
     client = TestClient(api_main.app)
@@ -763,3 +771,267 @@ def test_telemetry_web_vitals_rejects_unknown_metric() -> None:
         },
     )
     assert res.status_code == 400
+
+
+def test_prefetch_warm_populates_default_candidate_cache(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake_fetch(date_str=None, weights=None, **kwargs):
+        calls.append(str(date_str))
+        return _mock_candidates(weights)
+
+    def fake_guard(requested_strategy, requested_date_str, now_kst_value=None):
+        return {
+            "errorCode": None,
+            "strategy": requested_strategy or "close",
+            "sessionDate": "2026-02-20",
+            "signalDate": "2026-02-20",
+            "strategyReason": "test",
+        }
+
+    api_main._CACHE.clear()
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "validate_strategy_request", fake_guard)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    monkeypatch.setattr(api_main, "_MIN_CANDIDATE_CACHE_COUNT", 2)
+
+    window_open = datetime(2026, 2, 20, 15, 0, tzinfo=ZoneInfo("Asia/Seoul"))
+    assert api_main._warm_default_candidates("close", window_open) is True
+
+    client = TestClient(api_main.app)
+    res = client.get("/api/v1/stock-candidates?date=2026-02-20&strategy=close&include_validation=false")
+    assert res.status_code == 200
+    assert [item["code"] for item in res.json()] == ["005930", "000660"]
+    assert calls == ["2026-02-20"]
+    api_main._CACHE.clear()
+
+
+def test_intraday_prefetch_warm_before_open_is_not_cached(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake_fetch(date_str=None, weights=None, **kwargs):
+        calls.append(str(kwargs.get("strategy")))
+        return _mock_candidates(weights)
+
+    def fake_guard(requested_strategy, requested_date_str, now_kst_value=None):
+        return {
+            "errorCode": None,
+            "strategy": requested_strategy,
+            "sessionDate": "2026-02-20",
+            "signalDate": "2026-02-19",
+            "strategyReason": "test",
+        }
+
+    api_main._CACHE.clear()
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "validate_strategy_request", fake_guard)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    monkeypatch.setattr(api_main, "_MIN_CANDIDATE_CACHE_COUNT", 2)
+
+    window_open = datetime(2026, 2, 20, 9, 5, tzinfo=ZoneInfo("Asia/Seoul"))
+    monkeypatch.setattr(api_main, "now_in_kst", lambda: window_open - timedelta(minutes=5))
+    assert api_main._warm_default_candidates("intraday", window_open) is True
+    assert calls == ["intraday"]
+    assert not any(key.startswith("candidates") for key in api_main._CACHE)
+
+    monkeypatch.setattr(api_main, "now_in_kst", lambda: window_open + timedelta(seconds=30))
+    assert api_main._warm_default_candidates("intraday", window_open) is True
+    assert any(key.startswith("candidates") for key in api_main._CACHE)
+    api_main._CACHE.clear()
+
+
+def test_stock_candidates_exposes_stage_timings(monkeypatch) -> None:
+    api_main._CACHE.clear()
+    captured: dict[str, object] = {}
+
+    def fake_fetch(date_str=None, weights=None, **kwargs):
+        captured["include_diagnostics"] = kwargs.get("include_diagnostics")
+        captured["deadline"] = kwargs.get("deadline", "missing")
+        payload = _mock_candidates(weights)
+        payload["diagnostics"] = {
+            "stages": [
+                {"name": "fetch", "elapsedMs": 12.5, "count": 2},
+                {"name": "rank", "elapsedMs": 0.4, "count": 2},
+            ],
+            "failures": [],
+            "rawFactorCache": "miss",
+            "totalMs": 13.2,
+        }
+        return payload
+
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    monkeypatch.setattr(api_main, "_MIN_CANDIDATE_CACHE_COUNT", 2)
+    _allow_strategy_guard(monkeypatch)
+    client = TestClient(api_main.app)
+
+    res = client.get("/api/v1/stock-candidates?date=2026-02-20&strategy=close&include_validation=false")
+    assert res.status_code == 200
+    assert captured["include_diagnostics"] is True
+    # Without deadline_ms the full ranking is scored, with no deadline.
+    assert captured["deadline"] is None
+    assert res.headers["server-timing"] == (
+        'fetch;dur=12.5;desc="2", rank;dur=0.4;desc="2", raw-factors;desc=miss, total;dur=13.2'
+    )
+
+    cached = client.get("/api/v1/stock-candidates?date=2026-02-20&strategy=close&include_validation=false")
+    assert cached.headers["server-timing"] == "cache;desc=hit"
+    api_main._CACHE.clear()
+
+
+def test_stock_candidates_joint_scoring_answers_requested_tab_first(monkeypatch) -> None:
+    api_main._CACHE.clear()
+    calls: list[dict[str, object]] = []
+    siblings_done = threading.Event()
+
+    def fake_fetch(date_str=None, weights=None, **kwargs):
+        calls.append({"kind": "requested", **kwargs})
+        return _mock_candidates(weights)
+
+    def fake_fetch_set(date_str=None, weights=None, **kwargs):
+        calls.append({"kind": "siblings", "date_str": date_str, **kwargs})
+        siblings_done.set()
+        return {}
+
+    monkeypatch.setattr(api_main, "_JOINT_STRATEGY_SCORING", True)
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "fetch_and_score_strategy_set", fake_fetch_set)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    monkeypatch.setattr(api_main, "_MIN_CANDIDATE_CACHE_COUNT", 2)
+    _allow_strategy_guard(monkeypatch)
+    client = TestClient(api_main.app)
+
+    res = client.get(
+        "/api/v1/stock-candidates?date=2026-02-20&strategy=close&include_validation=false&deadline_ms=5000"
+    )
+    assert res.status_code == 200
+    assert {item["code"] for item in res.json()} == {"005930", "000660"}
+    assert siblings_done.wait(timeout=2.0)
+    requested, siblings = calls
+    assert requested["kind"] == "requested" and requested["deadline"] is not None
+    # Siblings run in the background without the request's deadline.
+    assert siblings["kind"] == "siblings" and "deadline" not in siblings
+    assert siblings["session_date_str"] == "2026-02-20"
+    assert ("close", None) not in siblings["variants"]
+    assert len(siblings["variants"]) == len(scoring_service.STRATEGY_VARIANTS) - 1
+    api_main._CACHE.clear()
+
+
+def test_stock_candidates_compact_sparkline_encoding(monkeypatch) -> None:
+    api_main._CACHE.clear()
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", lambda date_str=None, weights=None, **kwargs: _mock_candidates(weights))
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    _allow_strategy_guard(monkeypatch)
+    client = TestClient(api_main.app)
+
+    res = client.get("/api/v1/stock-candidates?date=2026-02-20&include_validation=false&sparkline_encoding=u8")
+    assert res.status_code == 200
+    assert [item["sparkline60"] for item in res.json()] == [[26, 77, 102], [128, 102, 77]]
+
+    res = client.get("/api/v1/stock-candidates?date=2026-02-20&include_validation=false&sparkline_encoding=b64")
+    assert res.json()[0]["sparkline60"] == "Gk1m"
+
+    res = client.get("/api/v1/stock-candidates?date=2026-02-20&include_validation=false&sparkline_encoding=png")
+    assert res.status_code == 400
+    api_main._CACHE.clear()
+
+
+def test_stock_candidates_stream_emits_candidates_then_final_frame(monkeypatch) -> None:
+    api_main._CACHE.clear()
+
+    def fake_fetch(date_str=None, weights=None, on_candidate=None, **kwargs):
+        payload = _mock_candidates(weights)
+        for item in payload["candidates"]:
+            on_candidate({"code": item["code"], "score": item["score"]})
+        return payload
+
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    _allow_strategy_guard(monkeypatch)
+    client = TestClient(api_main.app)
+
+    res = client.get("/api/v1/stock-candidates/stream?date=2026-02-20&strategy=close")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in res.text.splitlines() if line]
+    assert [event["type"] for event in events] == ["candidate", "candidate", "final"]
+    assert [event["candidate"]["code"] for event in events[:2]] == ["005930", "000660"]
+    assert [item["rank"] for item in events[-1]["candidates"]] == [1, 2]
+    assert events[-1]["candidates"][0]["strategy"] == "close"
+
+    sse = client.get("/api/v1/stock-candidates/stream?date=2026-02-20&strategy=close&format=sse")
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: candidate\ndata: ")
+    assert "event: final\n" in sse.text
+    api_main._CACHE.clear()
+
+
+def test_stock_candidates_stream_honours_deadline_and_force_refresh(monkeypatch) -> None:
+    api_main._CACHE.clear()
+    calls: list[dict] = []
+
+    def fake_fetch(date_str=None, weights=None, on_candidate=None, **kwargs):
+        calls.append(kwargs)
+        payload = _mock_candidates(weights)
+        payload["partial"] = len(calls) == 1
+        return payload
+
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    monkeypatch.setattr(api_main, "_MIN_CANDIDATE_CACHE_COUNT", 2)
+    _allow_strategy_guard(monkeypatch)
+    client = TestClient(api_main.app)
+
+    started = time.monotonic()
+    res = client.get("/api/v1/stock-candidates/stream?date=2026-02-20&strategy=close&deadline_ms=5000")
+    final = json.loads(res.text.splitlines()[-1])
+    assert final["partial"] is True
+    assert started < calls[0]["deadline"] <= time.monotonic() + 5
+    assert calls[0]["refresh"] is False
+
+    # A partial list is not cached, so the next stream scores again and caches the full result.
+    client.get("/api/v1/stock-candidates/stream?date=2026-02-20&strategy=close")
+    assert len(calls) == 2
+    client.get("/api/v1/stock-candidates/stream?date=2026-02-20&strategy=close")
+    assert len(calls) == 2
+    client.get("/api/v1/stock-candidates/stream?date=2026-02-20&strategy=close&force_refresh=true")
+    assert len(calls) == 3
+    assert calls[-1]["refresh"] is True
+    api_main._CACHE.clear()
+
+
+def test_stock_candidates_partial_result_is_not_cached_and_refreshes_in_background(monkeypatch) -> None:
+    api_main._CACHE.clear()
+    calls: list[object] = []
+
+    def fake_fetch(date_str=None, weights=None, deadline=None, **kwargs):
+        calls.append(deadline)
+        payload = _mock_candidates(weights)
+        if deadline is not None:
+            payload["partial"] = True
+            payload["skippedSymbols"] = ["035420.KS", "051910.KS"]
+        return payload
+
+    monkeypatch.setattr(api_main, "fetch_and_score_stocks", fake_fetch)
+    monkeypatch.setattr(api_main, "_get_watchlist_tickers", lambda user_key: [])
+    monkeypatch.setattr(api_main, "_MIN_CANDIDATE_CACHE_COUNT", 2)
+    _allow_strategy_guard(monkeypatch)
+    client = TestClient(api_main.app)
+
+    res = client.get("/api/v1/stock-candidates?date=2026-02-20&strategy=close&include_validation=false&deadline_ms=5000")
+    assert res.status_code == 200
+    assert res.headers["x-candidates-partial"] == "true"
+    assert res.headers["x-candidates-skipped"] == "035420.KS,051910.KS"
+    assert res.headers["x-candidates-skipped-count"] == "2"
+    assert calls[0] is not None
+
+    for _ in range(200):
+        if not api_main._REFRESHING_CACHE_KEYS and len(calls) >= 2:
+            break
+        time.sleep(0.01)
+    assert calls[1:] == [None]
+
+    cached = client.get("/api/v1/stock-candidates?date=2026-02-20&strategy=close&include_validation=false")
+    assert cached.headers["server-timing"] == "cache;desc=hit"
+    assert "x-candidates-partial" not in cached.headers
+    api_main._CACHE.clear()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import copy
+
+import pandas as pd
+import pytest
+
+import services.daily_store_service as daily_store_service
+import services.exchange_suffix_service as exchange_suffix_service
+import services.scoring_service as scoring_service
+from scripts.benchmark_scoring import (
+    build_synthetic_market,
+    compare_reports,
+    generate_daily_frame,
+    run_benchmark,
+    synthetic_market_patches,
+)
+
+
+def test_synthetic_market_is_deterministic_and_bounded() -> None:
+    first = generate_daily_frame("900001", "2026-02-20", seed=7)
+    pd.testing.assert_frame_equal(first, generate_daily_frame("900001", "2026-02-20", seed=7))
+    assert not first.equals(generate_daily_frame("900001", "2026-02-20", seed=8))
+    assert (first["High"] >= first[["Open", "Close"]].max(axis=1)).all()
+    assert (first["Low"] <= first[["Open", "Close"]].min(axis=1)).all()
+    assert (first["Volume"] > 0).all()
+
+    with pytest.raises(ValueError):
+        build_synthetic_market(10, "2026-02-20", seed=7)
+
+
+def test_benchmark_reports_stages_and_flags_regressions() -> None:
+    original_download = scoring_service._download_frame
+    report = run_benchmark(symbol_count=50, repeat=1, measure_memory=False)
+
+    assert scoring_service._download_frame is original_download
+    assert list(report["strategies"]) == ["premarket", "intraday", "close"]
+    for stats in report["strategies"].values():
+        assert stats["candidates"] > 0
+        assert {"fetch", "features", "overlay", "payload", "rank"} <= set(stats["stages"])
+        assert stats["symbolsPerSec"] > 0
+
+    assert compare_reports(report, report) == []
+    slower = copy.deepcopy(report)
+    slower["strategies"]["close"]["totalMs"] = report["strategies"]["close"]["totalMs"] * 2 + 1
+    slower["strategies"]["close"]["checksum"] = "changed"
+    regressions = compare_reports(report, slower)
+    assert any(line.startswith("close: total") for line in regressions)
+    assert any("ranked output changed" in line for line in regressions)
+
+
+def test_synthetic_market_keeps_learned_state_out_of_the_data_dir() -> None:
+    map_path = exchange_suffix_service.EXCHANGE_SUFFIX_MAP_PATH
+    store_dir = daily_store_service.DAILY_STORE_DIR
+    market = build_synthetic_market(50, "2026-02-20", seed=7)
+
+    with synthetic_market_patches(market):
+        scratch_map = exchange_suffix_service.EXCHANGE_SUFFIX_MAP_PATH
+        assert scratch_map != map_path and daily_store_service.DAILY_STORE_DIR != store_dir
+        exchange_suffix_service.record_symbol_result("900000.KS", has_data=True)
+        assert scratch_map.exists()
+
+    assert exchange_suffix_service.EXCHANGE_SUFFIX_MAP_PATH == map_path
+    assert not map_path.exists() and not scratch_map.exists()
+    assert exchange_suffix_service.resolved_suffix("900000") is None
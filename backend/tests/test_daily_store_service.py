@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.daily_store_service as daily_store_service  # noqa: E402
+
+pytest.importorskip("pyarrow")
+
+
+def _bars(start: str, periods: int, base: float = 100.0) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq="B")
+    return pd.DataFrame(
+        {
+            "Open": [base + i for i in range(periods)],
+            "High": [base + i + 1 for i in range(periods)],
+            "Low": [base + i - 1 for i in range(periods)],
+            "Close": [base + i for i in range(periods)],
+            "Volume": [1_000 + i for i in range(periods)],
+        },
+        index=idx,
+    )
+
+
+def _use_tmp_store(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(daily_store_service, "DAILY_STORE_MODE", "parquet")
+    monkeypatch.setattr(daily_store_service, "DAILY_STORE_DIR", tmp_path)
+
+
+def test_daily_store_fetches_only_missing_tail(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    history = _bars("2026-01-05", 10)
+    calls: list[tuple[datetime, datetime]] = []
+
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        calls.append((start_date, end_date))
+        frame = pd.concat([history, _bars("2026-01-19", 3, base=200.0)])
+        idx = frame.index
+        return frame[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+    first = daily_store_service.fetch_daily_with_store(
+        "005930.KS",
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 17),
+        fetcher=fetcher,
+        now=datetime(2026, 1, 17, 12, 0),
+    )
+    assert len(first) == 10
+    assert calls == [(datetime(2026, 1, 5), datetime(2026, 1, 17))]
+
+    second = daily_store_service.fetch_daily_with_store(
+        "005930.KS",
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 22),
+        fetcher=fetcher,
+        now=datetime(2026, 1, 22, 12, 0),
+    )
+    # The tail fetch starts at the last stored bar so corrections to it are merged.
+    assert calls[1] == (datetime(2026, 1, 16), datetime(2026, 1, 22))
+    assert len(second) == 13
+    assert float(second["Close"].iloc[-1]) == 202.0
+
+
+def test_daily_store_serves_settled_history_without_fetching(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    history = _bars("2026-01-05", 10)
+    calls: list[tuple[datetime, datetime]] = []
+
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        calls.append((start_date, end_date))
+        return history
+
+    daily_store_service.fetch_daily_with_store(
+        "^KS11",
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 17),
+        fetcher=fetcher,
+        now=datetime(2026, 1, 20, 12, 0),
+    )
+    narrower = daily_store_service.fetch_daily_with_store(
+        "^KS11",
+        datetime(2026, 1, 7),
+        datetime(2026, 1, 14),
+        fetcher=fetcher,
+        now=datetime(2026, 1, 20, 12, 0),
+    )
+    assert len(calls) == 1
+    assert narrower.index.min() == pd.Timestamp("2026-01-07")
+    assert narrower.index.max() == pd.Timestamp("2026-01-13")
+
+
+def test_daily_store_merges_correction_for_last_bar(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    partial = _bars("2026-01-05", 5)
+    corrected = partial.copy()
+    corrected.loc[corrected.index[-1], "Close"] = 999.0
+    responses = [partial, corrected.iloc[-1:]]
+
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        return responses.pop(0)
+
+    daily_store_service.fetch_daily_with_store(
+        "000660.KS",
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 10),
+        fetcher=fetcher,
+        now=datetime(2026, 1, 9, 10, 0),
+    )
+    refreshed = daily_store_service.fetch_daily_with_store(
+        "000660.KS",
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 10),
+        fetcher=fetcher,
+        now=datetime(2026, 1, 9, 16, 0),
+    )
+    assert len(refreshed) == 5
+    assert float(refreshed["Close"].iloc[-1]) == 999.0
+
+
+def test_daily_store_batches_symbols_sharing_a_gap(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    calls: list[list[str]] = []
+
+    def batch_fetcher(symbols: list[str], start_date: datetime, end_date: datetime) -> dict[str, pd.DataFrame]:
+        calls.append(list(symbols))
+        return {symbol: _bars("2026-01-05", 5) for symbol in symbols if symbol != "MISSING.KS"}
+
+    frames = daily_store_service.fetch_daily_many_with_store(
+        ["005930.KS", "000660.KS", "MISSING.KS"],
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 10),
+        batch_fetcher=batch_fetcher,
+        now=datetime(2026, 1, 12, 12, 0),
+    )
+    assert calls == [["005930.KS", "000660.KS", "MISSING.KS"]]
+    assert set(frames) == {"005930.KS", "000660.KS"}
+
+    again = daily_store_service.fetch_daily_many_with_store(
+        ["005930.KS", "000660.KS"],
+        datetime(2026, 1, 5),
+        datetime(2026, 1, 10),
+        batch_fetcher=batch_fetcher,
+        now=datetime(2026, 1, 12, 12, 0),
+    )
+    assert len(calls) == 1
+    assert len(again["005930.KS"]) == 5
+
+
+def test_failed_head_fetch_is_asked_again_even_when_the_tail_succeeds(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    history = _bars("2026-01-05", 13)
+    calls: list[tuple[datetime, datetime]] = []
+    failing = {"head": True}
+
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        calls.append((start_date, end_date))
+        if failing["head"] and start_date < datetime(2026, 1, 12):
+            raise RuntimeError("rate limited")
+        idx = history.index
+        return history[(idx >= pd.Timestamp(start_date)) & (idx < pd.Timestamp(end_date))]
+
+    daily_store_service.fetch_daily_with_store(
+        "005930.KS", datetime(2026, 1, 12), datetime(2026, 1, 17), fetcher=fetcher, now=datetime(2026, 1, 17, 12, 0)
+    )
+    widened = daily_store_service.fetch_daily_with_store(
+        "005930.KS", datetime(2026, 1, 5), datetime(2026, 1, 22), fetcher=fetcher, now=datetime(2026, 1, 22, 12, 0)
+    )
+    # The head fetch failed and the tail came back: only the tail is stored, coverage stays where it was.
+    assert calls[1:] == [(datetime(2026, 1, 5), datetime(2026, 1, 12)), (datetime(2026, 1, 16), datetime(2026, 1, 22))]
+    assert widened.index.min() == pd.Timestamp("2026-01-12")
+    assert daily_store_service._read_meta("005930.KS")["coveredFrom"] == "2026-01-12"
+
+    failing["head"] = False
+    healed = daily_store_service.fetch_daily_with_store(
+        "005930.KS", datetime(2026, 1, 5), datetime(2026, 1, 22), fetcher=fetcher, now=datetime(2026, 1, 22, 12, 30)
+    )
+    assert calls[3:] == [(datetime(2026, 1, 5), datetime(2026, 1, 12))]
+    assert len(healed) == 13
+    assert daily_store_service._read_meta("005930.KS")["coveredFrom"] == "2026-01-05"
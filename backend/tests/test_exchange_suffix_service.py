@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.exchange_suffix_service as exchange_suffix_service  # noqa: E402
+import services.scoring_service as scoring_service  # noqa: E402
+
+
+def _use_tmp_map(monkeypatch, tmp_path: Path) -> Path:
+    map_path = tmp_path / "exchange_suffix_map.json"
+    monkeypatch.setattr(exchange_suffix_service, "EXCHANGE_SUFFIX_MAP_PATH", map_path)
+    exchange_suffix_service.reset_exchange_suffix_map()
+    return map_path
+
+
+def test_learned_suffix_is_persisted_and_invalidated_when_data_stops(monkeypatch, tmp_path) -> None:
+    map_path = _use_tmp_map(monkeypatch, tmp_path)
+    assert exchange_suffix_service.candidate_symbols("247540") == ["247540.KS", "247540.KQ"]
+
+    exchange_suffix_service.record_symbol_result("247540.KQ", has_data=True)
+    exchange_suffix_service.reset_exchange_suffix_map()
+    assert map_path.exists()
+    assert exchange_suffix_service.candidate_symbols("247540") == ["247540.KQ", "247540.KS"]
+
+    exchange_suffix_service.record_symbol_result("247540.KS", has_data=False)
+    assert exchange_suffix_service.resolved_suffix("247540") == ".KQ"
+    exchange_suffix_service.record_symbol_result("247540.KQ", has_data=False)
+    assert exchange_suffix_service.resolved_suffix("247540") is None
+    exchange_suffix_service.reset_exchange_suffix_map()
+
+
+def test_price_series_lookup_skips_wrong_exchange_once_learned(monkeypatch, tmp_path) -> None:
+    _use_tmp_map(monkeypatch, tmp_path)
+    calls: list[str] = []
+    frame = pd.DataFrame({"Close": [10.0, 11.0]}, index=pd.date_range("2026-02-18", periods=2, freq="B"))
+
+    def _fake_download(ticker_symbol, start_date, end_date):
+        calls.append(ticker_symbol)
+        return frame if ticker_symbol.endswith(".KQ") else pd.DataFrame()
+
+    monkeypatch.setattr(scoring_service, "_download_frame", _fake_download)
+
+    scoring_service.get_price_series_for_ticker("247540", "2026-02-18")
+    scoring_service.get_price_series_for_ticker("247540", "2026-02-18")
+
+    assert calls == ["247540.KS", "247540.KQ", "247540.KQ"]
+    exchange_suffix_service.reset_exchange_suffix_map()
+
+
+def test_narrow_empty_window_keeps_learned_suffix_until_wide_window_confirms(monkeypatch, tmp_path) -> None:
+    _use_tmp_map(monkeypatch, tmp_path)
+    exchange_suffix_service.record_symbol_result("247540.KQ", has_data=True)
+    listed = {"active": True}
+    frame = pd.DataFrame({"Close": [10.0]}, index=pd.date_range("2026-02-10", periods=1))
+
+    def _fake_download(ticker_symbol, start_date, end_date):
+        # The narrow holiday window is empty; the wide confirmation window has bars while listed.
+        wide = (end_date - start_date).days >= scoring_service.SUFFIX_MISS_CONFIRM_DAYS
+        return frame if wide and listed["active"] else pd.DataFrame()
+
+    monkeypatch.setattr(scoring_service, "_download_frame", _fake_download)
+
+    scoring_service.get_trade_day_ohlc_for_ticker("247540", "2026-02-17")
+    assert exchange_suffix_service.resolved_suffix("247540") == ".KQ"
+
+    listed["active"] = False
+    scoring_service.get_price_series_for_ticker("247540", "2026-02-17")
+    assert exchange_suffix_service.resolved_suffix("247540") is None
+
+
+def test_a_batch_of_learned_codes_writes_the_map_once(monkeypatch, tmp_path) -> None:
+    map_path = _use_tmp_map(monkeypatch, tmp_path)
+    saves: list[int] = []
+    original_save = exchange_suffix_service._save_map
+
+    def _counting_save(mapping):
+        saves.append(len(mapping))
+        original_save(mapping)
+
+    monkeypatch.setattr(exchange_suffix_service, "_save_map", _counting_save)
+    with exchange_suffix_service.batched_suffix_updates():
+        with exchange_suffix_service.batched_suffix_updates():
+            for code in range(100):
+                exchange_suffix_service.record_symbol_result(f"{code:06d}.KQ", has_data=True)
+        assert saves == []
+        assert exchange_suffix_service.resolved_suffix("000042") == ".KQ"
+    assert saves == [100]
+    exchange_suffix_service.reset_exchange_suffix_map()
+    assert exchange_suffix_service.resolved_suffix("000099") == ".KQ"
+    assert map_path.exists()
+    exchange_suffix_service.reset_exchange_suffix_map()
+
+
+def test_news_lookups_do_not_teach_the_exchange(monkeypatch, tmp_path) -> None:
+    import services.news_service as news_service
+
+    _use_tmp_map(monkeypatch, tmp_path)
+    asked: list[str] = []
+
+    class _GenericNewsProvider:
+        def news(self, symbol: str) -> list[dict[str, str]]:
+            # Yahoo answers unknown tickers with generic market headlines.
+            asked.append(symbol)
+            return [{"title": f"Market wrap for {symbol}", "link": f"https://news.example/{symbol}"}]
+
+    monkeypatch.setattr(news_service, "get_market_data_provider", lambda: _GenericNewsProvider())
+    news_service.fetch_stock_news_items("247540", max_items=5)
+    assert asked == ["247540.KS", "247540.KQ"]
+    assert exchange_suffix_service.resolved_suffix("247540") is None
+
+    # An exchange learned from price data narrows news to that listing.
+    exchange_suffix_service.record_symbol_result("247540.KQ", has_data=True)
+    asked.clear()
+    news_service.fetch_stock_news_items("247540", max_items=5)
+    assert asked == ["247540.KQ"]
+    exchange_suffix_service.reset_exchange_suffix_map()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.fetch_executor_service as fetch_executor_service  # noqa: E402
+
+
+def test_map_bounded_keeps_input_order_and_isolates_failures(monkeypatch) -> None:
+    monkeypatch.setattr(fetch_executor_service, "FETCH_RATE_LIMIT_PER_SEC", 0.0)
+
+    def _work(value: int) -> int:
+        if value == 3:
+            raise RuntimeError("vendor error")
+        time.sleep(0.01 * (5 - value))
+        return value * 10
+
+    assert fetch_executor_service.map_bounded(_work, [1, 2, 3, 4], default=-1) == [10, 20, -1, 40]
+
+
+def test_vendor_calls_are_capped_per_vendor(monkeypatch) -> None:
+    monkeypatch.setattr(fetch_executor_service, "FETCH_RATE_LIMIT_PER_SEC", 0.0)
+    monkeypatch.setattr(fetch_executor_service, "_VENDOR_SEMAPHORES", {"capped": threading.BoundedSemaphore(2)})
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def _vendor_call(value: int) -> int:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return value
+
+    results = fetch_executor_service.map_bounded(
+        lambda value: fetch_executor_service.run_rate_limited(lambda: _vendor_call(value), vendor="capped"),
+        list(range(8)),
+    )
+
+    assert results == list(range(8))
+    assert state["peak"] <= 2
+
+
+def test_rate_limit_applies_to_vendor_calls_not_pool_tasks(monkeypatch) -> None:
+    monkeypatch.setattr(fetch_executor_service, "FETCH_RATE_LIMIT_PER_SEC", 50.0)
+    monkeypatch.setattr(fetch_executor_service, "_next_slot_at", 0.0)
+
+    # Cache hits fanned out through the pool do not wait for rate slots.
+    started = time.monotonic()
+    fetch_executor_service.map_bounded(lambda value: value, list(range(30)))
+    assert time.monotonic() - started < 0.3
+
+    started = time.monotonic()
+    for value in range(6):
+        fetch_executor_service.run_rate_limited(lambda: value, vendor="rate-test")
+    assert time.monotonic() - started >= 0.09
+
+
+def test_single_flight_coalesces_concurrent_callers() -> None:
+    release = threading.Event()
+    calls: list[int] = []
+
+    def _fetch() -> str:
+        calls.append(1)
+        release.wait(timeout=2)
+        return "frame"
+
+    results: list[str] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(fetch_executor_service.single_flight(("1d", "005930.KS"), _fetch)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while not fetch_executor_service._INFLIGHT:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert results == ["frame"] * 5
+    assert len(calls) == 1
+    assert fetch_executor_service._INFLIGHT == {}
+
+
+def test_deadline_returns_defaults_for_unfinished_work(monkeypatch) -> None:
+    monkeypatch.setattr(fetch_executor_service, "FETCH_RATE_LIMIT_PER_SEC", 0.0)
+    release = threading.Event()
+
+    def _fetch(value: int) -> int:
+        if value == 2:
+            release.wait(timeout=2)
+        return value * 10
+
+    started = time.monotonic()
+    results = fetch_executor_service.map_bounded(_fetch, [1, 2, 3], default=-1, deadline=started + 0.2)
+    assert results == [10, -1, 30]
+    assert time.monotonic() - started < 1.0
+
+    slow = fetch_executor_service.call_with_deadline(lambda: release.wait(timeout=2) and "late", time.monotonic() + 0.05, "default")
+    assert slow == "default"
+    assert fetch_executor_service.call_with_deadline(lambda: "fast", time.monotonic() + 1.0, "default") == "fast"
+    assert fetch_executor_service.call_with_deadline(lambda: "fast", time.monotonic() - 1.0, "default") == "default"
+    release.set()
+
+
+def test_single_flight_many_joins_in_flight_keys_and_batches_the_rest() -> None:
+    release = threading.Event()
+    batches: list[list[str]] = []
+
+    def _single() -> str:
+        release.wait(timeout=2)
+        return "single-a"
+
+    single = threading.Thread(target=lambda: fetch_executor_service.single_flight("a", _single))
+    single.start()
+    while "a" not in fetch_executor_service._INFLIGHT:
+        time.sleep(0.001)
+
+    def _batch(keys: list[str]) -> dict[str, str]:
+        batches.append(list(keys))
+        release.set()
+        return {key: f"batch-{key}" for key in keys if key != "c"}
+
+    results = fetch_executor_service.single_flight_many(["a", "b", "c", "b"], _batch)
+    single.join(timeout=2)
+
+    assert batches == [["b", "c"]]
+    assert results == {"a": "single-a", "b": "batch-b"}
+    assert fetch_executor_service._INFLIGHT == {}
+
+
+def test_fan_out_inside_a_deadline_call_does_not_queue_behind_it(monkeypatch) -> None:
+    monkeypatch.setattr(fetch_executor_service, "FETCH_RATE_LIMIT_PER_SEC", 0.0)
+    monkeypatch.setattr(fetch_executor_service, "FETCH_MAX_WORKERS", 2)
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(fetch_executor_service, "_get_executor", lambda: executor)
+    try:
+        # With one pool thread, a nested map_bounded that queued on the pool would wait on itself.
+        result = fetch_executor_service.call_with_deadline(
+            lambda: fetch_executor_service.map_bounded(lambda value: value * 2, [1, 2, 3]),
+            deadline=time.monotonic() + 2.0,
+            default=None,
+        )
+        assert result == [2, 4, 6]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.frame_cache_service as frame_cache_service  # noqa: E402
+
+
+def _bars(start: str, periods: int) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq="B")
+    return pd.DataFrame({"Close": [100.0 + i for i in range(periods)]}, index=idx)
+
+
+def _fresh_cache(monkeypatch, now: list[float]) -> None:
+    frame_cache_service.clear_frame_cache()
+    monkeypatch.setattr(frame_cache_service, "_clock", lambda: now[0])
+    monkeypatch.setattr(frame_cache_service, "_today_kst", lambda: date(2026, 2, 20))
+    monkeypatch.setattr(frame_cache_service, "FRAME_CACHE_MAX_MB", 16)
+
+
+def test_frame_cache_answers_narrower_range_from_wider_frame(monkeypatch) -> None:
+    _fresh_cache(monkeypatch, [0.0])
+    frame_cache_service.put_cached_frame("^KS11", datetime(2025, 8, 24), datetime(2026, 2, 20), _bars("2025-08-25", 129))
+
+    narrow = frame_cache_service.get_cached_frame("^KS11", datetime(2026, 2, 12), datetime(2026, 2, 18))
+    assert narrow is not None
+    assert narrow.index.min() == pd.Timestamp("2026-02-12")
+    assert narrow.index.max() == pd.Timestamp("2026-02-17")
+    assert frame_cache_service.get_cached_frame("^KS11", datetime(2026, 2, 12), datetime(2026, 2, 21)) is None
+    assert frame_cache_service.get_cached_frame("^KQ11", datetime(2026, 2, 12), datetime(2026, 2, 18)) is None
+
+
+def test_frame_cache_uses_short_ttl_for_ranges_with_todays_bar(monkeypatch) -> None:
+    now = [0.0]
+    _fresh_cache(monkeypatch, now)
+    monkeypatch.setattr(frame_cache_service, "FRAME_CACHE_LIVE_TTL_SEC", 60)
+    monkeypatch.setattr(frame_cache_service, "FRAME_CACHE_TTL_SEC", 3600)
+    frame_cache_service.put_cached_frame("005930.KS", datetime(2026, 2, 2), datetime(2026, 2, 21), _bars("2026-02-02", 15))
+    frame_cache_service.put_cached_frame("000660.KS", datetime(2026, 2, 2), datetime(2026, 2, 20), _bars("2026-02-02", 14))
+
+    now[0] = 61.0
+    assert frame_cache_service.get_cached_frame("005930.KS", datetime(2026, 2, 2), datetime(2026, 2, 21)) is None
+    assert frame_cache_service.get_cached_frame("000660.KS", datetime(2026, 2, 2), datetime(2026, 2, 20)) is not None
+
+
+def test_frame_cache_evicts_least_recently_used_over_budget(monkeypatch) -> None:
+    _fresh_cache(monkeypatch, [0.0])
+    frame = _bars("2026-01-05", 20)
+    nbytes = int(frame.memory_usage(index=True, deep=False).sum())
+    monkeypatch.setattr(frame_cache_service, "FRAME_CACHE_MAX_MB", 1)
+    monkeypatch.setattr(frame_cache_service, "_clip", lambda f, s, e: f)
+    capacity = (1024 * 1024) // nbytes
+
+    for i in range(capacity):
+        frame_cache_service.put_cached_frame(f"S{i}", datetime(2026, 1, 5), datetime(2026, 2, 1), frame)
+    assert frame_cache_service.get_cached_frame("S0", datetime(2026, 1, 5), datetime(2026, 2, 1)) is not None
+    frame_cache_service.put_cached_frame("NEW", datetime(2026, 1, 5), datetime(2026, 2, 1), frame)
+
+    assert frame_cache_service.get_cached_frame("S0", datetime(2026, 1, 5), datetime(2026, 2, 1)) is not None
+    assert frame_cache_service.get_cached_frame("S1", datetime(2026, 1, 5), datetime(2026, 2, 1)) is None
+    assert frame_cache_service.get_frame_cache_stats()["bytes"] <= 1024 * 1024
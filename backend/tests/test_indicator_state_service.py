@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.indicator_state_service as indicator_state_service  # noqa: E402
+import services.scoring_service as scoring_service  # noqa: E402
+
+
+def _frame(length: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2025-08-01", periods=length, freq="B")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, length)))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.02, length)),
+            "Low": close * (1 - rng.uniform(0, 0.02, length)),
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, length).astype(float),
+        },
+        index=idx,
+    )
+
+
+def _expected(frame: pd.DataFrame) -> dict[str, float]:
+    values = scoring_service._indicator_values(frame["Close"], frame["Volume"])
+    values["atr14"] = float(scoring_service._atr(frame["High"], frame["Low"], frame["Close"], length=14).iloc[-1])
+    values["high60"] = float(frame["High"].rolling(60, min_periods=1).max().iloc[-1])
+    values["low10"] = float(frame["Low"].rolling(10, min_periods=1).min().iloc[-1])
+    return values
+
+
+def test_incremental_state_matches_full_recompute_as_bars_arrive(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(indicator_state_service, "INDICATOR_STATE_MODE", "json")
+    monkeypatch.setattr(indicator_state_service, "INDICATOR_STATE_DIR", tmp_path)
+    indicator_state_service.clear_indicator_states()
+    full = _frame(130)
+    applied: list[str] = []
+    original_apply = indicator_state_service.apply_bar
+
+    def _counting_apply(state, bar_date, *values):
+        applied.append(bar_date)
+        original_apply(state, bar_date, *values)
+
+    monkeypatch.setattr(indicator_state_service, "apply_bar", _counting_apply)
+    for length in (120, 121, 121, 130):
+        applied.clear()
+        frame = full.iloc[:length]
+        got = indicator_state_service.incremental_indicators("005930.KS", frame, window_start=frame.index[0])
+        for key, value in _expected(frame).items():
+            assert got[key] == pytest.approx(value, rel=1e-9, nan_ok=True), (length, key)
+        if length == 121:
+            # Warm path: one committed bar at most plus the live bar.
+            assert len(applied) <= 2
+
+    indicator_state_service.clear_indicator_states()
+    reloaded = indicator_state_service._load_state("005930.KS")
+    assert reloaded is not None
+    assert reloaded["dates"][-1] == full.index[128].strftime("%Y-%m-%d")
+    indicator_state_service.clear_indicator_states()
+
+
+def test_revised_last_bar_triggers_rebuild(monkeypatch) -> None:
+    monkeypatch.setattr(indicator_state_service, "INDICATOR_STATE_MODE", "memory")
+    indicator_state_service.clear_indicator_states()
+    frame = _frame(100)
+    indicator_state_service.incremental_indicators("000660.KS", frame)
+
+    revised = _frame(101)
+    revised.iloc[98, revised.columns.get_loc("Close")] *= 1.05
+    got = indicator_state_service.incremental_indicators("000660.KS", revised, window_start=revised.index[0])
+
+    assert got["macd"] == pytest.approx(_expected(revised)["macd"], rel=1e-12)
+    indicator_state_service.clear_indicator_states()
+
+
+def test_universe_indicators_use_the_panel_until_states_are_seeded(monkeypatch) -> None:
+    monkeypatch.setattr(indicator_state_service, "INDICATOR_STATE_MODE", "memory")
+    monkeypatch.setattr(scoring_service, "INDICATOR_STATE_MODE", "memory")
+    indicator_state_service.clear_indicator_states()
+    full = {f"S{seed}": _frame(131, seed=seed) for seed in range(4)}
+    panel_calls: list[list[str]] = []
+    original_panel = scoring_service._compute_indicator_panel
+
+    def _counting_panel(frames):
+        panel_calls.append(sorted(frames))
+        return original_panel(frames)
+
+    monkeypatch.setattr(scoring_service, "_compute_indicator_panel", _counting_panel)
+    first = {symbol: frame.iloc[:130] for symbol, frame in full.items()}
+    window_start = first["S0"].index[0]
+    cold = scoring_service._compute_universe_indicators(first, window_start=window_start)
+    assert panel_calls == [sorted(full)]
+    assert cold == original_panel(first)
+    for thread in threading.enumerate():
+        if thread.name == "indicator-state-seed":
+            thread.join(timeout=10)
+
+    # Seeded states resume: the next bar is scored without the panel and matches a full recompute.
+    warm = scoring_service._compute_universe_indicators(full, window_start=window_start)
+    assert len(panel_calls) == 1
+    for symbol, frame in full.items():
+        expected = _expected(frame.loc[window_start:])
+        for key in ("sma5", "sma20", "rsi", "mdd", "volatility", "avgVol20", "high60", "low10"):
+            assert warm[symbol][key] == pytest.approx(expected[key], rel=1e-9), (symbol, key)
+    indicator_state_service.clear_indicator_states()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.intraday_session_state_service as session_state_service  # noqa: E402
+import services.scoring_service as scoring_service  # noqa: E402
+
+
+def _bars(seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for day in pd.bdate_range("2026-02-09", "2026-02-20"):
+        idx = pd.date_range(day + pd.Timedelta(hours=9), day + pd.Timedelta(hours=15, minutes=20), freq="5min")
+        close = 100 + rng.normal(0, 0.4, len(idx)).cumsum()
+        frame = pd.DataFrame(
+            {
+                "Open": close - rng.normal(0, 0.2, len(idx)),
+                "Close": close,
+                "Volume": rng.integers(0, 20_000, len(idx)).astype(float),
+            },
+            index=idx,
+        )
+        frame["High"] = frame[["Open", "Close"]].max(axis=1) + 0.3
+        frame["Low"] = frame[["Open", "Close"]].min(axis=1) - 0.3
+        frames.append(frame[rng.random(len(frame)) > 0.1])
+    return pd.concat(frames)
+
+
+@pytest.fixture
+def market(monkeypatch):
+    daily = pd.DataFrame({"Close": np.linspace(90.0, 110.0, 40)}, index=pd.bdate_range("2026-01-01", periods=40))
+    state = {"bars": _bars(), "cutoff": pd.Timestamp("2026-02-20 09:00"), "history_loads": 0}
+
+    def _download_intraday(ticker_symbol, start_date, end_date, interval="5m"):
+        if start_date < datetime(2026, 2, 20):
+            state["history_loads"] += 1
+        bars = state["bars"]
+        bars = bars[bars.index <= state["cutoff"]]
+        return bars[(bars.index >= start_date) & (bars.index < end_date)]
+
+    monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: daily)
+    monkeypatch.setattr(scoring_service, "_download_intraday_frame", _download_intraday)
+    session_state_service.clear_intraday_session_states()
+    yield state
+    session_state_service.clear_intraday_session_states()
+
+
+def _signals(monkeypatch, mode: str) -> dict[str, float] | None:
+    monkeypatch.setattr(scoring_service, "INTRADAY_SESSION_STATE_MODE", mode)
+    return scoring_service._compute_intraday_bars_signals(code="005930", session_date="2026-02-20")
+
+
+def _stored_state() -> dict:
+    (state,) = session_state_service._STATES.values()
+    return state
+
+
+def test_session_state_matches_full_recompute_bar_by_bar(monkeypatch, market) -> None:
+    cutoffs = pd.date_range("2026-02-20 09:10", "2026-02-20 15:30", freq="5min")
+    for cutoff in cutoffs:
+        market["cutoff"] = cutoff
+        expected = _signals(monkeypatch, "off")
+        loads = market["history_loads"]
+        assert _signals(monkeypatch, "memory") == expected
+        if cutoff > cutoffs[0]:
+            # Each update only reads the session partition and applies the new bars.
+            assert market["history_loads"] == loads
+
+    state = _stored_state()
+    assert state["barCount"] == len(market["bars"].loc["2026-02-20"]) - 1
+
+
+def test_json_state_survives_restart_and_rebuilds_on_revision(monkeypatch, market, tmp_path) -> None:
+    monkeypatch.setattr(session_state_service, "INTRADAY_SESSION_STATE_MODE", "json")
+    monkeypatch.setattr(session_state_service, "INTRADAY_SESSION_STATE_DIR", tmp_path)
+    market["cutoff"] = pd.Timestamp("2026-02-20 11:00")
+    _signals(monkeypatch, "json")
+    assert len(list(tmp_path.glob("005930.K?.json"))) == 1
+
+    session_state_service.clear_intraday_session_states()
+    market["cutoff"] = pd.Timestamp("2026-02-20 13:00")
+    loads = market["history_loads"]
+    restored = _signals(monkeypatch, "json")
+    assert market["history_loads"] == loads
+    assert restored == _signals(monkeypatch, "off")
+
+    bars = market["bars"].copy()
+    # The last committed bar (the one before the then-forming 13:00 bar) is revised by the vendor.
+    revised_at = bars.loc["2026-02-20 09:00":"2026-02-20 13:00"].index[-2]
+    bars.loc[revised_at, ["High", "Volume"]] = [bars.loc[revised_at, "High"] + 5.0, 999_999.0]
+    market["bars"] = bars
+    market["cutoff"] = pd.Timestamp("2026-02-20 13:05")
+    expected = _signals(monkeypatch, "off")
+    loads = market["history_loads"]
+    assert _signals(monkeypatch, "json") == expected
+    assert market["history_loads"] == loads + 1
+
+
+def test_historical_session_does_not_rewind_stored_state(monkeypatch, market) -> None:
+    market["cutoff"] = pd.Timestamp("2026-02-20 15:30")
+    _signals(monkeypatch, "memory")
+    stored = _stored_state()
+
+    monkeypatch.setattr(scoring_service, "INTRADAY_SESSION_STATE_MODE", "memory")
+    past = scoring_service._compute_intraday_bars_signals(code="005930", session_date="2026-02-19")
+    monkeypatch.setattr(scoring_service, "INTRADAY_SESSION_STATE_MODE", "off")
+    assert past == scoring_service._compute_intraday_bars_signals(code="005930", session_date="2026-02-19")
+    assert _stored_state() is stored
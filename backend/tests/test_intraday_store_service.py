@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.intraday_store_service as intraday_store_service  # noqa: E402
+
+pytest.importorskip("pyarrow")
+
+
+def _session_bars(day: str, periods: int = 6, base: float = 100.0) -> pd.DataFrame:
+    idx = pd.date_range(f"{day} 09:00", periods=periods, freq="5min", tz="Asia/Seoul")
+    return pd.DataFrame(
+        {
+            "Open": [base + i for i in range(periods)],
+            "High": [base + i + 1 for i in range(periods)],
+            "Low": [base + i - 1 for i in range(periods)],
+            "Close": [base + i + 0.5 for i in range(periods)],
+            "Volume": [1_000.0 + i for i in range(periods)],
+        },
+        index=idx,
+    )
+
+
+def _use_tmp_store(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(intraday_store_service, "INTRADAY_STORE_MODE", "parquet")
+    monkeypatch.setattr(intraday_store_service, "INTRADAY_STORE_DIR", tmp_path)
+
+
+def _parts(tmp_path: Path, day: str) -> list[Path]:
+    return intraday_store_service._part_files(tmp_path / "005930.KS" / "5m" / day)
+
+
+def test_upserts_append_only_new_bars_per_session(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    history = pd.concat([_session_bars("2026-02-18"), _session_bars("2026-02-19")])
+    assert intraday_store_service.upsert_intraday_frame("005930.KS", history)
+    assert len(_parts(tmp_path, "2026-02-18")) == 1
+    assert len(_parts(tmp_path, "2026-02-19")) == 1
+
+    # Re-sending known bars writes nothing; only the new tail of the live session is appended.
+    assert not intraday_store_service.upsert_intraday_frame("005930.KS", _session_bars("2026-02-19"))
+    live = _session_bars("2026-02-20", periods=4)
+    assert intraday_store_service.upsert_intraday_frame("005930.KS", live.iloc[:2])
+    assert intraday_store_service.upsert_intraday_frame("005930.KS", live)
+    parts = _parts(tmp_path, "2026-02-20")
+    assert len(parts) == 2
+    assert len(pd.read_parquet(parts[-1])) == 2
+    assert len(_parts(tmp_path, "2026-02-18")) == 1
+
+    revised = live.iloc[[-1]].copy()
+    revised["Close"] = 999.0
+    intraday_store_service.upsert_intraday_frame("005930.KS", revised)
+
+    read_partitions: list[str] = []
+    original_read = intraday_store_service._read_partition
+
+    def _tracking_read(partition: Path) -> pd.DataFrame:
+        read_partitions.append(partition.name)
+        return original_read(partition)
+
+    monkeypatch.setattr(intraday_store_service, "_read_partition", _tracking_read)
+    loaded = intraday_store_service.load_cached_intraday_frame(
+        "005930.KS", datetime(2026, 2, 19), datetime(2026, 2, 21)
+    )
+    assert read_partitions == ["2026-02-19", "2026-02-20"]
+    assert len(loaded) == 10
+    assert loaded.index.is_monotonic_increasing
+    assert float(loaded["Close"].iloc[-1]) == 999.0
+
+
+def test_compaction_merges_parts_without_changing_reads(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    live = _session_bars("2026-02-20", periods=8)
+    for end in range(2, 9, 2):
+        intraday_store_service.upsert_intraday_frame("005930.KS", live.iloc[:end])
+    assert len(_parts(tmp_path, "2026-02-20")) == 4
+    before = intraday_store_service.load_cached_intraday_frame("005930.KS", datetime(2026, 2, 20), datetime(2026, 2, 21))
+
+    assert intraday_store_service.compact_intraday_store() == 1
+    assert len(_parts(tmp_path, "2026-02-20")) == 1
+    after = intraday_store_service.load_cached_intraday_frame("005930.KS", datetime(2026, 2, 20), datetime(2026, 2, 21))
+    pd.testing.assert_frame_equal(before, after, check_freq=False)
+    assert intraday_store_service.compact_intraday_store() == 0
+
+    monkeypatch.setattr(intraday_store_service, "INTRADAY_STORE_COMPACT_PARTS", 2)
+    for end in range(1, 5):
+        intraday_store_service.upsert_intraday_frame("000660.KS", live.iloc[:end])
+    assert len(intraday_store_service._part_files(tmp_path / "000660.KS" / "5m" / "2026-02-20")) <= 2
+
+
+def test_legacy_single_file_is_migrated_into_partitions(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    legacy = pd.concat([_session_bars("2026-02-19"), _session_bars("2026-02-20")])
+    legacy_path = tmp_path / "005930.KS_5m.parquet"
+    legacy.to_parquet(legacy_path)
+
+    loaded = intraday_store_service.load_cached_intraday_frame(
+        "005930.KS", datetime(2026, 2, 20), datetime(2026, 2, 21)
+    )
+    assert len(loaded) == 6
+    assert not legacy_path.exists()
+    assert len(_parts(tmp_path, "2026-02-19")) == 1
+
+
+def _grid_bars(day: str, last_bar: str = "15:20") -> pd.DataFrame:
+    idx = pd.date_range(f"{day} 09:00", f"{day} {last_bar}", freq="5min", tz="Asia/Seoul")
+    return pd.DataFrame(
+        {
+            "Open": [100.0 + i for i in range(len(idx))],
+            "High": [101.0 + i for i in range(len(idx))],
+            "Low": [99.0 + i for i in range(len(idx))],
+            "Close": [100.5 + i for i in range(len(idx))],
+            "Volume": [1_000.0 + i for i in range(len(idx))],
+        },
+        index=idx,
+    )
+
+
+def _date_only_fetcher(truth: pd.DataFrame, clock: dict, calls: list):
+    # Answers like Yahoo: only the dates of start/end are sent, end is exclusive, and bars are
+    # published once they have started.
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        calls.append((start_date, end_date))
+        visible = truth[truth.index <= pd.Timestamp(clock["now"], tz="Asia/Seoul")]
+        wall = visible.index.tz_localize(None)
+        start_day = pd.Timestamp(start_date.date())
+        end_day = pd.Timestamp(end_date.date())
+        return visible[(wall >= start_day) & (wall < end_day)]
+
+    return fetcher
+
+
+def test_live_refresh_fetches_only_the_tail_and_seals_settled_sessions(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    truth = pd.concat([_grid_bars("2026-02-19"), _grid_bars("2026-02-20")])
+    truth = truth.drop(pd.Timestamp("2026-02-19 11:00", tz="Asia/Seoul"))
+    clock = {"now": datetime(2026, 2, 20, 10, 2)}
+    calls: list[tuple[datetime, datetime]] = []
+    fetcher = _date_only_fetcher(truth, clock, calls)
+
+    def refresh(now: datetime) -> pd.DataFrame:
+        clock["now"] = now
+        return intraday_store_service.fetch_intraday_with_store(
+            "005930.KS",
+            datetime(2026, 2, 19),
+            datetime(2026, 2, 21),
+            "5m",
+            fetcher,
+            now=now,
+        )
+
+    first = refresh(datetime(2026, 2, 20, 10, 2))
+    assert calls == [(datetime(2026, 2, 19), datetime(2026, 2, 21))]
+    assert first.index.max() == pd.Timestamp("2026-02-20 10:00", tz="Asia/Seoul")
+    # The 02-19 session had settled and the vendor answered for it, so its hole does not trigger refetches.
+    assert intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 2, 19).date())
+    assert not intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 2, 20).date())
+
+    # Still inside the 10:00 bar: nothing new to fetch.
+    refresh(datetime(2026, 2, 20, 10, 4))
+    assert len(calls) == 1
+
+    # The 10:00 bar has closed: only the live session is asked for again.
+    latest = refresh(datetime(2026, 2, 20, 10, 11))
+    assert calls[-1] == (datetime(2026, 2, 20), datetime(2026, 2, 21))
+    assert latest.index.max() == pd.Timestamp("2026-02-20 10:10", tz="Asia/Seoul")
+    assert len(latest) == len(truth[truth.index <= pd.Timestamp("2026-02-20 10:10", tz="Asia/Seoul")])
+
+    # One request after the close settles seals the session; later reads do not fetch.
+    refresh(datetime(2026, 2, 20, 15, 45))
+    fetches = len(calls)
+    refresh(datetime(2026, 2, 20, 15, 50))
+    assert len(calls) == fetches
+    assert intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 2, 20).date())
+    refresh(datetime(2026, 2, 21, 9, 30))
+    assert len(calls) == fetches
+
+
+def test_date_only_vendor_windows_return_the_current_session(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    truth = pd.concat([_grid_bars("2026-10-15"), _grid_bars("2026-10-16")])
+    truth = truth.drop(pd.Timestamp("2026-10-15 13:00", tz="Asia/Seoul"))
+    clock = {"now": datetime(2026, 10, 16, 10, 37)}
+    calls: list[tuple[datetime, datetime]] = []
+    answers = {"empty": False}
+    date_only = _date_only_fetcher(truth, clock, calls)
+
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        frame = date_only(symbol, start_date, end_date, interval)
+        return frame.iloc[0:0] if answers["empty"] else frame
+
+    def refresh(now: datetime) -> pd.DataFrame:
+        clock["now"] = now
+        return intraday_store_service.fetch_intraday_with_store(
+            "005930.KS", datetime(2026, 10, 15), datetime(2026, 10, 17), "5m", fetcher, now=now
+        )
+
+    # An empty answer never seals or marks anything as answered: the settled session is only put on
+    # the no-data retry interval, and the live session is asked for again on the next refresh.
+    answers["empty"] = True
+    assert refresh(datetime(2026, 10, 16, 10, 37)).empty
+    assert not intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 10, 15).date())
+    assert intraday_store_service._read_session_marker(
+        "005930.KS", "5m", datetime(2026, 10, 16).date(), intraday_store_service._ANSWERED_MARKER
+    ) is None
+
+    answers["empty"] = False
+    frame = refresh(datetime(2026, 10, 16, 10, 38))
+    assert calls[-1] == (datetime(2026, 10, 16), datetime(2026, 10, 17))
+    assert frame.index.max() == pd.Timestamp("2026-10-16 10:35", tz="Asia/Seoul")
+    assert len(frame) == len(_grid_bars("2026-10-16", last_bar="10:35"))
+
+    # Once the no-data interval has passed the settled session comes back whole, hole included, and is sealed.
+    clock["now"] = datetime(2026, 10, 16, 16, 40)
+    frame = intraday_store_service.fetch_intraday_with_store(
+        "005930.KS", datetime(2026, 10, 15), datetime(2026, 10, 16), "5m", fetcher, now=clock["now"]
+    )
+    assert calls[-1] == (datetime(2026, 10, 15), datetime(2026, 10, 16))
+    assert len(frame) == len(_grid_bars("2026-10-15")) - 1
+    assert intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 10, 15).date())
+
+
+def test_empty_settled_session_is_retried_only_after_the_retry_interval(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    monkeypatch.setattr(intraday_store_service, "INTRADAY_NO_DATA_RETRY_MINUTES", 60)
+    calls: list[tuple[datetime, datetime]] = []
+
+    def fetcher(symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        calls.append((start_date, end_date))
+        return pd.DataFrame()
+
+    for now in (datetime(2026, 2, 20, 8, 0), datetime(2026, 2, 20, 8, 30), datetime(2026, 2, 20, 9, 1)):
+        out = intraday_store_service.fetch_intraday_with_store(
+            "005930.KS",
+            datetime(2026, 2, 19),
+            datetime(2026, 2, 20),
+            "5m",
+            fetcher,
+            now=now,
+        )
+        assert out.empty
+    # Asked at 08:00, skipped at 08:30, asked again once the hour has passed; never sealed while empty.
+    assert len(calls) == 2
+    assert not intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 2, 19).date())
+
+
+def test_halted_day_and_quiet_bars_do_not_widen_live_refreshes(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    days = [day.strftime("%Y-%m-%d") for day in pd.bdate_range("2026-10-05", "2026-10-16")]
+    truth = pd.concat([_grid_bars(day) for day in days if day != "2026-10-08"])
+    # Bars without trades are never published by the vendor.
+    truth = truth.drop(pd.DatetimeIndex(["2026-10-16 09:20", "2026-10-16 10:40"], tz="Asia/Seoul"))
+    clock = {"now": datetime(2026, 10, 16, 11, 1)}
+    calls: list[tuple[datetime, datetime]] = []
+    fetcher = _date_only_fetcher(truth, clock, calls)
+
+    def refresh(now: datetime) -> pd.DataFrame:
+        clock["now"] = now
+        return intraday_store_service.fetch_intraday_with_store(
+            "005930.KS", datetime(2026, 10, 2), datetime(2026, 10, 17), "5m", fetcher, now=now
+        )
+
+    refresh(datetime(2026, 10, 16, 11, 1))
+    assert calls == [(datetime(2026, 10, 2), datetime(2026, 10, 17))]
+    assert not intraday_store_service.is_session_complete("005930.KS", "5m", datetime(2026, 10, 8).date())
+
+    # Later refreshes ask only for the live session, once a bar has finished since the last answer.
+    refresh(datetime(2026, 10, 16, 11, 4))
+    assert len(calls) == 1
+    refresh(datetime(2026, 10, 16, 11, 6))
+    assert calls[-1] == (datetime(2026, 10, 16), datetime(2026, 10, 17))
+    latest = refresh(datetime(2026, 10, 16, 11, 11))
+    assert calls[-1] == (datetime(2026, 10, 16), datetime(2026, 10, 17))
+    assert len(calls) == 3
+    assert latest.index.max() == pd.Timestamp("2026-10-16 11:10", tz="Asia/Seoul")
+
+
+def _loop_rvol_baseline(bars: pd.DataFrame, session_day, current_tod) -> float:
+    # Reference: the per-day loop the profile matrix replaces.
+    history = bars.between_time("09:00", "15:20", inclusive="both")
+    history = history[[idx.date() < session_day for idx in history.index]]
+    cums: list[float] = []
+    for _, day_frame in history.groupby(history.index.date):
+        sliced = day_frame[[ts.time() <= current_tod for ts in day_frame.index]]
+        if sliced.empty:
+            continue
+        cums.append(float(pd.to_numeric(sliced["Volume"], errors="coerce").fillna(0.0).clip(lower=0.0).sum()))
+    return sum(cums) / len(cums) if cums else 0.0
+
+
+def test_cumulative_volume_profile_matches_per_day_loop() -> None:
+    rng = np.random.default_rng(11)
+    frames = []
+    for offset, day in enumerate(pd.bdate_range("2026-02-02", periods=10)):
+        bars = _grid_bars(day.strftime("%Y-%m-%d"))
+        bars["Volume"] = rng.integers(0, 50_000, len(bars)).astype(float)
+        # Sparse vendor data: random holes, one day that opens late, off-grid noise outside the session.
+        bars = bars[rng.random(len(bars)) > 0.15]
+        if offset == 3:
+            bars = bars[bars.index.time >= pd.Timestamp("11:00").time()]
+        noise = pd.DataFrame(
+            {"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 9e9},
+            index=pd.DatetimeIndex([day + pd.Timedelta(hours=8, minutes=55), day + pd.Timedelta(hours=15, minutes=30)]).tz_localize(
+                "Asia/Seoul"
+            ),
+        )
+        frames.extend([bars, noise])
+    bars = pd.concat(frames).sort_index()
+
+    profile = intraday_store_service.cumulative_volume_profile(bars, "5m")
+    assert profile.shape == (10, intraday_store_service.session_slot_count(5))
+    session_day = pd.Timestamp("2026-02-16").date()
+    for slot in (0, 5, 23, 40, 76):
+        current_tod = (pd.Timestamp("2026-02-16 09:00") + pd.Timedelta(minutes=5 * slot)).time()
+        column = profile.loc[profile.index < pd.Timestamp(session_day), slot].dropna()
+        expected = _loop_rvol_baseline(bars, session_day, current_tod)
+        assert (float(column.mean()) if len(column) else 0.0) == pytest.approx(expected)
+
+    slots = intraday_store_service.session_slots(bars.index, 5)
+    assert (slots[bars["Volume"] == 9e9] == -1).all()
+    assert slots.max() == 76
+
+
+def test_arrow_mode_reads_memory_mapped_parts_and_converts_on_compaction(monkeypatch, tmp_path) -> None:
+    _use_tmp_store(monkeypatch, tmp_path)
+    live = _session_bars("2026-02-20", periods=8)
+    intraday_store_service.upsert_intraday_frame("005930.KS", live.iloc[:4])
+
+    monkeypatch.setattr(intraday_store_service, "INTRADAY_STORE_MODE", "arrow")
+    intraday_store_service.upsert_intraday_frame("005930.KS", live)
+    assert [path.suffix for path in _parts(tmp_path, "2026-02-20")] == [".parquet", ".arrow"]
+
+    mapped: list[str] = []
+    original_map = intraday_store_service.pa.memory_map
+
+    def _tracking_map(path: str, mode: str = "r"):
+        mapped.append(Path(path).suffix)
+        return original_map(path, mode)
+
+    monkeypatch.setattr(intraday_store_service.pa, "memory_map", _tracking_map)
+    mixed = intraday_store_service.load_cached_intraday_frame("005930.KS", datetime(2026, 2, 20), datetime(2026, 2, 21))
+    pd.testing.assert_frame_equal(mixed, live, check_freq=False)
+    assert mapped == [".arrow"]
+
+    assert intraday_store_service.compact_intraday_store() == 1
+    assert [path.suffix for path in _parts(tmp_path, "2026-02-20")] == [".arrow"]
+    mapped.clear()
+    compacted = intraday_store_service.load_cached_intraday_frame(
+        "005930.KS", datetime(2026, 2, 20, 9, 10), datetime(2026, 2, 20, 9, 30)
+    )
+    pd.testing.assert_frame_equal(compacted, live.iloc[2:6], check_freq=False)
+    assert mapped == [".arrow"]
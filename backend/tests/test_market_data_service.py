@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.market_data_service as market_data_service  # noqa: E402
+import services.scoring_service as scoring_service  # noqa: E402
+from services.frame_cache_service import clear_frame_cache  # noqa: E402
+
+
+def _bars(start: str, periods: int) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq="B")
+    return pd.DataFrame(
+        {
+            "Open": [100.0 + i for i in range(periods)],
+            "High": [101.0 + i for i in range(periods)],
+            "Low": [99.0 + i for i in range(periods)],
+            "Close": [100.5 + i for i in range(periods)],
+            "Volume": [1_000_000.0 for _ in range(periods)],
+        },
+        index=idx,
+    )
+
+
+def test_yfinance_provider_splits_multi_ticker_batch(monkeypatch) -> None:
+    idx = pd.date_range("2026-01-05", periods=3, freq="B")
+    columns = pd.MultiIndex.from_product([["Close", "Volume"], ["005930.KS", "000660.KS"]])
+    raw = pd.DataFrame(
+        [
+            [100.0, 200.0, 10.0, 20.0],
+            [101.0, None, 11.0, None],
+            [102.0, 202.0, 12.0, 22.0],
+        ],
+        index=idx,
+        columns=columns,
+    )
+    calls: list[list[str]] = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(list(tickers))
+        return raw
+
+    monkeypatch.setattr(market_data_service.yf, "download", fake_download)
+    monkeypatch.setattr(market_data_service, "MARKET_DATA_BATCH_SIZE", 50)
+    vendor_calls: list[str] = []
+
+    def _counting_rate_limited(fn, vendor="yfinance"):
+        vendor_calls.append(vendor)
+        return fn()
+
+    monkeypatch.setattr(market_data_service, "run_rate_limited", _counting_rate_limited)
+    frames = market_data_service.YFinanceProvider().daily_batch(
+        ["005930.KS", "000660.KS", "005930.KS"],
+        datetime(2026, 1, 1),
+        datetime(2026, 1, 10),
+    )
+
+    assert calls == [["005930.KS", "000660.KS"]]
+    # The batch is one vendor round trip, so it takes exactly one rate slot.
+    assert vendor_calls == ["yfinance"]
+    assert list(frames["005930.KS"].columns) == ["Close", "Volume"]
+    assert frames["005930.KS"]["Close"].tolist() == [100.0, 101.0, 102.0]
+    assert len(frames["000660.KS"]) == 2
+
+
+class _StaticProvider:
+    name = "static"
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+
+    def daily(self, symbol, start_date, end_date):
+        return self.frame
+
+    def daily_batch(self, symbols, start_date, end_date):
+        return {symbol: self.frame for symbol in symbols}
+
+    def intraday(self, symbol, start_date, end_date, interval):
+        return self.frame
+
+    def news(self, symbol):
+        return [{"title": f"{symbol} headline", "link": "https://example.com/a"}]
+
+
+def test_recorded_fixtures_replay_with_latency(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    recorder = market_data_service.RecordingProvider(inner=_StaticProvider(_bars("2026-01-05", 10)), root=tmp_path)
+    recorder.daily_batch(["005930.KS"], datetime(2026, 1, 1), datetime(2026, 2, 1))
+    recorder.news("005930.KS")
+
+    replay = market_data_service.ReplayProvider(root=tmp_path, latency_ms=20)
+    started = time.monotonic()
+    frame = replay.daily("005930.KS", datetime(2026, 1, 7), datetime(2026, 1, 10))
+
+    assert time.monotonic() - started >= 0.02
+    assert [ts.strftime("%Y-%m-%d") for ts in frame.index] == ["2026-01-07", "2026-01-08", "2026-01-09"]
+    assert replay.daily_batch(["005930.KS", "000660.KS"], datetime(2026, 1, 1), datetime(2026, 2, 1)).keys() == {"005930.KS"}
+    assert replay.news("005930.KS")[0]["title"] == "005930.KS headline"
+    assert replay.intraday("005930.KS", datetime(2026, 1, 1), datetime(2026, 2, 1), "5m").empty
+
+
+def test_scoring_runs_offline_against_replay_provider(monkeypatch, tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    recorder = market_data_service.RecordingProvider(inner=_StaticProvider(_bars("2025-09-01", 130)), root=tmp_path)
+    recorder.daily_batch(["000001.KS", "000002.KS"], datetime(2025, 9, 1), datetime(2026, 3, 1))
+
+    clear_frame_cache()
+    monkeypatch.setattr("services.daily_store_service.DAILY_STORE_MODE", "off")
+    monkeypatch.setattr(scoring_service, "_build_universe", lambda custom_tickers=None: {"000001.KS": "Mock 1", "000002.KS": "Mock 2"})
+    market_data_service.set_market_data_provider(market_data_service.ReplayProvider(root=tmp_path, latency_ms=0))
+    try:
+        payload = scoring_service.fetch_and_score_stocks(
+            date_str="2026-02-20",
+            strategy="close",
+            session_date_str="2026-02-20",
+            include_sparkline=False,
+        )
+    finally:
+        market_data_service.set_market_data_provider(None)
+        clear_frame_cache()
+
+    assert {cand["code"] for cand in payload["candidates"]} == {"000001", "000002"}
+
+
+def test_record_and_replay_keep_stores_under_the_replay_root(monkeypatch, tmp_path) -> None:
+    production = tmp_path / "data" / "daily"
+    monkeypatch.setattr(market_data_service, "MARKET_DATA_REPLAY_DIR", tmp_path / "replay")
+
+    monkeypatch.setattr(market_data_service, "MARKET_DATA_PROVIDER", "yfinance")
+    assert market_data_service.provider_data_path("daily", production) == production
+    for mode in ("replay", "record"):
+        monkeypatch.setattr(market_data_service, "MARKET_DATA_PROVIDER", mode)
+        assert market_data_service.provider_data_path("daily", production) == tmp_path / "replay" / "state" / "daily"
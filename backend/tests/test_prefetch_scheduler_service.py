@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.prefetch_scheduler_service as prefetch_scheduler_service  # noqa: E402
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def test_next_prefetch_run_leads_each_strategy_window(monkeypatch) -> None:
+    monkeypatch.setattr(prefetch_scheduler_service, "PREFETCH_LEAD_MINUTES", 5)
+    monkeypatch.setattr(prefetch_scheduler_service, "is_krx_trading_day", lambda date_str: date_str != "2026-02-23")
+
+    run_at, strategy, window_open = prefetch_scheduler_service.next_prefetch_run(datetime(2026, 2, 20, 7, 0, tzinfo=KST))
+    assert (strategy, run_at.strftime("%H:%M"), window_open.strftime("%H:%M")) == ("premarket", "07:55", "08:00")
+
+    run_at, strategy, _ = prefetch_scheduler_service.next_prefetch_run(datetime(2026, 2, 20, 9, 2, tzinfo=KST))
+    assert strategy == "intraday"
+    assert run_at == datetime(2026, 2, 20, 9, 2, tzinfo=KST)
+
+    run_at, strategy, _ = prefetch_scheduler_service.next_prefetch_run(datetime(2026, 2, 20, 12, 0, tzinfo=KST))
+    assert (strategy, run_at.strftime("%H:%M")) == ("close", "14:55")
+
+    # Friday after close skips the weekend and a (mocked) Monday holiday.
+    run_at, strategy, _ = prefetch_scheduler_service.next_prefetch_run(datetime(2026, 2, 20, 15, 30, tzinfo=KST))
+    assert (strategy, run_at.strftime("%Y-%m-%d %H:%M")) == ("premarket", "2026-02-24 07:55")
@@ -3,9 +3,13 @@ from __future__ import annotations
 import os
 from pathlib import Path
 import sys
+import threading
+import time
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
@@ -21,6 +25,7 @@ from services.scoring_service import (
     apply_diversified_sampling,
     detect_market_regime,
     fetch_and_score_stocks,
+    fetch_and_score_strategy_set,
     get_latest_trading_date,
     get_non_trading_day_info,
     get_strategy_status,
@@ -29,7 +34,7 @@ from services.scoring_service import (
     validate_strategy_request,
 )
 from services.scoring_service import _build_universe
-from services.sparkline_service import build_sparkline60
+from services.sparkline_service import build_sparkline60, build_sparklines60, encode_sparkline
 from services.theme_service import extract_themes
 
 
@@ -60,6 +65,18 @@ def test_sparkline_length_and_flat() -> None:
     assert len(set(points)) == 1
 
 
+def test_batch_sparklines_match_per_series_and_encode_compactly() -> None:
+    rng = np.random.default_rng(7)
+    series = [100 + rng.normal(0, 2, size).cumsum() for size in (180, 25, 1)] + [[], [42.0] * 70]
+    batch = build_sparklines60(series)
+    assert batch == [build_sparkline60(list(values)) for values in series]
+    assert [len(points) for points in batch] == [60, 25, 1, 0, 60]
+
+    assert encode_sparkline([0.0, 50.0, 100.0], "float") == [0.0, 50.0, 100.0]
+    assert encode_sparkline([0.0, 50.0, 100.0], "u8") == [0, 128, 255]
+    assert encode_sparkline([0.0, 50.0, 100.0], "b64") == "AID/"
+
+
 def test_news_summary_fixed_3_lines() -> None:
     lines = summarize_news_3_lines([{"title": "A"}, {"title": "B"}])
     assert len(lines) == 3
@@ -288,6 +305,11 @@ def test_premarket_scoring_contains_signal_block(monkeypatch) -> None:
     )
 
     monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: base)
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: base for symbol in symbols},
+    )
     monkeypatch.setattr(scoring_service, "_build_universe", lambda custom_tickers=None: {"005930.KS": "Samsung Electronics"})
     monkeypatch.setattr(scoring_service, "get_previous_trading_date", lambda target_date_str, max_lookback_days=14: "2026-02-19")
     monkeypatch.setattr(scoring_service, "fetch_stock_news_items", lambda code, max_items=20: [])
@@ -328,6 +350,11 @@ def test_premarket_overnight_proxy_is_reused_once(monkeypatch) -> None:
         return 6.0
 
     monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: base)
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: base for symbol in symbols},
+    )
     monkeypatch.setattr(
         scoring_service,
         "_build_universe",
@@ -362,6 +389,11 @@ def test_intraday_scoring_contains_signal_block(monkeypatch) -> None:
         index=idx,
     )
     monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: base)
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: base for symbol in symbols},
+    )
     monkeypatch.setattr(scoring_service, "_build_universe", lambda custom_tickers=None: {"005930.KS": "Samsung Electronics"})
     monkeypatch.setattr(scoring_service, "INTRADAY_MODE", "proxy")
     monkeypatch.setattr(scoring_service, "INTRADAY_SIGNAL_BRANCH", "phase2")
@@ -412,6 +444,11 @@ def test_intraday_scoring_uses_phase2_bar_signals_when_available(monkeypatch) ->
     )
 
     monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: daily)
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: daily for symbol in symbols},
+    )
     monkeypatch.setattr(
         scoring_service,
         "_download_intraday_frame",
@@ -452,6 +489,11 @@ def test_intraday_baseline_branch_uses_proxy_when_bars_enabled(monkeypatch) -> N
     )
 
     monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: daily)
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: daily for symbol in symbols},
+    )
     monkeypatch.setattr(scoring_service, "_build_universe", lambda custom_tickers=None: {"005930.KS": "Samsung Electronics"})
     monkeypatch.setattr(scoring_service, "INTRADAY_MODE", "bars")
     monkeypatch.setattr(scoring_service, "INTRADAY_SIGNAL_BRANCH", "phase2")
@@ -488,6 +530,11 @@ def test_strong_recommendation_marks_only_top5(monkeypatch) -> None:
     )
 
     monkeypatch.setattr(scoring_service, "_download_frame", lambda ticker_symbol, start_date, end_date: base)
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: base for symbol in symbols},
+    )
     monkeypatch.setattr(
         scoring_service,
         "_build_universe",
@@ -635,3 +682,551 @@ def test_diversified_sampling_balances_top_window() -> None:
     assert len([item for item in top if item["sector"] == "Semiconductor"]) <= 4
     assert len([item for item in top if item["sector"] == "Financial"]) <= 4
     assert len([item for item in top if item["marketCapBucket"] == "mega"]) <= 4
+
+
+def _legacy_diversified_sampling(candidates, top_n, max_per_sector, max_per_market_cap_bucket):
+    # Previous linear-rescan implementation, kept as the reference for the grouped-heap refill.
+    def _select_candidate_index(deferred_items, strict):
+        chosen_idx = None
+        chosen_key = None
+        for idx, item in enumerate(deferred_items):
+            sector_used = float(sector_count.get(str(item.get("sector", "Other")), 0))
+            bucket_used = float(bucket_count.get(str(item.get("marketCapBucket", "mid")), 0))
+            if strict and (sector_used >= max_per_sector or bucket_used >= max_per_market_cap_bucket):
+                continue
+            candidate_key = (sector_used, bucket_used, -float(item.get("score", 0.0)))
+            if chosen_key is None or candidate_key < chosen_key:
+                chosen_key = candidate_key
+                chosen_idx = idx
+        return chosen_idx
+
+    selected, deferred, sector_count, bucket_count = [], [], {}, {}
+    for candidate in candidates:
+        sector = str(candidate.get("sector", "Other"))
+        bucket = str(candidate.get("marketCapBucket", "mid"))
+        should_defer = len(selected) < top_n and (
+            sector_count.get(sector, 0) >= max_per_sector or bucket_count.get(bucket, 0) >= max_per_market_cap_bucket
+        )
+        item = {**candidate, "balanceDeferred": should_defer}
+        if should_defer:
+            deferred.append(item)
+            continue
+        selected.append(item)
+        if len(selected) <= top_n:
+            sector_count[sector] = sector_count.get(sector, 0) + 1
+            bucket_count[bucket] = bucket_count.get(bucket, 0) + 1
+    while len(selected) < top_n and deferred:
+        pick_idx = _select_candidate_index(deferred, strict=True)
+        if pick_idx is None:
+            pick_idx = _select_candidate_index(deferred, strict=False)
+        item = deferred.pop(pick_idx)
+        item["balanceDeferred"] = False
+        sector_count[str(item.get("sector", "Other"))] = sector_count.get(str(item.get("sector", "Other")), 0) + 1
+        bucket_count[str(item.get("marketCapBucket", "mid"))] = bucket_count.get(str(item.get("marketCapBucket", "mid")), 0) + 1
+        selected.append(item)
+    final = selected + deferred
+    for idx, item in enumerate(final):
+        item["rank"] = idx + 1
+    return final
+
+
+def test_grouped_heap_diversification_matches_legacy_ranks() -> None:
+    rng = np.random.default_rng(11)
+    sectors = ["Semiconductor", "Bio", "Battery", "Financial", "Other"]
+    buckets = ["mega", "large", "mid"]
+    for trial in range(60):
+        size = int(rng.integers(1, 400))
+        candidates = [
+            {
+                "code": f"{trial:02d}{idx:04d}",
+                "sector": sectors[int(rng.integers(0, 2 if trial % 3 == 0 else len(sectors)))],
+                "marketCapBucket": buckets[int(rng.integers(0, len(buckets)))],
+                # Coarse scores force plenty of ties on the (sector_used, bucket_used, -score) key.
+                "score": float(rng.integers(0, 6)),
+            }
+            for idx in range(size)
+        ]
+        candidates.sort(key=lambda item: item["score"], reverse=True)
+        top_n = int(rng.integers(1, 25))
+        max_per_sector = int(rng.integers(1, 4))
+        max_per_bucket = int(rng.integers(1, 6))
+
+        expected = _legacy_diversified_sampling(candidates, top_n, max_per_sector, max_per_bucket)
+        actual = apply_diversified_sampling(
+            [dict(item) for item in candidates],
+            top_n=top_n,
+            max_per_sector=max_per_sector,
+            max_per_market_cap_bucket=max_per_bucket,
+            in_place=True,
+        )
+        assert [(item["code"], item["rank"], item["balanceDeferred"]) for item in actual] == [
+            (item["code"], item["rank"], item["balanceDeferred"]) for item in expected
+        ]
+
+    original = [{"code": "A", "sector": "Bio", "score": 1.0}]
+    apply_sector_exposure_cap(original, top_n=1, max_per_sector=1)
+    apply_diversified_sampling(original, top_n=1)
+    assert original == [{"code": "A", "sector": "Bio", "score": 1.0}]
+
+
+def test_fetch_and_score_falls_back_to_single_download_for_batch_misses(monkeypatch) -> None:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    base = pd.DataFrame(
+        {
+            "Open": [100 + i * 0.1 for i in range(len(idx))],
+            "High": [101 + i * 0.1 for i in range(len(idx))],
+            "Low": [99 + i * 0.1 for i in range(len(idx))],
+            "Close": [100 + i * 0.1 for i in range(len(idx))],
+            "Volume": [1_700_000 for _ in range(len(idx))],
+        },
+        index=idx,
+    )
+    single_calls: list[str] = []
+
+    def fake_single(ticker_symbol, start_date, end_date):
+        single_calls.append(ticker_symbol)
+        return base
+
+    monkeypatch.setattr(scoring_service, "_download_frames", lambda symbols, start_date, end_date: {"000001.KS": base})
+    monkeypatch.setattr(scoring_service, "_download_frame", fake_single)
+    monkeypatch.setattr(
+        scoring_service,
+        "_build_universe",
+        lambda custom_tickers=None: {"000001.KS": "Mock 1", "000002.KS": "Mock 2"},
+    )
+
+    payload = fetch_and_score_stocks(
+        date_str="2026-02-20",
+        strategy="close",
+        session_date_str="2026-02-20",
+        include_sparkline=False,
+    )
+    assert single_calls == ["000002.KS"]
+    assert {cand["code"] for cand in payload["candidates"]} == {"000001", "000002"}
+
+
+def test_indicator_panel_matches_per_series_scores() -> None:
+    rng = np.random.default_rng(7)
+    frames: dict[str, pd.DataFrame] = {}
+    for col, length in enumerate([60, 75, 120, 121]):
+        idx = pd.date_range("2025-06-02", periods=length, freq="B")
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, length)))
+        high = close * (1 + rng.uniform(0, 0.02, length))
+        if col == 2:
+            high[30] = np.nan
+        frames[f"00000{col}.KS"] = pd.DataFrame(
+            {
+                "Open": close,
+                "High": high,
+                "Low": close * (1 - rng.uniform(0, 0.02, length)),
+                "Close": close,
+                "Volume": rng.integers(100_000, 5_000_000, length).astype(float),
+            },
+            index=idx,
+        )
+    gapped = frames["000003.KS"].copy()
+    gapped.iloc[50, gapped.columns.get_loc("Close")] = np.nan
+    frames["000004.KS"] = gapped
+
+    panel = scoring_service._compute_indicator_panel(frames)
+
+    assert "000004.KS" not in panel
+    for symbol in ["000000.KS", "000001.KS", "000002.KS", "000003.KS"]:
+        frame = frames[symbol]
+        expected = scoring_service._indicator_values(frame["Close"], frame["Volume"])
+        for key, value in expected.items():
+            assert panel[symbol][key] == pytest.approx(value, rel=1e-12, abs=1e-12, nan_ok=True), (symbol, key)
+        assert scoring_service._scores_from_indicators(panel[symbol])[0] == scoring_service._compute_scores(
+            frame["Close"], frame["Volume"]
+        )[0]
+        atr = scoring_service._atr(frame["High"], frame["Low"], frame["Close"], length=14)
+        assert panel[symbol]["atr14"] == pytest.approx(float(atr.iloc[-1]), rel=1e-12)
+        assert panel[symbol]["high60"] == float(frame["High"].rolling(60, min_periods=1).max().iloc[-1])
+        assert panel[symbol]["low10"] == float(frame["Low"].rolling(10, min_periods=1).min().iloc[-1])
+
+
+def test_weight_change_reuses_raw_factors_and_only_reranks(monkeypatch) -> None:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    frames = {}
+    for offset, symbol in enumerate(["000001.KS", "000002.KS", "000003.KS"]):
+        frames[symbol] = pd.DataFrame(
+            {
+                "Open": [100 + i * (0.1 + offset * 0.2) for i in range(len(idx))],
+                "High": [101 + i * (0.1 + offset * 0.2) for i in range(len(idx))],
+                "Low": [99 + i * (0.1 + offset * 0.2) for i in range(len(idx))],
+                "Close": [100 + i * (0.1 + offset * 0.2) + (i % 7) * offset for i in range(len(idx))],
+                "Volume": [300_000 * (offset + 1) ** 3 for _ in range(len(idx))],
+            },
+            index=idx,
+        )
+    loads: list[int] = []
+
+    def _counting_download_frames(symbols, start_date, end_date):
+        loads.append(1)
+        return dict(frames)
+
+    monkeypatch.setattr(scoring_service, "_download_frames", _counting_download_frames)
+    monkeypatch.setattr(
+        scoring_service,
+        "_build_universe",
+        lambda custom_tickers=None: {"000001.KS": "Mock 1", "000002.KS": "Mock 2", "000003.KS": "Mock 3"},
+    )
+    raw_calls: list[int] = []
+    original_score_raw = scoring_service._score_universe_raw
+
+    def _counting_score_raw(**kwargs):
+        raw_calls.append(1)
+        return original_score_raw(**kwargs)
+
+    monkeypatch.setattr(scoring_service, "_score_universe_raw", _counting_score_raw)
+    kwargs = {"date_str": "2026-02-20", "strategy": "close", "session_date_str": "2026-02-20", "include_sparkline": False}
+
+    market_heavy = fetch_and_score_stocks(weights={"return": 0.1, "stability": 0.1, "market": 0.8}, **kwargs)
+    return_heavy = fetch_and_score_stocks(weights={"return": 0.8, "stability": 0.1, "market": 0.1}, **kwargs)
+    assert len(raw_calls) == 1
+    assert len(loads) == 1
+
+    scoring_service.clear_raw_factor_cache()
+    fresh = fetch_and_score_stocks(weights={"return": 0.8, "stability": 0.1, "market": 0.1}, **kwargs)
+    assert fresh["candidates"] == return_heavy["candidates"]
+    assert market_heavy["candidates"][0]["details"]["raw"] == next(
+        item["details"]["raw"] for item in return_heavy["candidates"] if item["code"] == market_heavy["candidates"][0]["code"]
+    )
+
+    fetch_and_score_stocks(weights={"return": 0.8, "stability": 0.1, "market": 0.1}, refresh=True, **kwargs)
+    assert len(raw_calls) == 3
+
+
+def test_live_raw_factor_key_rolls_over_with_the_bar_bucket(monkeypatch) -> None:
+    kwargs = {
+        "strategy": "intraday",
+        "signal_date": "2026-02-20",
+        "session_date": "2026-02-20",
+        "intraday_mode": "bars",
+        "intraday_branch": "baseline",
+        "universe": {"000001.KS": "Mock 1"},
+    }
+    clock = {"now": datetime(2026, 2, 20, 10, 1, tzinfo=scoring_service.KST)}
+    monkeypatch.setattr(scoring_service, "now_in_kst", lambda: clock["now"])
+
+    first = scoring_service._raw_factor_cache_key(live=True, **kwargs)
+    clock["now"] = datetime(2026, 2, 20, 10, 4, 59, tzinfo=scoring_service.KST)
+    assert scoring_service._raw_factor_cache_key(live=True, **kwargs) == first
+    clock["now"] = datetime(2026, 2, 20, 10, 5, tzinfo=scoring_service.KST)
+    assert scoring_service._raw_factor_cache_key(live=True, **kwargs) != first
+    assert scoring_service._raw_factor_cache_key(live=False, **kwargs) == scoring_service._raw_factor_cache_key(
+        live=False, **kwargs
+    )
+
+
+def test_fetch_and_score_stocks_reports_stage_diagnostics(monkeypatch) -> None:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    good = pd.DataFrame(
+        {
+            "Open": [100 + i * 0.3 for i in range(len(idx))],
+            "High": [101 + i * 0.3 for i in range(len(idx))],
+            "Low": [99 + i * 0.3 for i in range(len(idx))],
+            "Close": [100 + i * 0.3 + (i % 5) for i in range(len(idx))],
+            "Volume": [500_000 for _ in range(len(idx))],
+        },
+        index=idx,
+    )
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {"000001.KS": good, "000002.KS": good.iloc[:30]},
+    )
+    monkeypatch.setattr(
+        scoring_service,
+        "_build_universe",
+        lambda custom_tickers=None: {"000001.KS": "Mock 1", "000002.KS": "Mock 2", "000003.KS": "Mock 3"},
+    )
+    kwargs = {"date_str": "2026-02-20", "strategy": "close", "session_date_str": "2026-02-20", "include_sparkline": False}
+
+    assert "diagnostics" not in fetch_and_score_stocks(**kwargs)
+    result = fetch_and_score_stocks(include_diagnostics=True, **kwargs)
+    diagnostics = result["diagnostics"]
+
+    assert [stage["name"] for stage in diagnostics["stages"]] == ["universe", "rank", "sparkline"]
+    assert diagnostics["rawFactorCache"] == "hit"
+    assert {item["symbol"]: item["stage"] for item in diagnostics["failures"]} == {
+        "000002.KS": "fetch",
+        "000003.KS": "fetch",
+    }
+
+    scoring_service.clear_raw_factor_cache()
+    result = fetch_and_score_stocks(include_diagnostics=True, **kwargs)
+    stages = {stage["name"]: stage for stage in result["diagnostics"]["stages"]}
+    assert list(stages) == ["universe", "fetch", "features", "overlay", "payload", "rank", "sparkline"]
+    assert stages["universe"]["count"] == 3
+    assert stages["fetch"]["count"] == 1
+    assert stages["rank"]["count"] == len(result["candidates"]) == 1
+    assert all(stage["elapsedMs"] >= 0 for stage in stages.values())
+    assert result["diagnostics"]["rawFactorCache"] == "miss"
+    assert "insufficient history (30 bars)" in [item["reason"] for item in result["diagnostics"]["failures"]]
+
+
+def test_process_pool_features_match_in_process_features(monkeypatch) -> None:
+    pytest.importorskip("pyarrow")
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    universe = {f"90000{i}.KS": f"Mock {i}" for i in range(6)}
+    frames = {
+        symbol: pd.DataFrame(
+            {
+                "Open": [100 + i * (0.1 + offset * 0.05) for i in range(len(idx))],
+                "High": [101 + i * (0.1 + offset * 0.05) for i in range(len(idx))],
+                "Low": [99 + i * (0.1 + offset * 0.05) for i in range(len(idx))],
+                "Close": [100 + i * (0.1 + offset * 0.05) + (i % 5) * offset for i in range(len(idx))],
+                "Volume": [200_000 * (offset + 1) for _ in range(len(idx))],
+            },
+            index=idx,
+        )
+        for offset, symbol in enumerate(universe)
+    }
+    start_date = datetime(2025, 8, 24)
+    expected = scoring_service._build_symbol_features(universe, frames, start_date, [])
+
+    monkeypatch.setattr(scoring_service, "SCORING_EXECUTION_MODE", "process")
+    monkeypatch.setattr(scoring_service, "SCORING_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(scoring_service, "SCORING_PROCESS_MIN_SYMBOLS", 1)
+    assert scoring_service._uses_process_pool(len(frames))
+
+    def _no_in_process_fallback(*args, **kwargs):
+        raise AssertionError("a shard fell back to in-process feature building")
+
+    # Spawned workers import the module afresh, so only the parent's fallback is patched out.
+    monkeypatch.setattr(scoring_service, "_build_symbol_features", _no_in_process_fallback)
+    try:
+        sharded = scoring_service._build_symbol_features_sharded(universe, frames, start_date, [])
+    finally:
+        scoring_service.shutdown_scoring_process_pool()
+
+    assert list(sharded) == list(expected)
+    for symbol, item in expected.items():
+        assert sharded[symbol]["frame"] is frames[symbol]
+        assert sharded[symbol]["rawScores"] == item["rawScores"]
+        assert sharded[symbol]["indicators"] == pytest.approx(item["indicators"], nan_ok=True)
+
+
+def test_sparklines_are_built_only_for_returned_candidates(monkeypatch) -> None:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    frames = {
+        f"00000{offset}.KS": pd.DataFrame(
+            {
+                "Open": [100 + i * 0.2 * offset for i in range(len(idx))],
+                "High": [101 + i * 0.2 * offset for i in range(len(idx))],
+                "Low": [99 + i * 0.2 * offset for i in range(len(idx))],
+                "Close": [100 + i * 0.2 * offset + (i % 3) for i in range(len(idx))],
+                "Volume": [400_000 for _ in range(len(idx))],
+            },
+            index=idx,
+        )
+        for offset in range(1, 4)
+    }
+    monkeypatch.setattr(scoring_service, "_download_frames", lambda symbols, start_date, end_date: dict(frames))
+    monkeypatch.setattr(
+        scoring_service,
+        "_build_universe",
+        lambda custom_tickers=None: {symbol: f"Mock {symbol}" for symbol in frames},
+    )
+    monkeypatch.setattr(scoring_service, "SPARKLINE_MAX_CANDIDATES", 2)
+    kwargs = {"date_str": "2026-02-20", "strategy": "close", "session_date_str": "2026-02-20"}
+
+    without = fetch_and_score_stocks(include_sparkline=False, **kwargs)
+    result = fetch_and_score_stocks(include_sparkline=True, **kwargs)
+
+    assert [item["sparkline60"] for item in without["candidates"]] == [[], [], []]
+    for item in result["candidates"][:2]:
+        frame = frames[f"{item['code']}.KS"]
+        assert item["sparkline60"] == build_sparkline60(frame["Close"].tolist())
+    assert result["candidates"][2]["sparkline60"] == []
+    assert all("_closeTail" not in item for item in result["candidates"] + without["candidates"])
+
+
+def test_on_candidate_streams_each_scored_symbol_before_ranking(monkeypatch) -> None:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    frames = {
+        f"00000{offset}.KS": pd.DataFrame(
+            {
+                "Open": [100 + i * 0.1 * offset for i in range(len(idx))],
+                "High": [101 + i * 0.1 * offset for i in range(len(idx))],
+                "Low": [99 + i * 0.1 * offset for i in range(len(idx))],
+                "Close": [100 + i * 0.1 * offset + (i % 4) for i in range(len(idx))],
+                "Volume": [300_000 for _ in range(len(idx))],
+            },
+            index=idx,
+        )
+        for offset in range(1, 4)
+    }
+    log: list[str] = []
+
+    def _logging_download_frames(symbols, start_date, end_date):
+        log.extend(f"fetch {symbol[:6]}" for symbol in symbols)
+        return {symbol: frames[symbol] for symbol in symbols}
+
+    monkeypatch.setattr(scoring_service, "_download_frames", _logging_download_frames)
+    monkeypatch.setattr(scoring_service, "CANDIDATE_STREAM_BATCH_SIZE", 1)
+    monkeypatch.setattr(
+        scoring_service,
+        "_build_universe",
+        lambda custom_tickers=None: {symbol: f"Mock {symbol}" for symbol in frames},
+    )
+    kwargs = {"date_str": "2026-02-20", "strategy": "close", "session_date_str": "2026-02-20", "include_sparkline": True}
+
+    for attempt in range(2):  # second pass is served from the raw-factor cache
+        streamed: list[dict] = []
+        log.clear()
+
+        def _on_candidate(item: dict) -> None:
+            log.append(f"emit {item['code']}")
+            streamed.append(item)
+
+        result = fetch_and_score_stocks(on_candidate=_on_candidate, **kwargs)
+        if attempt == 0:
+            # Each symbol goes out before the next one is fetched.
+            assert log == [f"{step} 00000{n}" for n in range(1, 4) for step in ("fetch", "emit")]
+        else:
+            assert not any(entry.startswith("fetch") for entry in log)
+        assert sorted(item["code"] for item in streamed) == ["000001", "000002", "000003"]
+        scores = {item["code"]: item["score"] for item in result["candidates"]}
+        assert all(item["score"] == scores[item["code"]] for item in streamed)
+        assert all("_closeTail" not in item and "weighted" in item["details"] for item in streamed)
+
+
+def test_deadline_returns_partial_ranking_and_skips_raw_cache(monkeypatch) -> None:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    frames = {
+        f"00000{offset}.KS": pd.DataFrame(
+            {
+                "Open": [100 + i * 0.1 * offset for i in range(len(idx))],
+                "High": [101 + i * 0.1 * offset for i in range(len(idx))],
+                "Low": [99 + i * 0.1 * offset for i in range(len(idx))],
+                "Close": [100 + i * 0.1 * offset + (i % 4) for i in range(len(idx))],
+                "Volume": [300_000 for _ in range(len(idx))],
+            },
+            index=idx,
+        )
+        for offset in range(1, 4)
+    }
+    release = threading.Event()
+
+    def _slow_single(symbol, start_date, end_date):
+        release.wait(timeout=2)
+        return frames[symbol]
+
+    monkeypatch.setattr(
+        scoring_service,
+        "_download_frames",
+        lambda symbols, start_date, end_date: {symbol: frames[symbol] for symbol in symbols if symbol != "000003.KS"},
+    )
+    monkeypatch.setattr(scoring_service, "_download_frame", _slow_single)
+    monkeypatch.setattr(
+        scoring_service,
+        "_build_universe",
+        lambda custom_tickers=None: {symbol: f"Mock {symbol}" for symbol in frames},
+    )
+    kwargs = {"date_str": "2026-02-20", "strategy": "close", "session_date_str": "2026-02-20", "include_sparkline": False}
+
+    scoring_service.get_latest_trading_date("2026-02-20")  # keep calendar loading out of the budget
+    started = time.monotonic()
+    partial = fetch_and_score_stocks(deadline=started + 0.2, **kwargs)
+    release.set()
+    assert time.monotonic() - started < 1.5
+    assert partial["partial"] is True
+    assert partial["skippedSymbols"] == ["000003.KS"]
+    assert sorted(item["code"] for item in partial["candidates"]) == ["000001", "000002"]
+
+    full = fetch_and_score_stocks(include_diagnostics=True, **kwargs)
+    assert full["partial"] is False and full["skippedSymbols"] == []
+    assert full["diagnostics"]["rawFactorCache"] == "miss"
+    assert len(full["candidates"]) == 3
+
+    expired = fetch_and_score_stocks(deadline=time.monotonic() - 1, **kwargs)
+    assert expired["partial"] is True
+    assert expired["candidates"] == []
+    assert sorted(expired["skippedSymbols"]) == sorted(frames)
+
+
+def test_strategy_set_shares_one_load_and_matches_standalone_runs(monkeypatch) -> None:
+    idx = pd.date_range("2025-09-01", "2026-02-20", freq="B")
+    frames = {
+        f"90010{offset}.KS": pd.DataFrame(
+            {
+                "Open": [100 + i * (0.2 + offset * 0.03) for i in range(len(idx))],
+                "High": [102 + i * (0.2 + offset * 0.03) for i in range(len(idx))],
+                "Low": [98 + i * (0.2 + offset * 0.03) for i in range(len(idx))],
+                "Close": [100 + i * (0.2 + offset * 0.03) + (i % (offset + 3)) for i in range(len(idx))],
+                "Volume": [300_000 + 20_000 * ((i + offset) % 7) for i in range(len(idx))],
+            },
+            index=idx,
+        )
+        for offset in range(5)
+    }
+    loads: list[tuple[datetime, datetime]] = []
+
+    def _fake_download_frames(symbols, start_date, end_date):
+        loads.append((start_date, end_date))
+        return {
+            symbol: frame[(frame.index >= start_date) & (frame.index < end_date)]
+            for symbol, frame in frames.items()
+            if symbol in symbols
+        }
+
+    monkeypatch.setattr(scoring_service, "_download_frames", _fake_download_frames)
+    monkeypatch.setattr(scoring_service, "_download_frame", lambda symbol, start_date, end_date: pd.DataFrame())
+    monkeypatch.setattr(scoring_service, "_build_universe", lambda custom_tickers=None: {symbol: symbol for symbol in frames})
+    monkeypatch.setattr(scoring_service, "fetch_stock_news_items", lambda code, max_items=20: [])
+    get_latest_trading_date("2026-02-20")
+    dates = {"date_str": "2026-02-20", "session_date_str": "2026-02-20"}
+
+    joint = fetch_and_score_strategy_set(include_diagnostics=True, **dates)
+    assert list(joint) == ["premarket", "intraday:baseline", "intraday:phase2", "close"]
+    assert len(loads) == 1
+    assert joint["premarket"]["signalDate"] == "2026-02-19"
+    assert joint["close"]["candidates"]
+
+    for strategy, branch in scoring_service.STRATEGY_VARIANTS:
+        cached = fetch_and_score_stocks(strategy=strategy, intraday_signal_branch=branch, include_diagnostics=True, **dates)
+        key = scoring_service.strategy_variant_key(strategy, branch)
+        assert cached["diagnostics"]["rawFactorCache"] == "hit"
+        assert cached["candidates"] == joint[key]["candidates"]
+
+    scoring_service.clear_raw_factor_cache()
+    for strategy, branch in scoring_service.STRATEGY_VARIANTS:
+        fresh = fetch_and_score_stocks(strategy=strategy, intraday_signal_branch=branch, **dates)
+        assert fresh["candidates"] == joint[scoring_service.strategy_variant_key(strategy, branch)]["candidates"]
+
+
+def test_concurrent_batch_downloads_fetch_each_symbol_once(monkeypatch) -> None:
+    from services.frame_cache_service import clear_frame_cache
+
+    frame = pd.DataFrame({"Close": [10.0, 11.0]}, index=pd.date_range("2026-02-18", periods=2, freq="B"))
+    lock = threading.Lock()
+    fetched: list[str] = []
+    first_batch_started = threading.Event()
+
+    def _slow_batch(symbols, start_date, end_date):
+        with lock:
+            fetched.extend(symbols)
+        first_batch_started.set()
+        time.sleep(0.1)
+        return {symbol: frame for symbol in symbols}
+
+    monkeypatch.setattr("services.daily_store_service.DAILY_STORE_MODE", "off")
+    monkeypatch.setattr(scoring_service, "_fetch_daily_batch_from_provider", _slow_batch)
+    clear_frame_cache()
+    start, end = datetime(2026, 2, 1), datetime(2026, 2, 21)
+    results: list[dict] = []
+    try:
+        first = threading.Thread(
+            target=lambda: results.append(scoring_service._download_frames(["A.KS", "B.KS"], start, end))
+        )
+        first.start()
+        first_batch_started.wait(timeout=2)
+        results.append(scoring_service._download_frames(["B.KS", "C.KS"], start, end))
+        first.join(timeout=2)
+    finally:
+        clear_frame_cache()
+
+    assert sorted(fetched) == ["A.KS", "B.KS", "C.KS"]
+    assert sorted(len(result) for result in results) == [2, 2]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.shared_frame_service as shared_frame_service  # noqa: E402
+
+pytest.importorskip("pyarrow")
+
+
+def _frame(start: str, periods: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start, periods=periods, freq="B")
+    return pd.DataFrame({name: rng.random(periods) for name in ("Open", "High", "Low", "Close", "Volume")}, index=idx)
+
+
+def test_shared_frames_round_trip_as_slices_of_one_mapped_table(tmp_path) -> None:
+    frames = {"005930.KS": _frame("2026-01-05", 30, 1), "000660.KS": _frame("2026-02-02", 12, 2)}
+    path = tmp_path / "shard.arrow"
+    shared_frame_service.write_shared_frames(frames, path)
+
+    loaded = shared_frame_service.read_shared_frames(path)
+    assert list(loaded) == list(frames)
+    for symbol, frame in frames.items():
+        pd.testing.assert_frame_equal(loaded[symbol], frame, check_freq=False)
+    # Columns are views into the mapped table, not per-symbol copies.
+    assert not loaded["000660.KS"]["Close"].to_numpy().flags.owndata
+
+
+def test_shared_frames_with_differing_columns_fall_back_to_concat(tmp_path) -> None:
+    tz_frame = _frame("2026-01-05", 5, 3)
+    tz_frame.index = tz_frame.index.tz_localize("Asia/Seoul")
+    frames = {"005930.KS": tz_frame, "000660.KS": _frame("2026-01-05", 4, 4).drop(columns=["Open"])}
+    path = tmp_path / "shard.arrow"
+    shared_frame_service.write_shared_frames(frames, path)
+
+    loaded = shared_frame_service.read_shared_frames(path)
+    # Timestamps are stored as KST wall-clock times.
+    assert loaded["005930.KS"].index[0] == pd.Timestamp("2026-01-05")
+    assert len(loaded["000660.KS"]) == 4
+    assert loaded["000660.KS"]["Open"].isna().all()
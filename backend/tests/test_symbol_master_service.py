@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import services.scoring_service as scoring_service  # noqa: E402
+import services.symbol_master_service as symbol_master_service  # noqa: E402
+
+
+def _write_master(monkeypatch, tmp_path: Path, rows: list[str]) -> None:
+    master_path = tmp_path / "symbol_master.csv"
+    master_path.write_text("code,name,market,sector,marketCap\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    monkeypatch.setattr(symbol_master_service, "SYMBOL_MASTER_PATH", master_path)
+    symbol_master_service.reset_symbol_master()
+
+
+def _frame(step: float, wobble: int) -> pd.DataFrame:
+    idx = pd.date_range("2025-10-01", periods=120, freq="B")
+    return pd.DataFrame(
+        {
+            "Open": [100 + i * step for i in range(len(idx))],
+            "High": [101 + i * step for i in range(len(idx))],
+            "Low": [99 + i * step for i in range(len(idx))],
+            "Close": [100 + i * step + (i % 7) * wobble for i in range(len(idx))],
+            "Volume": [400_000 + wobble * 10_000 for _ in range(len(idx))],
+        },
+        index=idx,
+    )
+
+
+def test_symbol_master_parses_markets_sectors_and_cap_buckets(monkeypatch, tmp_path) -> None:
+    _write_master(
+        monkeypatch,
+        tmp_path,
+        [
+            "900001,Alpha,KOSPI,Chemical,\"30,000,000,000,000\"",
+            "900002,Beta,KOSDAQ,Bio,500000000000",
+            "900003,Gamma,KONEX,Bio,1",
+            "bad,Delta,KOSPI,Bio,1",
+        ],
+    )
+    assert symbol_master_service.symbol_master_universe() == {"900001.KS": "Alpha", "900002.KQ": "Beta"}
+    assert scoring_service._infer_sector("900002") == "Bio"
+    assert scoring_service._infer_market_cap_bucket("900001") == "mega"
+    assert scoring_service._infer_market_cap_bucket("900002") == "mid"
+    assert scoring_service.resolve_company_name("900002") == "Beta"
+    assert scoring_service._infer_sector("999999") == "Other"
+    symbol_master_service.reset_symbol_master()
+
+
+def test_full_universe_scores_in_chunks_with_same_ranking(monkeypatch, tmp_path) -> None:
+    sectors = ["Chemical", "Bio", "Retail"]
+    rows = [f"9000{i:02d},Mock {i},{'KOSPI' if i % 2 else 'KOSDAQ'},{sectors[i % 3]},{(i + 1) * 10**12}" for i in range(12)]
+    _write_master(monkeypatch, tmp_path, rows)
+    frames = {
+        f"9000{i:02d}{'.KS' if i % 2 else '.KQ'}": _frame(0.05 + (i % 5) * 0.07, i % 4) for i in range(12)
+    }
+    batches: list[int] = []
+
+    def _fake_download(symbols, start_date, end_date):
+        batches.append(len(symbols))
+        return {symbol: frames[symbol] for symbol in symbols if symbol in frames}
+
+    monkeypatch.setattr(scoring_service, "UNIVERSE_MODE", "full")
+    monkeypatch.setattr(scoring_service, "_download_frames", _fake_download)
+    kwargs = {"date_str": "2026-02-20", "strategy": "close", "session_date_str": "2026-02-20", "include_sparkline": False}
+
+    single = scoring_service.fetch_and_score_stocks(**kwargs)
+    assert batches == [12]
+    assert {item["sector"] for item in single["candidates"]} <= set(sectors)
+
+    scoring_service.clear_raw_factor_cache()
+    monkeypatch.setattr(scoring_service, "UNIVERSE_MIN_CHUNK_SIZE", 5)
+    monkeypatch.setattr(scoring_service, "_ESTIMATED_BYTES_PER_SYMBOL", 10 * 1024 * 1024 * 1024)
+    chunked = scoring_service.fetch_and_score_stocks(include_diagnostics=True, **kwargs)
+    assert batches[1:] == [5, 5, 2]
+    assert chunked["candidates"] == single["candidates"]
+    stages = {stage["name"]: stage["count"] for stage in chunked["diagnostics"]["stages"]}
+    assert stages["fetch"] == 12
+    symbol_master_service.reset_symbol_master()
+
+
+def test_master_lookups_recheck_the_file_only_after_the_interval(monkeypatch, tmp_path) -> None:
+    _write_master(monkeypatch, tmp_path, ["900001,Alpha,KOSPI,Chemical,1"])
+    assert symbol_master_service.master_record("900001")["name"] == "Alpha"
+
+    master_path = tmp_path / "symbol_master.csv"
+    stats: list[str] = []
+    original_stat = type(master_path).stat
+
+    def _counting_stat(self, *args, **kwargs):
+        stats.append(str(self))
+        return original_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(master_path), "stat", _counting_stat)
+    master_path.write_text("code,name,market,sector,marketCap\n900001,Renamed,KOSPI,Chemical,1\n", encoding="utf-8")
+    modified = original_stat(master_path).st_mtime + 10
+    os.utime(master_path, (modified, modified))
+    for _ in range(500):
+        assert symbol_master_service.master_record("900001")["name"] == "Alpha"
+    assert str(master_path) not in stats
+
+    # Once the interval has passed the edited file is picked up.
+    monkeypatch.setattr(symbol_master_service, "_NEXT_CHECK_AT", 0.0)
+    assert symbol_master_service.master_record("900001")["name"] == "Renamed"
+    symbol_master_service.reset_symbol_master()
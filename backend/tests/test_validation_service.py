@@ -89,10 +89,18 @@ def test_run_walk_forward_validation_branch_compare(monkeypatch) -> None:
     monkeypatch.setattr(validation_service, "_collect_trading_sessions", lambda as_of_date, lookback_days: sessions)
     monkeypatch.setattr(validation_service, "VALIDATION_ENABLED_STRATEGIES", {"intraday"})
 
+    loaded_sessions: list[str] = []
+
     def _fake_fetch(**kwargs):
-        branch = kwargs.get("intraday_signal_branch")
-        picked = "005930" if branch == "phase2" else "000660"
-        return {"candidates": [{"code": picked}]}
+        raise AssertionError("branch comparison should score both branches from one load")
+
+    def _fake_fetch_set(**kwargs):
+        loaded_sessions.append(kwargs["session_date_str"])
+        assert [branch for _, branch in kwargs["variants"]] == ["baseline", "phase2"]
+        return {
+            "intraday:baseline": {"candidates": [{"code": "000660"}]},
+            "intraday:phase2": {"candidates": [{"code": "005930"}]},
+        }
 
     def _fake_close(code: str, trade_date: str, future_days: int = 3):
         dt = pd.to_datetime([trade_date, pd.Timestamp(trade_date) + pd.Timedelta(days=1)])
@@ -101,6 +109,7 @@ def test_run_walk_forward_validation_branch_compare(monkeypatch) -> None:
         return pd.Series([100.0, 99.0], index=dt)
 
     monkeypatch.setattr(validation_service, "fetch_and_score_stocks", _fake_fetch)
+    monkeypatch.setattr(validation_service, "fetch_and_score_strategy_set", _fake_fetch_set)
     monkeypatch.setattr(validation_service, "get_price_series_for_ticker", _fake_close)
 
     out = validation_service.run_walk_forward_validation(
@@ -120,6 +129,7 @@ def test_run_walk_forward_validation_branch_compare(monkeypatch) -> None:
     assert out["protocol"]["intradaySignalBranch"] == "phase2"
     assert "branchComparison" in out
     assert out["branchComparison"]["recommendedBranch"] == "phase2"
+    assert loaded_sessions and len(loaded_sessions) == len(set(loaded_sessions))
 
 
 def test_resolve_intraday_branch_by_validation(monkeypatch) -> None: